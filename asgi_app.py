@@ -0,0 +1,230 @@
+"""
+ThothMind Trading Challenge - ASGI Application
+===============================================
+Async server for the same endpoint contract as app.py.
+
+Request bodies are read on the event loop; JSON parsing and all strategy
+calls run on a single dedicated worker thread, because the strategy is
+stateful and must see ticks one at a time. /health, /ready and /stats are
+answered directly on the loop, so they stay responsive while a heavy tick
+is being analyzed or the start-up warm-up runs. Ticks arriving while more
+than ASGI_MAX_PENDING_TICKS are already waiting for the worker are
+answered with HOLD.
+
+Run with:
+    python asgi_app.py
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+"""
+import sys
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import config
+import handlers
+from handlers import request_count
+from body_encoding import BodyDecodeError, BodyTooLarge, StreamDecoder
+
+logging.basicConfig(
+    level=getattr(logging, config.LOG_LEVEL),
+    format=config.LOG_FORMAT,
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# One worker: strategy calls must be serialized
+_strategy_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='strategy')
+
+# Ticks submitted to the worker and not yet answered (event loop thread only)
+_pending_ticks = 0
+
+
+class ClientDisconnected(Exception):
+    """The client went away before the request body was received"""
+
+
+# Path -> (method, handler, takes_body, requires_api_key)
+ROUTES: Dict[str, tuple] = {
+    '/': ('GET', handlers.handle_index, False, False),
+    '/health': ('GET', handlers.handle_health, False, True),
+    '/ready': ('GET', handlers.handle_ready, False, True),
+    '/stats': ('GET', handlers.handle_stats, False, True),
+    '/reset': ('POST', handlers.handle_reset, True, True),
+    '/start': ('POST', handlers.handle_start, True, True),
+    '/tick': ('POST', handlers.handle_tick, True, True),
+    '/end': ('POST', handlers.handle_end, True, True),
+}
+
+
+def _header(scope: Dict, name: bytes) -> Optional[str]:
+    for key, value in scope.get('headers', []):
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return None
+
+
+async def _read_body(receive: Callable) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ClientDisconnected()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > config.MAX_REQUEST_BODY_BYTES:
+            raise BodyTooLarge(f"Request body exceeds {config.MAX_REQUEST_BODY_BYTES} bytes")
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+def _parse_and_call(handler: Callable, body: bytes, decoder: Optional[StreamDecoder]) -> handlers.Reply:
+    """
+    Runs on the strategy worker: decompress if needed, then parse JSON like
+    Flask's get_json(silent=True)
+    """
+    if decoder is not None:
+        try:
+            decoder.feed(body)
+            body = decoder.finish()
+        except BodyDecodeError as e:
+            return _rejected_body(e)
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        data = None
+    return handler(data if isinstance(data, dict) else None)
+
+
+def _rejected_body(e: BodyDecodeError) -> handlers.Reply:
+    logger.warning(f"Rejected request body: {e}")
+    request_count['errors'] += 1
+    return {'error': 'Bad request body', 'message': str(e)}, e.status
+
+
+async def _call_strategy(handler: Callable, body: bytes,
+                         decoder: Optional[StreamDecoder]) -> handlers.Reply:
+    global _pending_ticks
+    is_tick = handler is handlers.handle_tick
+
+    if is_tick and _pending_ticks >= config.ASGI_MAX_PENDING_TICKS:
+        request_count['tick'] += 1
+        logger.warning(f"{_pending_ticks} ticks already pending, answering HOLD")
+        return {'action': 'HOLD'}, 200
+
+    loop = asyncio.get_running_loop()
+    if is_tick:
+        _pending_ticks += 1
+    try:
+        return await loop.run_in_executor(_strategy_pool, _parse_and_call, handler, body, decoder)
+    finally:
+        if is_tick:
+            _pending_ticks -= 1
+
+
+async def _dispatch(scope: Dict, receive: Callable) -> handlers.Reply:
+    route = ROUTES.get(scope['path'])
+    if route is None:
+        return {'error': 'Not found'}, 404
+
+    method, handler, takes_body, requires_api_key = route
+    if scope['method'] != method:
+        return {'error': 'Method not allowed'}, 405
+
+    if requires_api_key:
+        rejected = handlers.check_api_key(_header(scope, b'x-api-key'))
+        if rejected:
+            return rejected
+
+    if not takes_body:
+        return handler()
+
+    # Decompression happens on the worker, after the API key check
+    try:
+        decoder = None
+        encoding = (_header(scope, b'content-encoding') or 'identity').strip().lower()
+        if encoding != 'identity':
+            decoder = StreamDecoder(encoding, config.MAX_REQUEST_BODY_BYTES)
+        body = await _read_body(receive)
+    except BodyDecodeError as e:
+        return _rejected_body(e)
+
+    return await _call_strategy(handler, body, decoder)
+
+
+async def _send_json(send: Callable, body: Dict, status: int):
+    payload = json.dumps(body).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(payload)).encode()),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+async def _lifespan(receive: Callable, send: Callable):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Warm-up runs in the background; /ready reports when it is done
+            handlers.start_warm_up()
+            logger.info("ThothMind Trading Bot (ASGI) started")
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            _strategy_pool.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope: Dict, receive: Callable, send: Callable):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    # Servers without lifespan support never send startup; warm up on the
+    # first request instead so /ready can still turn 200
+    handlers.start_warm_up()
+    try:
+        body, status = await _dispatch(scope, receive)
+    except ClientDisconnected:
+        return
+    except Exception as e:
+        body, status = handlers.handle_error(e)
+
+    await _send_json(send, body, status)
+
+
+# =============================================================================
+# MAIN ENTRY POINT
+# =============================================================================
+if __name__ == '__main__':
+    import uvicorn
+
+    logger.info("=" * 60)
+    logger.info("ThothMind Trading Bot Starting (ASGI)")
+    logger.info("=" * 60)
+    logger.info(f"Host: {config.SERVER_HOST}")
+    logger.info(f"Port: {config.SERVER_PORT}")
+    logger.info(f"Max pending ticks: {config.ASGI_MAX_PENDING_TICKS}")
+    logger.info(f"API Key: {config.API_KEY[:10]}... (truncated)")
+    logger.info("=" * 60)
+
+    # A single process: strategy state lives in memory
+    uvicorn.run(
+        app,
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        log_level=config.LOG_LEVEL.lower(),
+        access_log=config.DEBUG_MODE
+    )
@@ -0,0 +1,61 @@
+"""
+Trutim Room Activity - maintains the denormalized Room.last_message,
+Room.last_activity_at and Room.message_count columns.
+"""
+from django.db.models import BigIntegerField, Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Room, Message
+
+
+def record_message(message):
+    """
+    Account for a newly created message. Call inside the transaction that
+    created it. The conditional UPDATE keeps the newest message even when
+    concurrent writers commit out of order.
+    """
+    Room.objects.filter(pk=message.room_id).update(
+        message_count=F('message_count') + 1,
+        last_message=Case(
+            When(last_activity_at__lte=message.created_at, then=Value(message.id)),
+            default=F('last_message'),
+            output_field=BigIntegerField(),
+        ),
+        last_activity_at=Greatest(F('last_activity_at'), Value(message.created_at)),
+    )
+
+
+def record_deletion(room_id, deleted):
+    """
+    Account for deleted messages. `deleted` is the per-model count dict
+    returned by QuerySet.delete() / Model.delete(), which includes replies
+    removed by cascade.
+    """
+    count = deleted.get(Message._meta.label, 0)
+    if not count:
+        return
+    Room.objects.filter(pk=room_id).update(
+        message_count=Greatest(F('message_count') - count, Value(0), output_field=IntegerField())
+    )
+    # The FK is SET_NULL when the last message goes; point it at the new latest
+    Room.objects.filter(pk=room_id, last_message__isnull=True).update(
+        last_message=Subquery(_latest_messages().values('id')[:1])
+    )
+
+
+def _latest_messages():
+    return Message.objects.filter(room_id=OuterRef('pk')).order_by('-created_at', '-id')
+
+
+def rebuild_room_activity(rooms=None):
+    """Recompute the denormalized columns from scratch. Returns rooms updated."""
+    rooms = Room.objects.all() if rooms is None else rooms
+    latest = _latest_messages()
+    message_count = Message.objects.filter(room_id=OuterRef('pk')).order_by().values('room_id').annotate(
+        n=Count('id')
+    ).values('n')
+    return rooms.update(
+        message_count=Coalesce(Subquery(message_count), 0),
+        last_message=Subquery(latest.values('id')[:1]),
+        last_activity_at=Coalesce(Subquery(latest.values('created_at')[:1]), F('created_at')),
+    )
@@ -2,18 +2,29 @@
 Trutim WebSocket Consumers - Live Chat, Presence & WebRTC Signaling
 """
 import json
+import asyncio
+from django.db import transaction
 from django.utils import timezone
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 
-User = get_user_model()
+from .reactions import batcher as reaction_batcher
+from .typing_indicators import coalescer as typing_coalescer
+from .presence_writes import buffer as presence_writes
+from .outbound import BatchedSendMixin
+from .presence import MAX_EXTRA_SUBSCRIPTIONS, contact_ids, presence_group, registry as presence_registry
 
-PRESENCE_GROUP = 'presence'
+User = get_user_model()
 
 
-class PresenceConsumer(AsyncWebsocketConsumer):
-    """Global presence WebSocket - tracks user status (active/idle/offline) across the app."""
+class PresenceConsumer(BatchedSendMixin, AsyncWebsocketConsumer):
+    """
+    Presence WebSocket - tracks user status (active/idle/offline). Each
+    connection only hears about its contacts (see chat.presence) plus users
+    it subscribes to with {"type": "subscribe", "user_ids": [...]}.
+    Connect with ?batch=1 to receive updates batched (see chat.outbound).
+    """
 
     async def connect(self):
         self.user = self.scope.get('user')
@@ -21,28 +32,23 @@ class PresenceConsumer(AsyncWebsocketConsumer):
             await self.close()
             return
 
-        await self.channel_layer.group_add(PRESENCE_GROUP, self.channel_name)
+        self.init_outbound()
+        self.watching = await self.get_contact_ids()
+        self.extra_subscriptions = set()
+        await self.join_presence_groups(self.watching)
         await self.accept()
 
-        status = 'active'  # Default when connecting (user is in app)
-        await self.update_user_presence(online=True, status=status)
-        await self.channel_layer.group_send(
-            PRESENCE_GROUP,
-            {'type': 'presence_update', 'user_id': self.user.id, 'status': status, 'online': True}
-        )
-        # Send current presence snapshot to the new user
-        all_presence = await self.get_all_presence()
-        await self.send(text_data=json.dumps({'type': 'presence_snapshot', 'presence': all_presence}))
+        # Default when connecting (user is in app); other tabs may already be open
+        await self.change_presence(presence_registry.connect, 'active')
+        # Current presence of this user's contacts, from the registry
+        snapshot = await presence_registry.snapshot(self.watching)
+        await self.send_event({'type': 'presence_snapshot', 'presence': snapshot})
 
     async def disconnect(self, close_code):
-        if hasattr(self, 'user') and self.user and self.user.is_authenticated:
-            await self.update_user_presence(online=False, status='deactive')
-            await self.channel_layer.group_send(
-                PRESENCE_GROUP,
-                {'type': 'presence_update', 'user_id': self.user.id, 'status': 'deactive', 'online': False}
-            )
-        if hasattr(self, 'channel_name'):
-            await self.channel_layer.group_discard(PRESENCE_GROUP, self.channel_name)
+        if hasattr(self, 'watching'):
+            self.discard_outbox()
+            await self.change_presence(presence_registry.disconnect)
+            await self.leave_presence_groups(self.watching)
 
     async def receive(self, text_data):
         try:
@@ -51,35 +57,72 @@ class PresenceConsumer(AsyncWebsocketConsumer):
                 status = data.get('status', 'active')
                 if status not in ('active', 'idle', 'deactive'):
                     status = 'active'
-                await self.update_user_presence(online=True, status=status)
-                await self.channel_layer.group_send(
-                    PRESENCE_GROUP,
-                    {'type': 'presence_update', 'user_id': self.user.id, 'status': status, 'online': True}
-                )
-        except (json.JSONDecodeError, TypeError):
+                await self.change_presence(presence_registry.update, status)
+            elif data.get('type') == 'subscribe':
+                await self.subscribe(data.get('user_ids') or [])
+            elif data.get('type') == 'unsubscribe':
+                await self.unsubscribe(data.get('user_ids') or [])
+        except (json.JSONDecodeError, TypeError, ValueError):
             pass
 
+    async def change_presence(self, change, *args):
+        """
+        Apply a registry change for this connection, then broadcast if the
+        user's effective status changed. The change reaches the database
+        through the write-behind buffer (chat.presence_writes).
+        """
+        before, after = await change(self.user.id, self.channel_name, *args)
+        if after == before:
+            return
+        presence_writes.record(self.user.id, online=after is not None, status=after or 'deactive')
+        await self.broadcast_presence(after or 'deactive', online=after is not None)
+
+    async def subscribe(self, user_ids):
+        ids = {int(uid) for uid in user_ids} - self.watching
+        ids = set(list(ids)[:max(0, MAX_EXTRA_SUBSCRIPTIONS - len(self.extra_subscriptions))])
+        if not ids:
+            return
+        self.extra_subscriptions |= ids
+        self.watching |= ids
+        await self.join_presence_groups(ids)
+        snapshot = await presence_registry.snapshot(ids)
+        await self.send_event({'type': 'presence_snapshot', 'presence': snapshot})
+
+    async def unsubscribe(self, user_ids):
+        ids = {int(uid) for uid in user_ids} & self.extra_subscriptions
+        self.extra_subscriptions -= ids
+        self.watching -= ids
+        await self.leave_presence_groups(ids)
+
+    async def join_presence_groups(self, user_ids):
+        await asyncio.gather(*(self.channel_layer.group_add(presence_group(uid), self.channel_name) for uid in user_ids))
+
+    async def leave_presence_groups(self, user_ids):
+        await asyncio.gather(*(self.channel_layer.group_discard(presence_group(uid), self.channel_name) for uid in user_ids))
+
+    async def broadcast_presence(self, status, online):
+        await self.channel_layer.group_send(
+            presence_group(self.user.id),
+            {'type': 'presence_update', 'user_id': self.user.id, 'status': status, 'online': online}
+        )
+
     async def presence_update(self, event):
-        # Broadcast to all (including sender) - each client updates their contact list
-        await self.send(text_data=json.dumps({
+        # Sent to every connection watching the user (including the user's own tabs)
+        await self.send_event({
             'type': 'presence_update',
             'user_id': event['user_id'],
             'status': event['status'],
             'online': event['online'],
-        }))
+        }, batch=True)
 
     @database_sync_to_async
-    def update_user_presence(self, online, status):
-        User.objects.filter(id=self.user.id).update(online=online, status=status)
+    def get_contact_ids(self):
+        return contact_ids(self.user.id)
 
-    @database_sync_to_async
-    def get_all_presence(self):
-        users = User.objects.filter(online=True).values('id', 'status', 'online')
-        return {str(u['id']): {'status': u['status'], 'online': u['online']} for u in users}
 
 
-class ChatConsumer(AsyncWebsocketConsumer):
-    """Handles live chat messages and presence."""
+class ChatConsumer(BatchedSendMixin, AsyncWebsocketConsumer):
+    """Handles live chat messages and presence. Connect with ?batch=1 for batched frames."""
 
     async def connect(self):
         self.user = self.scope.get('user')
@@ -87,13 +130,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.close()
             return
 
+        self.init_outbound()
         self.room_id = self.scope['url_route']['kwargs']['room_id']
         self.room_group_name = f'chat_{self.room_id}'
 
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
 
-        await self.update_user_online(True)
         await self.channel_layer.group_send(
             self.room_group_name,
             {'type': 'user_joined', 'user': await self.user_data()}
@@ -101,7 +144,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         if hasattr(self, 'room_group_name'):
-            await self.update_user_online(False)
+            self.discard_outbox()
+            typing_coalescer.update(int(self.room_id), await self.user_data(), False)
             await self.channel_layer.group_send(
                 self.room_group_name,
                 {'type': 'user_left', 'user': await self.user_data()}
@@ -115,6 +159,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         if msg_type == 'message':
             content = data.get('content', '').strip()
             if content:
+                typing_coalescer.update(int(self.room_id), await self.user_data(), False)
                 parent_id = data.get('parent')
                 channel_id = data.get('channel')
                 msg = await self.save_message(content, parent_id=parent_id, channel_id=channel_id)
@@ -141,80 +186,84 @@ class ChatConsumer(AsyncWebsocketConsumer):
                         self.room_group_name,
                         {'type': 'chat_message_deleted', 'message_id': msg_id}
                     )
+        elif msg_type == 'react':
+            msg_id = data.get('id')
+            emoji = data.get('emoji')
+            if msg_id and isinstance(emoji, str) and emoji and len(emoji) <= 64:
+                added = await self.toggle_reaction(msg_id, emoji)
+                if added is not None:
+                    await reaction_batcher.add(int(self.room_id), msg_id, emoji, self.user.id, added)
         elif msg_type == 'typing':
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {'type': 'user_typing', 'user': await self.user_data(), 'typing': data.get('typing', True), 'exclude_channel': self.channel_name}
-            )
+            # Throttled and batched per room; see chat.typing_indicators
+            typing_coalescer.update(int(self.room_id), await self.user_data(), bool(data.get('typing', True)))
         elif msg_type == 'message_read':
             message_ids = data.get('message_ids', [])
             if message_ids:
-                marked = await self.mark_messages_read(message_ids)
-                if marked:
-                    await self.channel_layer.group_send(
-                        self.room_group_name,
-                        {'type': 'message_read', 'message_ids': marked, 'user': await self.user_data()}
-                    )
+                marked, markers = await self.mark_messages_read(message_ids, explicit=bool(data.get('explicit')))
+                if marked or markers:
+                    await self.channel_layer.group_send(self.room_group_name, {
+                        'type': 'message_read', 'message_ids': marked, 'markers': markers,
+                        'user': await self.user_data(),
+                    })
 
     async def chat_message(self, event):
-        await self.send(text_data=json.dumps({'type': 'message', 'message': event['message']}))
+        await self.send_event({'type': 'message', 'message': event['message']}, batch=True)
 
     async def chat_message_edited(self, event):
-        await self.send(text_data=json.dumps({'type': 'message_edited', 'message': event['message']}))
+        await self.send_event({'type': 'message_edited', 'message': event['message']})
 
     async def chat_message_deleted(self, event):
-        await self.send(text_data=json.dumps({'type': 'message_deleted', 'message_id': event['message_id']}))
+        await self.send_event({'type': 'message_deleted', 'message_id': event['message_id']})
 
     async def user_joined(self, event):
-        await self.send(text_data=json.dumps({'type': 'user_joined', 'user': event['user']}))
+        await self.send_event({'type': 'user_joined', 'user': event['user']})
 
     async def user_left(self, event):
-        await self.send(text_data=json.dumps({'type': 'user_left', 'user': event['user']}))
+        await self.send_event({'type': 'user_left', 'user': event['user']})
 
-    async def user_typing(self, event):
-        if event.get('exclude_channel') == self.channel_name:
-            return  # Don't send typing to sender – only receivers see it
-        await self.send(text_data=json.dumps({
-            'type': 'typing', 'user': event['user'], 'typing': event['typing']
-        }))
+    async def chat_typing(self, event):
+        # Don't send a user their own typing state – only receivers see it
+        changes = [c for c in event['changes'] if c['user']['id'] != self.user.id]
+        if changes:
+            await self.send_event({'type': 'typing_batch', 'changes': changes}, batch=True)
 
     async def message_read(self, event):
-        await self.send(text_data=json.dumps({
-            'type': 'message_read', 'message_ids': event['message_ids'], 'user': event['user']
-        }))
-
-    async def chat_message_reacted(self, event):
-        # Reactions are treated as message updates on the client side.
-        await self.send(text_data=json.dumps({'type': 'message_updated', 'message': event['message']}))
+        # markers: everything in (previous_message_id, last_read_message_id] in that channel is now read
+        await self.send_event({
+            'type': 'message_read', 'message_ids': event['message_ids'],
+            'markers': event.get('markers', []), 'user': event['user'],
+        }, batch=True)
+
+    async def chat_reactions(self, event):
+        # Batched: current counts per message plus the individual changes
+        await self.send_event({
+            'type': 'reactions', 'reactions': event['reactions'], 'changes': event['changes']
+        }, batch=True)
 
     @database_sync_to_async
-    def mark_messages_read(self, message_ids):
-        from .models import Message, MessageRead
-        marked = []
-        for msg in Message.objects.filter(id__in=message_ids, room_id=self.room_id).exclude(sender=self.user):
-            _, created = MessageRead.objects.get_or_create(
-                message=msg, user=self.user, defaults={}
-            )
-            if created:
-                marked.append(msg.id)
-        return marked
+    def mark_messages_read(self, message_ids, explicit=False):
+        from .receipts import mark_read
+        return mark_read(self.user, self.room_id, message_ids, explicit=explicit)
 
     @database_sync_to_async
     def save_message(self, content, parent_id=None, channel_id=None):
         from .models import Message, Room, Channel
+        from .activity import record_message
         room = Room.objects.get(id=self.room_id)
         parent = Message.objects.filter(id=parent_id, room=room).first() if parent_id else None
         channel = None
         if channel_id is not None:
             channel = Channel.objects.filter(id=channel_id, room=room).first()
-        msg = Message.objects.create(
-            room=room,
-            channel=channel,
-            sender=self.user,
-            content=content,
-            parent=parent,
-            message_type='text',
-        )
+        with transaction.atomic():
+            msg = Message.objects.create(
+                room=room,
+                channel=channel,
+                sender=self.user,
+                content=content,
+                parent=parent,
+                message_type='text',
+            )
+            record_message(msg)
         return {
             'id': msg.id,
             'content': msg.content,
@@ -222,13 +271,16 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'created_at': msg.created_at.isoformat(),
             'sender': {'id': self.user.id, 'username': self.user.username, 'title': self.user.title or ''},
             'channel': msg.channel_id,
-            'reactions': msg.reactions or {},
+            'reactions': {},
+            'my_reactions': [],
             'read_by': []
         }
 
     @database_sync_to_async
     def edit_message(self, msg_id, content):
         from .models import Message
+        from .receipts import summarize_message
+        from .reactions import summarize_reactions
         msg = Message.objects.filter(id=msg_id, room_id=self.room_id, sender=self.user).first()
         if not msg:
             return None
@@ -243,23 +295,31 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'edited_at': msg.edited_at.isoformat() if msg.edited_at else None,
             'sender': {'id': self.user.id, 'username': self.user.username, 'title': self.user.title or ''},
             'channel': msg.channel_id,
-            'reactions': msg.reactions or {},
-            'read_by': list(msg.reads.values_list('user_id', flat=True))
+            'reactions': summarize_reactions([msg.id])[msg.id]['counts'],
+            'read_by': summarize_message(msg)['user_ids']
         }
 
+    @database_sync_to_async
+    def toggle_reaction(self, msg_id, emoji):
+        from .models import Message
+        from .reactions import toggle_reaction
+        msg = Message.objects.filter(id=msg_id, room_id=self.room_id).first()
+        if not msg:
+            return None
+        return toggle_reaction(msg, self.user, emoji)
+
     @database_sync_to_async
     def delete_message(self, msg_id):
         from .models import Message
+        from .activity import record_deletion
         msg = Message.objects.filter(id=msg_id, room_id=self.room_id, sender=self.user).first()
         if not msg:
             return False
-        msg.delete()
+        with transaction.atomic():
+            _, deleted = msg.delete()
+            record_deletion(msg.room_id, deleted)
         return True
 
-    @database_sync_to_async
-    def update_user_online(self, online):
-        User.objects.filter(id=self.user.id).update(online=online)
-
     @database_sync_to_async
     def user_data(self):
         return {'id': self.user.id, 'username': self.user.username, 'title': self.user.title or ''}
@@ -0,0 +1,219 @@
+"""
+Multi-process channel layer harness: cross-worker chat delivery latency
+and throughput on one machine.
+
+Launches --shards local Redis-compatible servers (redis-server, or
+valkey-server / keydb-server via --redis-server), then --workers ASGI
+processes (Daphne or Uvicorn) with CHANNEL_LAYER=redis and REDIS_URL
+pointing at those servers, i.e. the same settings a production deployment
+uses. --clients WebSocket clients join one scratch room, spread round-robin
+over the workers, and send chat messages at --rate per second. Each
+delivery is timed from send to receipt and split into same-worker and
+cross-worker deliveries.
+
+The workers share the configured database, so run against PostgreSQL
+(USE_SQLITE=False) for meaningful numbers; SQLite serialises every write.
+Needs the `websockets` package for the clients. Scratch users and the
+room are deleted afterwards and every process is stopped.
+
+Usage:
+    python manage.py bench_channel_layer
+    python manage.py bench_channel_layer --workers 4 --shards 2 --clients 80 --messages 500 --rate 100
+    python manage.py bench_channel_layer --server uvicorn --redis-url redis://10.0.0.5:6379/0
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import statistics
+import subprocess
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from chat.models import Room
+
+USERNAME_PREFIX = "bench_layer_"
+
+
+def wait_for_port(port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f"Nothing listening on port {port} after {timeout:.0f} s")
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = "Measure cross-process chat delivery over a Redis channel layer with several ASGI workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=3, help="ASGI worker processes")
+        parser.add_argument("--server", choices=["daphne", "uvicorn"], default="daphne")
+        parser.add_argument("--layer", choices=["redis", "redis-pubsub"], default="redis", help="CHANNEL_LAYER for the workers")
+        parser.add_argument("--shards", type=int, default=1, help="Local Redis servers to launch and shard across")
+        parser.add_argument("--redis-server", default="redis-server", help="Redis-compatible server binary")
+        parser.add_argument("--redis-url", default="", help="Use these existing servers (comma-separated) instead of launching any")
+        parser.add_argument("--base-port", type=int, default=18100, help="First port for workers; Redis uses base-port + 100")
+        parser.add_argument("--clients", type=int, default=30, help="WebSocket clients in the room")
+        parser.add_argument("--messages", type=int, default=200, help="Chat messages sent in total")
+        parser.add_argument("--rate", type=float, default=50.0, help="Messages per second")
+
+    def handle(self, *args, **options):
+        try:
+            import websockets
+        except ImportError:
+            raise CommandError("bench_channel_layer needs the websockets package (pip install websockets)")
+        self.websockets = websockets
+
+        processes = []
+        try:
+            redis_urls = self.start_redis(options, processes)
+            worker_ports = self.start_workers(options, redis_urls, processes)
+            room, tokens = self.create_fixtures(options["clients"])
+            try:
+                results = asyncio.run(self.run(room.id, tokens, worker_ports, options))
+            finally:
+                User = get_user_model()
+                room.delete()
+                User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        self.report(results, options)
+
+    def start_redis(self, options, processes):
+        if options["redis_url"]:
+            return [url.strip() for url in options["redis_url"].split(",") if url.strip()]
+        urls = []
+        for shard in range(options["shards"]):
+            port = options["base_port"] + 100 + shard
+            try:
+                processes.append(subprocess.Popen(
+                    [options["redis_server"], "--port", str(port), "--save", "", "--appendonly", "no"],
+                    stdout=subprocess.DEVNULL,
+                ))
+            except FileNotFoundError:
+                raise CommandError(f"{options['redis_server']} not found; pass --redis-server or --redis-url")
+            wait_for_port(port)
+            urls.append(f"redis://127.0.0.1:{port}/0")
+        self.stdout.write(self.style.NOTICE(f"redis: {', '.join(urls)}"))
+        return urls
+
+    def start_workers(self, options, redis_urls, processes):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "trutim.settings"),
+            "CHANNEL_LAYER": options["layer"],
+            "REDIS_URL": ",".join(redis_urls),
+            # Each run gets its own keyspace on shared servers
+            "CHANNEL_LAYER_PREFIX": f"trutim-bench-{os.getpid()}",
+        }
+        ports = [options["base_port"] + i for i in range(options["workers"])]
+        for port in ports:
+            if options["server"] == "daphne":
+                command = [sys.executable, "-m", "daphne", "-b", "127.0.0.1", "-p", str(port), "trutim.asgi:application"]
+            else:
+                command = [
+                    sys.executable, "-m", "uvicorn", "trutim.asgi:application",
+                    "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+                ]
+            processes.append(subprocess.Popen(command, cwd=settings.BASE_DIR, env=env, stderr=subprocess.DEVNULL))
+        for port in ports:
+            wait_for_port(port, timeout=60)
+        self.stdout.write(self.style.NOTICE(f"{options['server']} workers on ports {ports[0]}-{ports[-1]}"))
+        return ports
+
+    def create_fixtures(self, clients):
+        User = get_user_model()
+        User.objects.bulk_create([User(username=f"{USERNAME_PREFIX}{i}") for i in range(clients)], ignore_conflicts=True)
+        users = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by("id"))
+        room = Room.objects.create(name="bench channel layer", created_by=users[0], is_group=True)
+        room.members.set(users)
+        return room, [str(AccessToken.for_user(user)) for user in users]
+
+    async def run(self, room_id, tokens, worker_ports, options):
+        sent = {}  # seq -> (sender worker, perf_counter at send)
+        latencies = {"same": [], "cross": []}
+        expected = options["messages"] * len(tokens)
+        done = asyncio.Event()
+        received = 0
+
+        async def listen(ws, worker):
+            nonlocal received
+            async for frame in ws:
+                data = json.loads(frame)
+                if data.get("type") != "message":
+                    continue
+                content = data["message"].get("content", "")
+                if not content.startswith("bench "):
+                    continue
+                sender_worker, t0 = sent[int(content.split()[1])]
+                latencies["same" if sender_worker == worker else "cross"].append(time.perf_counter() - t0)
+                received += 1
+                if received >= expected:
+                    done.set()
+
+        connections = []
+        for i, token in enumerate(tokens):
+            worker = i % len(worker_ports)
+            url = f"ws://127.0.0.1:{worker_ports[worker]}/ws/chat/{room_id}/?token={token}"
+            connections.append((await self.websockets.connect(url), worker))
+        listeners = [asyncio.create_task(listen(ws, worker)) for ws, worker in connections]
+        await asyncio.sleep(1.0)  # let the join broadcasts settle
+
+        start = time.perf_counter()
+        for seq in range(options["messages"]):
+            ws, worker = connections[seq % len(connections)]
+            sent[seq] = (worker, time.perf_counter())
+            await ws.send(json.dumps({"type": "message", "content": f"bench {seq}"}))
+            await asyncio.sleep(max(0.0, start + (seq + 1) / options["rate"] - time.perf_counter()))
+        try:
+            await asyncio.wait_for(done.wait(), timeout=30)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.perf_counter() - start
+
+        for task in listeners:
+            task.cancel()
+        await asyncio.gather(*(ws.close() for ws, _ in connections), return_exceptions=True)
+        return {"expected": expected, "received": received, "elapsed": elapsed, "latencies": latencies}
+
+    def report(self, results, options):
+        received, expected = results["received"], results["expected"]
+        self.stdout.write(
+            f"{options['workers']} workers, {options['clients']} clients, {options['messages']} messages: "
+            f"{received}/{expected} deliveries in {results['elapsed']:.1f} s "
+            f"({received / results['elapsed']:.0f} deliveries/s)"
+        )
+        for kind, values in results["latencies"].items():
+            if not values:
+                continue
+            ms = [v * 1000 for v in values]
+            self.stdout.write(
+                f"  {kind:>5}-worker: n={len(ms)} mean={statistics.mean(ms):.1f} ms "
+                f"p50={percentile(ms, 50):.1f} p95={percentile(ms, 95):.1f} p99={percentile(ms, 99):.1f} ms"
+            )
+        style = self.style.SUCCESS if received == expected else self.style.ERROR
+        self.stdout.write(style("all deliveries arrived" if received == expected else "deliveries missing"))
+        if received != expected:
+            raise CommandError(f"{expected - received} deliveries missing")
@@ -0,0 +1,86 @@
+"""
+Benchmark message history page latency as a room grows.
+
+Seeds a scratch room up to each size and times the newest page, a page
+from the middle of the history and the oldest page using keyset cursors,
+next to the equivalent OFFSET query for comparison. Keyset page times
+should stay flat as the room grows; OFFSET times grow with depth.
+
+Usage:
+    python manage.py bench_message_history
+    python manage.py bench_message_history --sizes 1000 100000 10000000 --keep
+"""
+import time
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+
+from chat.models import Room, Message
+from chat.pagination import DEFAULT_PAGE_SIZE, encode_cursor, keyset_page
+
+BENCH_ROOM_NAME = '__bench_message_history__'
+
+
+class Command(BaseCommand):
+    help = "Time keyset vs offset message history pages at growing room sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                            help="Room sizes (messages) to measure at, ascending")
+        parser.add_argument("--repeats", type=int, default=20, help="Timed runs per page")
+        parser.add_argument("--batch", type=int, default=5000, help="bulk_create batch size while seeding")
+        parser.add_argument("--keep", action="store_true", help="Keep the scratch room afterwards")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        sender, _ = User.objects.get_or_create(username="bench_sender", defaults={"title": "Benchmark"})
+        room, _ = Room.objects.get_or_create(name=BENCH_ROOM_NAME, defaults={"created_by": sender, "is_direct": True})
+        # Same filter the API applies to a DM room's history
+        qs = Message.objects.filter(room=room, channel__isnull=True)
+
+        self.stdout.write(f"{'messages':>10} {'newest':>9} {'middle':>9} {'oldest':>9} {'offset-mid':>11} {'offset-old':>11}  (ms, median)")
+        try:
+            for size in sorted(options["sizes"]):
+                self._seed(room, sender, size, options["batch"])
+                middle = qs.order_by("created_at", "id")[size // 2]
+                oldest = qs.order_by("created_at", "id")[DEFAULT_PAGE_SIZE]
+                repeats = options["repeats"]
+                row = [
+                    self._time(lambda: keyset_page(qs), repeats),
+                    self._time(lambda: keyset_page(qs, before=encode_cursor(middle)), repeats),
+                    self._time(lambda: keyset_page(qs, before=encode_cursor(oldest)), repeats),
+                    self._time(lambda: self._offset_page(qs, size // 2), repeats),
+                    self._time(lambda: self._offset_page(qs, size - DEFAULT_PAGE_SIZE), repeats),
+                ]
+                self.stdout.write(f"{size:>10} " + " ".join(f"{ms:>9.2f}" for ms in row[:3])
+                                  + " " + " ".join(f"{ms:>11.2f}" for ms in row[3:]))
+        finally:
+            if not options["keep"]:
+                self.stdout.write(self.style.NOTICE("Removing scratch room..."))
+                room.delete()
+
+    def _seed(self, room, sender, size, batch):
+        existing = Message.objects.filter(room=room).count()
+        if existing >= size:
+            return
+        self.stdout.write(self.style.NOTICE(f"Seeding {size - existing} messages..."))
+        for start in range(existing, size, batch):
+            Message.objects.bulk_create(
+                Message(room=room, sender=sender, content=f"bench message {i}", message_type="text")
+                for i in range(start, min(start + batch, size))
+            )
+
+    @staticmethod
+    def _offset_page(qs, offset):
+        return list(qs.order_by("created_at", "id")[offset:offset + DEFAULT_PAGE_SIZE])
+
+    @staticmethod
+    def _time(fn, repeats):
+        fn()  # warm caches
+        samples = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,100 @@
+"""
+Load test outbound WebSocket frames: one frame per event vs batched frames
+(chat.outbound, clients connecting with ?batch=1).
+
+Drives the real ChatConsumer and PresenceConsumer handlers for --clients
+connections in one busy room, without sockets: each connection's send()
+only counts frames and bytes. Events arrive at --rate per second for
+--seconds, mixed like a busy room (new messages, typing batches, read
+receipts, presence updates). Reports frames, bytes and the CPU time spent
+in the handlers, including JSON encoding.
+
+Usage:
+    python manage.py bench_outbound
+    python manage.py bench_outbound --clients 1000 --rate 300 --seconds 5
+"""
+import time
+import random
+import asyncio
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from chat.consumers import ChatConsumer, PresenceConsumer
+
+ROOM_ID = 1
+
+
+class Command(BaseCommand):
+    help = "Compare frame counts and CPU time for unbatched vs batched outbound WebSocket events."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=500, help="Connected clients in the room")
+        parser.add_argument("--rate", type=float, default=200.0, help="Events per second reaching the room")
+        parser.add_argument("--seconds", type=float, default=3.0, help="Duration")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        for batching in (False, True):
+            frames, size, events, cpu = asyncio.run(self.run(batching, options))
+            label = "batched" if batching else "unbatched"
+            self.stdout.write(
+                f"{label:>9}: {events} events -> {frames} frames ({frames / options['clients']:.0f} per client), "
+                f"{size / 1e6:.1f} MB, {cpu * 1000:.0f} ms CPU"
+            )
+
+    def connect(self, consumer_class, user_id, batching, counters):
+        consumer = consumer_class()
+        consumer.scope = {"query_string": b"batch=1" if batching else b""}
+        consumer.user = SimpleNamespace(id=user_id)
+
+        async def send(text_data=None, bytes_data=None, close=False):
+            counters["frames"] += 1
+            counters["bytes"] += len(text_data)
+
+        consumer.send = send
+        consumer.init_outbound()
+        return consumer
+
+    def event_stream(self, options):
+        rng = random.Random(options["seed"])
+        clients = options["clients"]
+        next_id = 1
+        while True:
+            user = {"id": rng.randint(1, clients), "username": "someone", "title": ""}
+            kind = rng.random()
+            if kind < 0.35:
+                next_id += 1
+                yield "chat", "chat_message", {"message": {
+                    "id": next_id, "room": ROOM_ID, "sender": user, "content": "x" * rng.randint(10, 200),
+                    "created_at": "2026-10-19T12:00:00Z", "reactions": {}, "my_reactions": [],
+                }}
+            elif kind < 0.6:
+                yield "chat", "chat_typing", {"changes": [{"user": user, "typing": rng.random() < 0.8}]}
+            elif kind < 0.85:
+                yield "chat", "message_read", {"message_ids": [next_id], "user": user}
+            else:
+                yield "presence", "presence_update", {
+                    "user_id": user["id"], "status": rng.choice(["active", "idle"]), "online": True,
+                }
+
+    async def run(self, batching, options):
+        counters = {"frames": 0, "bytes": 0}
+        connections = {
+            "chat": [self.connect(ChatConsumer, i, batching, counters) for i in range(1, options["clients"] + 1)],
+            "presence": [self.connect(PresenceConsumer, i, batching, counters) for i in range(1, options["clients"] + 1)],
+        }
+        total = int(options["rate"] * options["seconds"])
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        cpu_start = time.process_time()
+        for n, (consumer_kind, handler, event) in zip(range(total), self.event_stream(options)):
+            for consumer in connections[consumer_kind]:
+                await getattr(consumer, handler)(event)
+            delay = start + (n + 1) / options["rate"] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        for consumer in connections["chat"] + connections["presence"]:
+            await consumer.flush_outbox()
+        await asyncio.sleep(0)  # let any timer flushes that already started finish
+        return counters["frames"], counters["bytes"], total, time.process_time() - cpu_start
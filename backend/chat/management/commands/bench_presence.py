@@ -0,0 +1,107 @@
+"""
+Load test presence fan-out: frames delivered with one global presence group
+vs contact-scoped presence groups (chat.presence).
+
+Builds a synthetic org in memory: users split into companies, plus small
+group chats and DMs. Every user connects and then changes status a few
+times. The scoped run goes through an in-memory channel layer using the
+same presence_<user_id> groups as PresenceConsumer and counts delivered
+frames. With a single global group every change reaches every connected
+user, so that count is computed exactly rather than pushed through the
+layer.
+
+Usage:
+    python manage.py bench_presence
+    python manage.py bench_presence --users 5000 --company-size 100 --changes 4
+"""
+import time
+import random
+import asyncio
+from collections import defaultdict
+
+from channels.layers import InMemoryChannelLayer
+from django.core.management.base import BaseCommand
+
+from chat.presence import presence_group
+
+
+class Command(BaseCommand):
+    help = "Compare presence message volume for global vs contact-scoped fan-out."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5000, help="Concurrent users")
+        parser.add_argument("--company-size", type=int, default=100, help="Members per company room")
+        parser.add_argument("--groups", type=int, default=3, help="Group chats per user (3-12 members each)")
+        parser.add_argument("--dms", type=int, default=10, help="DM partners per user")
+        parser.add_argument("--changes", type=int, default=4, help="Status changes per user after connecting")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        contacts = self.build_org(options)
+        users = options["users"]
+        events = users * (1 + options["changes"])
+        avg_contacts = sum(len(c) for c in contacts.values()) / users
+
+        # Global group: every change goes to every connected user. Users connect
+        # one by one, so the i-th connect reaches i connections.
+        global_frames = users * (users + 1) // 2 + users * options["changes"] * users
+
+        frames, group_adds, cpu = asyncio.run(self.run_scoped(contacts, options))
+        self.stdout.write(f"users: {users}, avg contacts: {avg_contacts:.0f}, presence events: {events}")
+        self.stdout.write(f"global group : {global_frames:>12} frames ({global_frames / events:.0f} per event)")
+        self.stdout.write(
+            f"scoped groups: {frames:>12} frames ({frames / events:.0f} per event), "
+            f"{group_adds} group_add calls, {cpu:.2f} s CPU"
+        )
+        self.stdout.write(self.style.SUCCESS(f"reduction: {global_frames / max(frames, 1):.1f}x"))
+
+    def build_org(self, options):
+        rng = random.Random(options["seed"])
+        users = list(range(1, options["users"] + 1))
+        rooms = []
+        size = options["company_size"]
+        rooms.extend(users[i:i + size] for i in range(0, len(users), size))
+        for user in users:
+            for _ in range(options["groups"]):
+                rooms.append([user] + rng.sample(users, rng.randint(2, 11)))
+            for peer in rng.sample(users, options["dms"]):
+                rooms.append([user, peer])
+
+        contacts = defaultdict(set)
+        for members in rooms:
+            for user in members:
+                contacts[user].update(members)
+        return contacts
+
+    async def run_scoped(self, contacts, options):
+        rng = random.Random(options["seed"])
+        layer = InMemoryChannelLayer(capacity=10 ** 7)
+        channels = {}
+        frames = 0
+        group_adds = 0
+        cpu_start = time.process_time()
+
+        async def send(user, status):
+            await layer.group_send(presence_group(user), {
+                "type": "presence_update", "user_id": user, "status": status, "online": True,
+            })
+
+        def drain():
+            nonlocal frames
+            for queue in layer.channels.values():
+                frames += queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+
+        for user, watching in contacts.items():
+            channels[user] = await layer.new_channel()
+            for contact in watching:
+                await layer.group_add(presence_group(contact), channels[user])
+                group_adds += 1
+            await send(user, "active")
+            drain()
+        for _ in range(options["changes"]):
+            for user in contacts:
+                await send(user, rng.choice(["active", "idle"]))
+            drain()
+        return frames, group_adds, time.process_time() - cpu_start
@@ -0,0 +1,106 @@
+"""
+Benchmark presence writes during a reconnect storm: one UPDATE per
+presence change vs the write-behind buffer (chat.presence_writes).
+
+Creates --users scratch users, then replays a storm in which every user
+reconnects --reconnects times (offline, then online again) over --seconds,
+and reports database statements per second and the time spent writing.
+The scratch users are deleted afterwards.
+
+Usage:
+    python manage.py bench_presence_writes
+    python manage.py bench_presence_writes --users 2000 --reconnects 5 --seconds 10
+"""
+import time
+import random
+import asyncio
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from chat.presence_writes import PresenceWriteBuffer
+
+USERNAME_PREFIX = "bench_presence_"
+
+
+class Command(BaseCommand):
+    help = "Compare database writes per second for direct vs buffered presence updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--reconnects", type=int, default=3, help="Reconnects per user during the storm")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Storm duration")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        User.objects.bulk_create(
+            [User(username=f"{USERNAME_PREFIX}{i}") for i in range(options["users"])], ignore_conflicts=True
+        )
+        user_ids = list(User.objects.filter(username__startswith=USERNAME_PREFIX).values_list("id", flat=True))
+        try:
+            for mode in ("direct", "buffered"):
+                events, statements, db_seconds, wall = asyncio.run(self.storm(mode, user_ids, options))
+                self.stdout.write(
+                    f"{mode:>8}: {events} presence changes in {wall:.1f} s -> {statements} statements "
+                    f"({statements / wall:.0f}/s), {db_seconds * 1000:.0f} ms in the database"
+                )
+        finally:
+            User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def schedule(self, user_ids, options):
+        """(offset seconds, user_id, online) for every change in the storm, in time order."""
+        rng = random.Random(options["seed"])
+        events = []
+        for user_id in user_ids:
+            for _ in range(options["reconnects"]):
+                at = rng.uniform(0, options["seconds"])
+                events.append((at, user_id, False))
+                events.append((at + rng.uniform(0.05, 0.5), user_id, True))
+        return sorted(events)
+
+    async def storm(self, mode, user_ids, options):
+        User = get_user_model()
+        db_seconds = 0.0
+        statements = 0
+        interval = settings.CHAT_REALTIME["PRESENCE_FLUSH_INTERVAL_MS"] / 1000
+        buffer = PresenceWriteBuffer(interval, settings.CHAT_REALTIME["PRESENCE_FLUSH_MAX_PENDING"])
+
+        def write(user_id, online):
+            User.objects.filter(id=user_id).update(
+                online=online, status="active" if online else "deactive", last_seen=timezone.now()
+            )
+
+        untimed_flush = buffer.flush
+
+        def timed_flush():
+            nonlocal db_seconds
+            t0 = time.perf_counter()
+            written = untimed_flush()
+            db_seconds += time.perf_counter() - t0
+            return written
+
+        buffer.flush = timed_flush  # the buffer's own timer flushes through this
+
+        events = self.schedule(user_ids, options)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for at, user_id, online in events:
+            delay = start + at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if mode == "direct":
+                t0 = time.perf_counter()
+                await database_sync_to_async(write)(user_id, online)
+                db_seconds += time.perf_counter() - t0
+                statements += 1
+            else:
+                buffer.record(user_id, online=online, status="active" if online else "deactive")
+
+        if mode == "buffered":
+            await database_sync_to_async(buffer.flush)()  # the shutdown flush
+            statements = buffer.statements
+        return len(events), statements, db_seconds, loop.time() - start
@@ -0,0 +1,89 @@
+"""
+Load test typing indicators: frames delivered per connection with the
+legacy per-keystroke broadcast vs the throttled, batched coalescer.
+
+Simulates one room with --members connections, of which --typists type in
+bursts (one typing frame per keystroke, "typing: false" when a message is
+sent), against an in-memory channel layer. Both modes replay the same
+keystroke schedule, generated once from --seed. Reports frames delivered
+to the room's connections and the CPU time spent producing them.
+
+Usage:
+    python manage.py bench_typing
+    python manage.py bench_typing --members 500 --typists 20 --seconds 20
+"""
+import time
+import random
+import asyncio
+
+from channels.layers import InMemoryChannelLayer
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chat.typing_indicators import TypingCoalescer
+
+ROOM_ID = 1
+
+
+class Command(BaseCommand):
+    help = "Compare typing frame counts before and after coalescing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=200, help="Connections in the room")
+        parser.add_argument("--typists", type=int, default=10, help="Members typing concurrently")
+        parser.add_argument("--seconds", type=float, default=10.0, help="Simulated duration")
+        parser.add_argument("--keys-per-second", type=float, default=6.0, help="Keystrokes per typist")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        schedule = self.schedule(options)
+        for mode in ("legacy", "coalesced"):
+            frames, cpu = asyncio.run(self.run(mode, schedule, options))
+            self.stdout.write(
+                f"{mode:>10}: {len(schedule)} keystrokes -> {frames} frames delivered "
+                f"({frames / options['members']:.1f} per connection, "
+                f"{frames / len(schedule):.1f} per keystroke, {cpu * 1000:.0f} ms CPU)"
+            )
+
+    def schedule(self, options):
+        """(seconds from start, user id, typing) for every frame, sorted by time."""
+        rng = random.Random(options["seed"])
+        events = []
+        for user_id in range(options["typists"]):
+            t = 0.0
+            while t < options["seconds"]:
+                for _ in range(rng.randint(10, 60)):  # one message's worth of keystrokes
+                    events.append((t, user_id, True))
+                    t += rng.expovariate(options["keys_per_second"])
+                events.append((t, user_id, False))
+                t += rng.uniform(1.0, 5.0)
+        events.sort()
+        return events
+
+    async def run(self, mode, schedule, options):
+        layer = InMemoryChannelLayer(capacity=10 ** 7)
+        group = f"chat_{ROOM_ID}"
+        for _ in range(options["members"]):
+            await layer.group_add(group, await layer.new_channel())
+        coalescer = TypingCoalescer(
+            settings.CHAT_REALTIME["TYPING_BATCH_MS"] / 1000,
+            settings.CHAT_REALTIME["TYPING_EXPIRE_MS"] / 1000,
+            channel_layer=layer,
+        )
+        users = {}
+
+        loop = asyncio.get_running_loop()
+        cpu_start = time.process_time()
+        start = loop.time()
+        for at, user_id, typing in schedule:
+            await asyncio.sleep(max(0.0, start + at - loop.time()))
+            user = users.setdefault(user_id, {"id": user_id, "username": f"user{user_id}", "title": ""})
+            if mode == "legacy":
+                await layer.group_send(group, {"type": "user_typing", "user": user, "typing": typing})
+            else:
+                coalescer.update(ROOM_ID, user, typing)
+        await asyncio.sleep(settings.CHAT_REALTIME["TYPING_BATCH_MS"] / 1000 * 2)  # let the last batch out
+        cpu = time.process_time() - cpu_start
+
+        frames = sum(queue.qsize() for queue in layer.channels.values())
+        return frames, cpu
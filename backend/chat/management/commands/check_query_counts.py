@@ -0,0 +1,114 @@
+"""
+Check that list endpoints run a constant number of queries.
+
+Builds throwaway fixtures at a small and a large size inside a transaction
+that is always rolled back, calls each list endpoint through DRF and
+compares the query counts. Exits non-zero if any endpoint's count grows
+with the size of the data.
+
+Usage:
+    python manage.py check_query_counts
+    python manage.py check_query_counts --small 5 --large 200 --verbose
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from chat.activity import rebuild_room_activity
+from chat.models import Room, Message
+from chat.receipts import mark_read
+from chat.views import RoomViewSet, MessageViewSet
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Assert that list endpoints use a constant number of queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--small", type=int, default=5, help="Fixture size for the baseline run")
+        parser.add_argument("--large", type=int, default=200, help="Fixture size for the comparison run")
+        parser.add_argument("--verbose", action="store_true", help="Print the captured SQL")
+
+    def handle(self, *args, **options):
+        self.verbose = options["verbose"]
+        failures = []
+        for name, check in self.checks():
+            small = self._count(check, options["small"])
+            large = self._count(check, options["large"])
+            ok = small == large
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f"{name}: {small} queries at {options['small']}, {large} at {options['large']}"))
+            if not ok:
+                failures.append(name)
+        if failures:
+            raise CommandError(f"Query count grows with data size: {', '.join(failures)}")
+
+    def checks(self):
+        return [
+            ("rooms list", self.check_room_list),
+            ("messages list", self.check_message_list),
+        ]
+
+    def _count(self, check, size):
+        try:
+            with transaction.atomic():
+                request = check(size)
+                with CaptureQueriesContext(connection) as ctx:
+                    response = request()
+                    response.render()
+                if response.status_code != 200:
+                    raise CommandError(f"Endpoint returned {response.status_code}")
+                if self.verbose:
+                    for query in ctx.captured_queries:
+                        self.stdout.write(query["sql"])
+                raise _Rollback()
+        except _Rollback:
+            pass
+        return len(ctx.captured_queries)
+
+    def _user(self, username):
+        return get_user_model().objects.create_user(username=username, password="x")
+
+    def check_room_list(self, size):
+        """`size` company rooms and `size` DMs, each with a few messages."""
+        me = self._user("qc_me")
+        for i in range(size):
+            other = self._user(f"qc_peer_{i}")
+            company = Room.objects.create(name=f"qc company {i}", created_by=me)
+            company.members.add(me, other)
+            dm = Room.objects.create(name=f"qc dm {i}", created_by=me, is_direct=True)
+            dm.members.add(me, other)
+            Message.objects.bulk_create(
+                Message(room=room, sender=other, content=f"hello {n}")
+                for room in (company, dm) for n in range(3)
+            )
+        rebuild_room_activity()
+
+        view = RoomViewSet.as_view({"get": "list"})
+        request = APIRequestFactory().get("/api/rooms/")
+        force_authenticate(request, user=me)
+        return lambda: view(request)
+
+    def check_message_list(self, size):
+        """One room with `size` messages, half covered by read markers, a few explicit receipts."""
+        me = self._user("qc_me")
+        readers = [self._user(f"qc_reader_{i}") for i in range(5)]
+        room = Room.objects.create(name="qc room", created_by=me)
+        room.members.add(me, *readers)
+        messages = Message.objects.bulk_create(
+            Message(room=room, sender=readers[n % len(readers)], content=f"hello {n}") for n in range(size)
+        )
+        ids = [message.id for message in messages]
+        for user in [me, *readers]:
+            mark_read(user, room.id, ids[:size // 2])
+            mark_read(user, room.id, ids[size // 2:size // 2 + 3], explicit=True)
+
+        view = MessageViewSet.as_view({"get": "list"})
+        request = APIRequestFactory().get("/api/messages/", {"room": room.id})
+        force_authenticate(request, user=me)
+        return lambda: view(request)
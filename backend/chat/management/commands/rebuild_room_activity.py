@@ -0,0 +1,30 @@
+"""
+Rebuild the denormalized room activity columns (last_message,
+last_activity_at, message_count) from the messages table.
+
+Usage:
+    python manage.py rebuild_room_activity
+    python manage.py rebuild_room_activity --room 12 --room 40
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from chat.activity import rebuild_room_activity
+from chat.models import Room
+
+
+class Command(BaseCommand):
+    help = "Recompute Room.last_message, last_activity_at and message_count from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--room", type=int, action="append", help="Only rebuild this room id (repeatable)")
+
+    def handle(self, *args, **options):
+        rooms = Room.objects.all()
+        if options["room"]:
+            rooms = rooms.filter(id__in=options["room"])
+
+        self.stdout.write(self.style.NOTICE("Rebuilding room activity..."))
+        with transaction.atomic():
+            updated = rebuild_room_activity(rooms)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {updated} rooms."))
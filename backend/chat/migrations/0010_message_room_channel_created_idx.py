@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0009_room_is_group_channel_message_channel'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['room', 'channel', 'created_at'], name='trutim_msg_room_chan_created'),
+        ),
+    ]
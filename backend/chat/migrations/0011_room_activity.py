@@ -0,0 +1,51 @@
+# Generated by Django 4.2.28 on 2026-10-19 11:03
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_room_activity(apps, schema_editor):
+    Room = apps.get_model('chat', 'Room')
+    Message = apps.get_model('chat', 'Message')
+    latest = Message.objects.filter(room_id=OuterRef('pk')).order_by('-created_at', '-id')
+    message_count = Message.objects.filter(room_id=OuterRef('pk')).order_by().values('room_id').annotate(
+        n=Count('id')
+    ).values('n')
+    Room.objects.update(
+        message_count=Coalesce(Subquery(message_count), 0),
+        last_message=Subquery(latest.values('id')[:1]),
+        last_activity_at=Coalesce(Subquery(latest.values('created_at')[:1]), F('created_at')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0010_message_room_channel_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.message'),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['-last_activity_at', '-id'], name='trutim_room_activity'),
+        ),
+        migrations.RunPython(backfill_room_activity, migrations.RunPython.noop),
+    ]
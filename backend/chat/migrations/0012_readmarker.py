@@ -0,0 +1,37 @@
+# Generated by Django 4.2.28 on 2026-10-19 11:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0011_room_activity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadMarker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel_key', models.BigIntegerField(default=0)),
+                ('last_read_message_id', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_markers', to='chat.room')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_markers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'trutim_read_markers',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='readmarker',
+            constraint=models.UniqueConstraint(fields=('user', 'room', 'channel_key'), name='trutim_read_marker_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='readmarker',
+            index=models.Index(fields=['room', 'channel_key', '-last_read_message_id'], name='trutim_read_marker_scope'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.28 on 2026-10-19 12:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_json_reactions(apps, schema_editor):
+    Message = apps.get_model('chat', 'Message')
+    MessageReaction = apps.get_model('chat', 'MessageReaction')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    user_ids = set(User.objects.values_list('id', flat=True))
+
+    batch = []
+    for message_id, reactions in Message.objects.exclude(reactions={}).values_list('id', 'reactions').iterator():
+        for emoji, reactors in (reactions or {}).items():
+            for user_id in reactors or []:
+                try:
+                    user_id = int(user_id)
+                except (TypeError, ValueError):
+                    continue
+                if user_id in user_ids:
+                    batch.append(MessageReaction(message_id=message_id, user_id=user_id, emoji=emoji[:64]))
+        if len(batch) >= 1000:
+            MessageReaction.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    MessageReaction.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0012_readmarker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageReaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('emoji', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('message', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='message_reactions', to='chat.message')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='message_reactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'trutim_message_reactions',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='messagereaction',
+            constraint=models.UniqueConstraint(fields=('message', 'user', 'emoji'), name='trutim_reaction_unique'),
+        ),
+        migrations.RunPython(copy_json_reactions, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,7 @@ Trutim Chat Models - Users, Rooms, Messages
 """
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -12,7 +13,8 @@ class User(AbstractUser):
     online = models.BooleanField(default=False)
     STATUS_CHOICES = [('active', 'Active'), ('idle', 'Idle'), ('deactive', 'Offline')]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='deactive')
-    last_seen = models.DateTimeField(auto_now=True)
+    # Presence checkpoint, written by chat.presence_writes (not on every save)
+    last_seen = models.DateTimeField(default=timezone.now)
     # Location: exact coordinates + human-readable address
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
@@ -45,10 +47,18 @@ class Room(models.Model):
     members = models.ManyToManyField(User, related_name='rooms', blank=True)
     is_direct = models.BooleanField(default=False)  # 1-on-1 chat
     is_group = models.BooleanField(default=False)  # Custom group chat (sidebar "Groups")
+    # Denormalized from messages (see chat.activity); rebuild with `manage.py rebuild_room_activity`
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    message_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         db_table = 'trutim_rooms'
         ordering = ['-created_at']
+        indexes = [
+            # Inbox: rooms ordered by most recent activity
+            models.Index(fields=['-last_activity_at', '-id'], name='trutim_room_activity'),
+        ]
 
 
 class Channel(models.Model):
@@ -79,16 +89,37 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     edited_at = models.DateTimeField(null=True, blank=True)
     message_type = models.CharField(max_length=20, default='text', blank=True, null=True)
-    # Reactions/emojis stored as JSON: {"👍": ["user1_id"], "❤️": ["user2_id"]}
+    # Legacy JSON reactions ({"👍": ["user1_id"]}), copied into MessageReaction by migration 0013
     reactions = models.JSONField(default=dict, blank=True)
 
     class Meta:
         db_table = 'trutim_messages'
         ordering = ['created_at']
+        indexes = [
+            # History pages: room (+ channel) filter, keyset on created_at
+            models.Index(fields=['room', 'channel', 'created_at'], name='trutim_msg_room_chan_created'),
+        ]
+
+
+class MessageReaction(models.Model):
+    """One user's emoji reaction to a message; toggled by insert / delete."""
+    message = models.ForeignKey(Message, on_delete=models.CASCADE, related_name='message_reactions')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='message_reactions')
+    emoji = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'trutim_message_reactions'
+        constraints = [
+            models.UniqueConstraint(fields=['message', 'user', 'emoji'], name='trutim_reaction_unique'),
+        ]
 
 
 class MessageRead(models.Model):
-    """Tracks which users have read which messages (read receipts)."""
+    """
+    Explicit read receipt for a single message. Only kept for messages above
+    the reader's ReadMarker; the marker covers everything below it.
+    """
     message = models.ForeignKey(Message, on_delete=models.CASCADE, related_name='reads')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='message_reads')
     read_at = models.DateTimeField(auto_now_add=True)
@@ -98,6 +129,26 @@ class MessageRead(models.Model):
         unique_together = [('user', 'message')]
 
 
+class ReadMarker(models.Model):
+    """Per-user "read up to" pointer for a room or one of its channels."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='read_markers')
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='read_markers')
+    # Channel id, or 0 for messages without a channel (DMs); not a FK so the unique key has no NULLs
+    channel_key = models.BigIntegerField(default=0)
+    last_read_message_id = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'trutim_read_markers'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'room', 'channel_key'], name='trutim_read_marker_unique'),
+        ]
+        indexes = [
+            # Readers of a message: markers in its scope at or above its id
+            models.Index(fields=['room', 'channel_key', '-last_read_message_id'], name='trutim_read_marker_scope'),
+        ]
+
+
 class CallSession(models.Model):
     """Video call / screen share session."""
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='call_sessions')
@@ -0,0 +1,57 @@
+"""
+Trutim Outbound Batching - several events per WebSocket frame
+
+A client that connects with ?batch=1 receives every frame as a JSON array
+of events instead of one object per frame. High-volume events (new
+messages, typing, read receipts, presence updates) are queued per
+connection and flushed after OUTBOUND_BATCH_MS, or as soon as
+OUTBOUND_BATCH_MAX_EVENTS are waiting. Any other event flushes the queue
+immediately with itself appended, so clients still see events in order.
+Clients without the flag get the usual one-object frames.
+"""
+import json
+import asyncio
+from urllib.parse import parse_qs
+
+from django.conf import settings
+
+
+class BatchedSendMixin:
+    """For AsyncWebsocketConsumer subclasses: call init_outbound() in connect()."""
+
+    batch_window_s = settings.CHAT_REALTIME['OUTBOUND_BATCH_MS'] / 1000
+    batch_max_events = settings.CHAT_REALTIME['OUTBOUND_BATCH_MAX_EVENTS']
+
+    def init_outbound(self):
+        params = parse_qs(self.scope.get('query_string', b'').decode())
+        self.batching = params.get('batch', ['0'])[0] in ('1', 'true')
+        self._outbox = []
+        self._flush_handle = None
+
+    async def send_event(self, event, batch=False):
+        """Send `event` now, or queue it when batching and `batch` is set."""
+        if not self.batching:
+            await self.send(text_data=json.dumps(event))
+            return
+        self._outbox.append(event)
+        if not batch or len(self._outbox) >= self.batch_max_events:
+            await self.flush_outbox()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.batch_window_s, lambda: loop.create_task(self.flush_outbox()))
+
+    async def flush_outbox(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._outbox:
+            return
+        events, self._outbox = self._outbox, []
+        await self.send(text_data=json.dumps(events))
+
+    def discard_outbox(self):
+        """On disconnect: the socket is going away, drop anything queued."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._outbox = []
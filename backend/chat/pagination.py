@@ -0,0 +1,107 @@
+"""
+Trutim Pagination - keyset (cursor) pagination for message history
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(message):
+    """Opaque cursor for a message's position in (created_at, id) order."""
+    raw = f'{message.created_at.isoformat()}|{message.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise NotFound('Invalid cursor')
+
+
+def keyset_page(queryset, before=None, after=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return (messages, has_more) for one page, oldest first.
+
+    With no cursor this is the newest page; `before` walks back in history
+    and `after` walks forward. Each page is a single range scan on the
+    (room, channel, created_at) index, so its cost does not depend on how
+    deep into the history it is.
+    """
+    if after:
+        created_at, pk = decode_cursor(after)
+        # The created_at__gte bound lets the planner seek the index directly;
+        # the OR only breaks ties between messages sharing a timestamp.
+        queryset = queryset.filter(created_at__gte=created_at).filter(
+            Q(created_at__gt=created_at) | Q(id__gt=pk)
+        ).order_by('created_at', 'id')
+    else:
+        if before:
+            created_at, pk = decode_cursor(before)
+            queryset = queryset.filter(created_at__lte=created_at).filter(
+                Q(created_at__lt=created_at) | Q(id__lt=pk)
+            )
+        queryset = queryset.order_by('-created_at', '-id')
+
+    page = list(queryset[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    if not after:
+        page.reverse()
+    return page, has_more
+
+
+class MessageKeysetPagination(BasePagination):
+    """
+    Cursor pagination for /messages/?room=<id>[&channel=<id>].
+
+    Query params: `before` / `after` (cursors) and `limit`.
+    The body stays a plain list of messages, oldest first; cursors for the
+    neighbouring pages are returned in the X-Cursor-Before / X-Cursor-After
+    headers (absent when there is nothing further in that direction).
+    """
+    page_size = DEFAULT_PAGE_SIZE
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(limit, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        before = request.query_params.get('before')
+        after = request.query_params.get('after')
+        page, has_more = keyset_page(queryset, before=before, after=after, limit=self.get_limit(request))
+
+        self.before_cursor = None
+        self.after_cursor = None
+        if page:
+            # Walking forwards, everything before this page is older history;
+            # walking backwards, everything after it is newer.
+            more_before = bool(after) or has_more
+            more_after = has_more if after else bool(before)
+            if more_before:
+                self.before_cursor = encode_cursor(page[0])
+            if more_after:
+                self.after_cursor = encode_cursor(page[-1])
+        return page
+
+    def get_paginated_response(self, data):
+        headers = {}
+        if self.before_cursor:
+            headers['X-Cursor-Before'] = self.before_cursor
+        if self.after_cursor:
+            headers['X-Cursor-After'] = self.after_cursor
+        return Response(data, headers=headers)
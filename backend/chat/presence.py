@@ -0,0 +1,174 @@
+"""
+Trutim Presence - contact-scoped presence fan-out
+
+Every user has a presence group, presence_<user_id>. A presence connection
+joins the groups of the user's contacts (everyone they share a room with)
+plus any users it explicitly subscribes to, and a status change is sent
+to the changing user's group only. Fan-out is therefore proportional to
+the people who can see the user, not to everyone online.
+
+Live status is kept by a registry that tracks each user's open presence
+connections (tabs), so only a user's first connect and last disconnect
+change their online state: PresenceRegistry in process memory, or
+RedisPresenceRegistry when several ASGI workers share a Redis channel
+layer (CHAT_REALTIME['PRESENCE_BACKEND']). Durable online / status /
+last_seen checkpoints go through chat.presence_writes.
+"""
+import asyncio
+from collections import defaultdict
+
+from django.conf import settings
+
+from .models import Room
+
+# Explicit subscriptions per connection, on top of contacts
+MAX_EXTRA_SUBSCRIPTIONS = 500
+
+
+def presence_group(user_id):
+    return f'presence_{user_id}'
+
+
+def contact_ids(user_id):
+    """Ids of users sharing at least one room with `user_id` (including themselves)."""
+    memberships = Room.members.through.objects
+    rooms = memberships.filter(user_id=user_id).values('room_id')
+    return set(memberships.filter(room_id__in=rooms).values_list('user_id', flat=True).distinct()) | {user_id}
+
+
+# Most "present" status wins when a user has several tabs open
+_STATUS_RANK = {'active': 2, 'idle': 1, 'deactive': 0}
+
+
+def effective_status(statuses):
+    """Status across a user's tabs, or None when they have none (offline)."""
+    if not statuses:
+        return None
+    return max(statuses, key=lambda s: _STATUS_RANK.get(s, 0))
+
+
+class PresenceRegistry:
+    """
+    Process-level presence: the status of every open presence connection,
+    grouped by user. A user with no connections is offline. Only correct
+    with a single ASGI process; see RedisPresenceRegistry otherwise.
+
+    connect / update / disconnect return the user's (before, after)
+    effective status.
+    """
+
+    def __init__(self):
+        self._connections = defaultdict(dict)  # user_id -> {channel_name: status}
+
+    async def connect(self, user_id, channel_name, status='active'):
+        before = self.status(user_id)
+        self._connections[user_id][channel_name] = status
+        return before, self.status(user_id)
+
+    async def update(self, user_id, channel_name, status):
+        before = self.status(user_id)
+        connections = self._connections.get(user_id)
+        if connections is not None and channel_name in connections:
+            connections[channel_name] = status
+        return before, self.status(user_id)
+
+    async def disconnect(self, user_id, channel_name):
+        before = self.status(user_id)
+        connections = self._connections.get(user_id)
+        if connections is not None:
+            connections.pop(channel_name, None)
+            if not connections:
+                del self._connections[user_id]
+        return before, self.status(user_id)
+
+    def connection_count(self, user_id):
+        return len(self._connections.get(user_id, ()))
+
+    def status(self, user_id):
+        return effective_status(list(self._connections.get(user_id, {}).values()))
+
+    async def snapshot(self, user_ids):
+        """{user_id: {'status', 'online'}} for the online users among `user_ids`."""
+        snapshot = {}
+        for user_id in user_ids:
+            status = self.status(user_id)
+            if status is not None:
+                snapshot[str(user_id)] = {'status': status, 'online': True}
+        return snapshot
+
+
+class RedisPresenceRegistry:
+    """
+    Presence shared by every ASGI worker: one Redis hash per user,
+    {channel_name: status}, sharded across `urls` by user id. Each change
+    runs in a MULTI that reads the hash before and after, so first-connect /
+    last-disconnect transitions are decided once even when a user's tabs
+    are spread over several workers.
+
+    The hash expires `ttl_s` after the user's last change, which bounds how
+    long connections left behind by a killed worker keep a user online.
+    """
+
+    def __init__(self, urls, prefix='trutim:presence:', ttl_s=86400):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis
+        self.urls = list(urls)
+        self.prefix = prefix
+        self.ttl_s = ttl_s
+        self._clients = {}  # (event loop, shard) -> client
+
+    def _key(self, user_id):
+        return f'{self.prefix}{user_id}'
+
+    def _client(self, user_id):
+        shard = int(user_id) % len(self.urls)
+        key = (asyncio.get_running_loop(), shard)
+        if key not in self._clients:
+            self._clients[key] = self._redis.from_url(self.urls[shard], decode_responses=True)
+        return self._clients[key]
+
+    async def _change(self, user_id, apply):
+        key = self._key(user_id)
+        async with self._client(user_id).pipeline(transaction=True) as pipe:
+            pipe.hvals(key)
+            apply(pipe, key)
+            pipe.expire(key, self.ttl_s)
+            pipe.hvals(key)
+            results = await pipe.execute()
+        return effective_status(results[0]), effective_status(results[-1])
+
+    async def connect(self, user_id, channel_name, status='active'):
+        return await self._change(user_id, lambda pipe, key: pipe.hset(key, channel_name, status))
+
+    async def update(self, user_id, channel_name, status):
+        # Only called for a connection that has connected, so HSET is safe
+        return await self._change(user_id, lambda pipe, key: pipe.hset(key, channel_name, status))
+
+    async def disconnect(self, user_id, channel_name):
+        return await self._change(user_id, lambda pipe, key: pipe.hdel(key, channel_name))
+
+    async def snapshot(self, user_ids):
+        by_shard = defaultdict(list)
+        for user_id in user_ids:
+            by_shard[int(user_id) % len(self.urls)].append(user_id)
+        snapshot = {}
+        for ids in by_shard.values():
+            async with self._client(ids[0]).pipeline(transaction=False) as pipe:
+                for user_id in ids:
+                    pipe.hvals(self._key(user_id))
+                results = await pipe.execute()
+            for user_id, statuses in zip(ids, results):
+                status = effective_status(statuses)
+                if status is not None:
+                    snapshot[str(user_id)] = {'status': status, 'online': True}
+        return snapshot
+
+
+def make_registry():
+    if settings.CHAT_REALTIME['PRESENCE_BACKEND'] == 'redis':
+        return RedisPresenceRegistry(settings.REDIS_URLS)
+    return PresenceRegistry()
+
+
+registry = make_registry()
@@ -0,0 +1,102 @@
+"""
+Trutim Presence Writes - coalesced write-behind for User.online, status
+and last_seen
+
+Presence changes are recorded in memory (latest change per user wins) and
+flushed periodically with one bulk_update, i.e. one UPDATE ... CASE per
+batch, instead of one UPDATE per connect, disconnect or status change.
+At most one flush interval of changes is lost if the process dies; a
+clean shutdown flushes what is pending.
+"""
+import math
+import atexit
+import asyncio
+import logging
+import threading
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+class PresenceWriteBuffer:
+
+    def __init__(self, interval_s, max_pending, batch_size=500):
+        self.interval_s = interval_s
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._pending = {}  # user_id -> (online, status, last_seen)
+        self._lock = threading.Lock()
+        self._timer = None
+        self._flushing = None
+        self.rows_written = 0
+        self.statements = 0
+
+    def record(self, user_id, online, status):
+        """Queue a presence change; call from the event loop."""
+        with self._lock:
+            self._pending[user_id] = (online, status, timezone.now())
+            pending = len(self._pending)
+        loop = asyncio.get_running_loop()
+        if pending >= self.max_pending:
+            self._schedule(loop, 0)
+        elif self._timer is None:
+            self._schedule(loop, self.interval_s)
+
+    def _schedule(self, loop, delay):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_later(delay, self._start_flush, loop)
+
+    def _start_flush(self, loop):
+        self._timer = None
+        if self._flushing is None or self._flushing.done():
+            self._flushing = loop.create_task(self._flush_async(loop))
+
+    async def _flush_async(self, loop):
+        await database_sync_to_async(self.flush)()
+        # Changes recorded during the flush, or a failed flush, need another pass
+        if self._pending and self._timer is None:
+            self._schedule(loop, self.interval_s)
+
+    def flush(self):
+        """Write every pending change. Runs on a DB thread, or at exit."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        users = [
+            User(id=user_id, online=online, status=status, last_seen=last_seen)
+            for user_id, (online, status, last_seen) in pending.items()
+        ]
+        try:
+            User.objects.bulk_update(users, ['online', 'status', 'last_seen'], batch_size=self.batch_size)
+        except Exception:
+            logger.exception(f"Presence flush of {len(users)} users failed; will retry")
+            with self._lock:
+                # Keep anything newer that arrived while we were writing
+                self._pending = {**pending, **self._pending}
+            return 0
+        self.rows_written += len(users)
+        self.statements += math.ceil(len(users) / self.batch_size)
+        return len(users)
+
+    def flush_at_exit(self):
+        close_old_connections()
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+
+buffer = PresenceWriteBuffer(
+    settings.CHAT_REALTIME['PRESENCE_FLUSH_INTERVAL_MS'] / 1000,
+    settings.CHAT_REALTIME['PRESENCE_FLUSH_MAX_PENDING'],
+)
+atexit.register(buffer.flush_at_exit)
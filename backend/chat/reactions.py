@@ -0,0 +1,101 @@
+"""
+Trutim Reactions - atomic reaction toggles, grouped counts and coalesced
+per-room reaction broadcasts
+"""
+import asyncio
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db.models import Count, Min, Q
+
+from .models import MessageReaction
+
+
+def toggle_reaction(message, user, emoji):
+    """
+    Add or remove `user`'s `emoji` on `message` with a single DELETE, or a
+    DELETE then INSERT. Returns True if the reaction is now present.
+    """
+    deleted, _ = MessageReaction.objects.filter(message=message, user=user, emoji=emoji).delete()
+    if deleted:
+        return False
+    # A concurrent toggle may have inserted it first; either way it is present
+    MessageReaction.objects.bulk_create(
+        [MessageReaction(message=message, user=user, emoji=emoji)], ignore_conflicts=True
+    )
+    return True
+
+
+def summarize_reactions(message_ids, user=None):
+    """
+    Reaction counts for a page of messages in one grouped query.
+    Returns {message_id: {'counts': {emoji: n}, 'mine': [emoji]}}, emojis in
+    the order they were first used on each message.
+    """
+    summary = {message_id: {'counts': {}, 'mine': []} for message_id in message_ids}
+    if not summary:
+        return summary
+    annotations = {'n': Count('id'), 'first': Min('created_at')}
+    if user is not None:
+        annotations['by_me'] = Count('id', filter=Q(user_id=user.id))
+    rows = (
+        MessageReaction.objects.filter(message_id__in=list(summary))
+        .values('message_id', 'emoji')
+        .annotate(**annotations)
+        .order_by('message_id', 'first', 'emoji')
+    )
+    for row in rows:
+        entry = summary[row['message_id']]
+        entry['counts'][row['emoji']] = row['n']
+        if row.get('by_me'):
+            entry['mine'].append(row['emoji'])
+    return summary
+
+
+class ReactionBatcher:
+    """
+    Collects reaction changes per room on the server's event loop and sends
+    one `chat_reactions` event per room per window, carrying the current
+    counts of every message touched in that window.
+
+    The window timer needs a long-lived loop (Daphne / any ASGI server).
+    Callers on a throwaway loop, e.g. async_to_sync under WSGI, must pass
+    flush=True so the change is broadcast before that loop goes away.
+    """
+
+    def __init__(self, window_s):
+        self.window_s = window_s
+        self._pending = {}
+
+    async def add(self, room_id, message_id, emoji, user_id, added, flush=False):
+        change = {'message_id': message_id, 'emoji': emoji, 'user_id': user_id, 'added': added}
+        flush = flush or self.window_s <= 0
+        pending = self._pending.get(room_id)
+        if pending is None:
+            pending = self._pending[room_id] = []
+            if not flush:
+                asyncio.get_running_loop().call_later(
+                    self.window_s, lambda: asyncio.ensure_future(self.flush(room_id))
+                )
+        pending.append(change)
+        if flush:
+            await self.flush(room_id)
+
+    async def flush(self, room_id):
+        changes = self._pending.pop(room_id, None)
+        if not changes:
+            return
+        message_ids = list(dict.fromkeys(c['message_id'] for c in changes))
+        summary = await database_sync_to_async(summarize_reactions)(message_ids)
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        await channel_layer.group_send(f'chat_{room_id}', {
+            'type': 'chat_reactions',
+            'reactions': {str(message_id): summary[message_id]['counts'] for message_id in message_ids},
+            'changes': changes,
+        })
+
+
+batcher = ReactionBatcher(settings.CHAT_REALTIME['REACTION_BATCH_WINDOW_MS'] / 1000)
@@ -0,0 +1,210 @@
+"""
+Trutim Read Receipts - read high-water marks and per-page receipt summaries
+
+A user's read state in a room (or one of its channels) is a ReadMarker:
+every message up to marker.last_read_message_id counts as read. MessageRead
+rows are kept only for explicit receipts above the marker, and are dropped
+once the marker passes them, so the two never overlap.
+"""
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Count, F, OuterRef, Q, Subquery, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+
+from .models import Message, MessageRead, ReadMarker
+
+# Readers listed per message in list views (the total is always included)
+READERS_PREVIEW = 3
+
+
+def channel_key(channel_id):
+    return channel_id or 0
+
+
+def empty_summary():
+    return {'count': 0, 'user_ids': [], 'readers': []}
+
+
+# =============================================================================
+# Writes
+# =============================================================================
+
+def _advance_marker(user_id, room_id, key, message_id):
+    """Single upsert; the WHERE keeps the marker from moving backwards."""
+    table = connection.ops.quote_name(ReadMarker._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (user_id, room_id, channel_key, last_read_message_id, updated_at) '
+            f'VALUES (%s, %s, %s, %s, %s) '
+            f'ON CONFLICT (user_id, room_id, channel_key) DO UPDATE SET '
+            f'last_read_message_id = excluded.last_read_message_id, updated_at = excluded.updated_at '
+            f'WHERE {table}.last_read_message_id < excluded.last_read_message_id',
+            [user_id, room_id, key, message_id, timezone.now()],
+        )
+
+
+def mark_read(user, room_id, message_ids, explicit=False):
+    """
+    Mark messages in a room as read by `user`. Returns (marked, markers):
+    the ids that were not read before, and the markers that moved as
+    [{'channel_id', 'previous_message_id', 'last_read_message_id'}], so
+    clients can mark every message the marker newly covers as read rather
+    than just the listed ids.
+
+    By default this advances the user's marker to the newest given message
+    in each channel, one upsert per channel, and drops explicit receipts the
+    marker now covers. With explicit=True the marker is left alone and
+    receipts are stored for just these messages (e.g. a thread read out of
+    order).
+    """
+    rows = list(
+        Message.objects.filter(id__in=message_ids, room_id=room_id)
+        .exclude(sender=user)
+        .values_list('id', 'channel_id')
+    )
+    if not rows:
+        return [], []
+
+    by_key = defaultdict(list)
+    for message_id, channel_id in rows:
+        by_key[channel_key(channel_id)].append(message_id)
+    markers = dict(
+        ReadMarker.objects.filter(user=user, room_id=room_id, channel_key__in=list(by_key))
+        .values_list('channel_key', 'last_read_message_id')
+    )
+
+    marked = []
+    advanced = []
+    with transaction.atomic():
+        for key, ids in by_key.items():
+            previous = markers.get(key, 0)
+            unread = [message_id for message_id in ids if message_id > previous]
+            if not unread:
+                continue
+            if explicit:
+                already = set(MessageRead.objects.filter(user=user, message_id__in=unread).values_list('message_id', flat=True))
+                unread = [message_id for message_id in unread if message_id not in already]
+                MessageRead.objects.bulk_create(
+                    [MessageRead(user=user, message_id=message_id) for message_id in unread],
+                    ignore_conflicts=True,
+                )
+            else:
+                newest = max(unread)
+                _advance_marker(user.id, room_id, key, newest)
+                advanced.append({'channel_id': key or None, 'previous_message_id': previous, 'last_read_message_id': newest})
+                covered = MessageRead.objects.filter(user=user, message__room_id=room_id, message_id__lte=newest)
+                covered = covered.filter(message__channel_id=key) if key else covered.filter(message__channel__isnull=True)
+                explicit_ids = set(covered.values_list('message_id', flat=True))
+                covered.delete()
+                unread = [message_id for message_id in unread if message_id not in explicit_ids]
+            marked.extend(unread)
+    return sorted(marked), advanced
+
+
+# =============================================================================
+# Reads
+# =============================================================================
+
+def summarize_reads(messages, user=None, preview=READERS_PREVIEW):
+    """
+    Read receipts for a page of messages in three queries, whatever the page
+    size. Returns {message_id: {'count', 'user_ids', 'readers'}} with the
+    total reader count and up to `preview` readers. `user`'s own read state
+    is always reflected in user_ids so clients can tell what they have read.
+
+    Readers of a message are the markers in its scope at or above its id,
+    plus its explicit receipts. Markers sorted by last_read_message_id
+    descending list readers of every message as a prefix, so the top few
+    markers per scope are enough for all previews.
+    """
+    summary = {m.id: empty_summary() for m in messages}
+    if not messages:
+        return summary
+    message_ids = list(summary)
+
+    scope_markers = ReadMarker.objects.filter(
+        room_id=OuterRef('room_id'),
+        channel_key=Coalesce(OuterRef('channel_id'), Value(0), output_field=BigIntegerField()),
+        last_read_message_id__gte=OuterRef('id'),
+    ).exclude(user_id=OuterRef('sender_id'))
+    counts = Message.objects.filter(id__in=message_ids).annotate(
+        marker_reads=Coalesce(Subquery(_count(scope_markers, 'room_id')), 0),
+        explicit_reads=Coalesce(Subquery(_count(MessageRead.objects.filter(message_id=OuterRef('id')), 'message_id')), 0),
+    ).values_list('id', 'marker_reads', 'explicit_reads')
+    for message_id, marker_reads, explicit_reads in counts:
+        summary[message_id]['count'] = marker_reads + explicit_reads
+
+    scopes = Q()
+    for room_id, key in {(m.room_id, channel_key(m.channel_id)) for m in messages}:
+        scopes |= Q(room_id=room_id, channel_key=key)
+    keep = Q(position__lte=preview + 1)  # +1: the sender's own marker is skipped
+    if user is not None:
+        keep |= Q(user_id=user.id)
+    top = defaultdict(list)
+    mine = {}
+    markers = (
+        ReadMarker.objects.filter(scopes)
+        .annotate(position=Window(
+            RowNumber(),
+            partition_by=[F('room_id'), F('channel_key')],
+            order_by=[F('last_read_message_id').desc(), F('id').asc()],
+        ))
+        .filter(keep)
+        .order_by('position')
+        .values_list('room_id', 'channel_key', 'user_id', 'user__username', 'last_read_message_id', 'position')
+    )
+    for room_id, key, user_id, username, last_read, position in markers:
+        if user is not None and user_id == user.id:
+            mine[(room_id, key)] = last_read
+        if position <= preview + 1:
+            top[(room_id, key)].append((user_id, username, last_read))
+
+    explicit = defaultdict(list)
+    for message_id, user_id, username in (
+        MessageRead.objects.filter(message_id__in=message_ids)
+        .order_by('read_at', 'id')
+        .values_list('message_id', 'user_id', 'user__username')
+    ):
+        explicit[message_id].append((user_id, username))
+
+    for m in messages:
+        scope = (m.room_id, channel_key(m.channel_id))
+        readers = [(uid, name) for uid, name, last_read in top[scope] if last_read >= m.id and uid != m.sender_id]
+        readers = (readers + explicit[m.id])[:preview]
+        entry = summary[m.id]
+        entry['readers'] = [{'id': uid, 'username': name} for uid, name in readers]
+        entry['user_ids'] = [uid for uid, _ in readers]
+        if user is not None and user.id not in entry['user_ids']:
+            if mine.get(scope, 0) >= m.id or any(uid == user.id for uid, _ in explicit[m.id]):
+                entry['user_ids'].append(user.id)
+    return summary
+
+
+def _count(queryset, group_field):
+    return queryset.order_by().values(group_field).annotate(n=Count('id')).values('n')
+
+
+def summarize_message(message, preview=READERS_PREVIEW):
+    """
+    Full receipt summary for a single message: every covering marker plus
+    the explicit receipts, which come from
+    Prefetch('reads', MessageRead.objects.select_related('user')) when
+    present.
+    """
+    markers = ReadMarker.objects.filter(
+        room_id=message.room_id,
+        channel_key=channel_key(message.channel_id),
+        last_read_message_id__gte=message.id,
+    ).exclude(user_id=message.sender_id).select_related('user').order_by('updated_at', 'id')
+    if 'reads' in getattr(message, '_prefetched_objects_cache', {}):
+        reads = message.reads.all()
+    else:
+        reads = message.reads.select_related('user')
+    readers = [m.user for m in markers] + [r.user for r in sorted(reads, key=lambda r: (r.read_at, r.id))]
+    return {
+        'count': len(readers),
+        'user_ids': [u.id for u in readers],
+        'readers': [{'id': u.id, 'username': u.username} for u in readers[:preview]],
+    }
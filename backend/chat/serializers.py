@@ -4,6 +4,8 @@ Trutim API Serializers
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Room, Message, MessageRead, CallSession, Channel
+from .receipts import empty_summary, summarize_message
+from .reactions import summarize_reactions
 
 User = get_user_model()
 
@@ -99,6 +101,12 @@ class RoomCreateSerializer(serializers.ModelSerializer):
 
 
 class RoomSerializer(serializers.ModelSerializer):
+    """
+    Reads member_count and dm_user from the annotations added by
+    RoomViewSet.get_queryset when present, falling back to per-room queries
+    for rooms loaded elsewhere. last_message comes from the denormalized
+    Room.last_message column.
+    """
     member_count = serializers.SerializerMethodField()
     last_message = serializers.SerializerMethodField()
     dm_user = serializers.SerializerMethodField()
@@ -106,8 +114,9 @@ class RoomSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Room
-        fields = ['id', 'name', 'description', 'avatar', 'created_by', 'created_at', 'is_direct', 'is_group', 'member_count', 'last_message', 'dm_user']
-        read_only_fields = ['created_by', 'created_at']
+        fields = ['id', 'name', 'description', 'avatar', 'created_by', 'created_at', 'is_direct', 'is_group', 'member_count', 'last_message', 'dm_user',
+                  'last_activity_at', 'message_count']
+        read_only_fields = ['created_by', 'created_at', 'last_activity_at', 'message_count']
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -116,12 +125,18 @@ class RoomSerializer(serializers.ModelSerializer):
         return data
 
     def get_member_count(self, obj):
+        if hasattr(obj, 'num_members'):
+            return obj.num_members
         return obj.members.count()
 
     def get_dm_user(self, obj):
         """For DM rooms, return the other user (not the current user)."""
         if not obj.is_direct:
             return None
+        if hasattr(obj, 'dm_user_id'):
+            if obj.dm_user_id is None:
+                return None
+            return {'id': obj.dm_user_id, 'username': obj.dm_username}
         request = self.context.get('request')
         if not request or not request.user:
             return None
@@ -131,7 +146,7 @@ class RoomSerializer(serializers.ModelSerializer):
         return None
 
     def get_last_message(self, obj):
-        last = obj.messages.order_by('-created_at').first()
+        last = obj.last_message
         if last:
             return {'content': last.content[:50], 'sender': last.sender.username, 'created_at': last.created_at}
         return None
@@ -160,17 +175,61 @@ class RoomDetailSerializer(RoomSerializer):
 
 
 class MessageSerializer(serializers.ModelSerializer):
+    """
+    Read receipts come from context['read_summary'] (list views, see
+    chat.receipts.summarize_reads), where read_by holds the first few
+    readers plus the requesting user. Otherwise read_by lists every reader.
+    """
     sender = UserMinimalSerializer(read_only=True)
     read_by = serializers.SerializerMethodField()
+    read_count = serializers.SerializerMethodField()
+    readers = serializers.SerializerMethodField()
+    reactions = serializers.SerializerMethodField()
+    my_reactions = serializers.SerializerMethodField()
     channel = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
         model = Message
-        fields = ['id', 'room', 'channel', 'sender', 'parent', 'content', 'created_at', 'edited_at', 'reactions', 'read_by']
+        fields = ['id', 'room', 'channel', 'sender', 'parent', 'content', 'created_at', 'edited_at', 'reactions',
+                  'my_reactions', 'read_by', 'read_count', 'readers']
+
+    def _reaction_summary(self, obj):
+        page_summary = self.context.get('reaction_summary')
+        if page_summary is not None:
+            return page_summary.get(obj.id) or {'counts': {}, 'mine': []}
+        cache = self.context.setdefault('_message_reaction_summary', {})
+        if obj.id not in cache:
+            request = self.context.get('request')
+            cache.update(summarize_reactions([obj.id], request.user if request else None))
+        return cache[obj.id]
+
+    def get_reactions(self, obj):
+        """Reaction counts: {emoji: count}."""
+        return self._reaction_summary(obj)['counts']
+
+    def get_my_reactions(self, obj):
+        """Emojis the requesting user has reacted with."""
+        return self._reaction_summary(obj)['mine']
+
+    def _read_summary(self, obj):
+        page_summary = self.context.get('read_summary')
+        if page_summary is not None:
+            return page_summary.get(obj.id) or empty_summary()
+        cache = self.context.setdefault('_message_read_summary', {})
+        if obj.id not in cache:
+            cache[obj.id] = summarize_message(obj)
+        return cache[obj.id]
 
     def get_read_by(self, obj):
         """List of user IDs who have read this message."""
-        return list(obj.reads.values_list('user_id', flat=True))
+        return self._read_summary(obj)['user_ids']
+
+    def get_read_count(self, obj):
+        return self._read_summary(obj)['count']
+
+    def get_readers(self, obj):
+        """First few readers with usernames, in read order."""
+        return self._read_summary(obj)['readers']
 
 
 class CallSessionSerializer(serializers.ModelSerializer):
@@ -0,0 +1,117 @@
+"""
+Trutim Typing Indicators - per-(user, room) typing state with coalesced
+per-room broadcasts
+
+Clients may send a typing frame on every keystroke. Only state changes are
+broadcast: the first "typing" from a user goes out on the leading edge,
+repeats while they are already typing only extend their expiry, and a user
+who stops sending is expired to "not typing" automatically. All changes in
+a room within one window go out as a single chat_typing event.
+"""
+import asyncio
+from collections import defaultdict
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+
+class TypingCoalescer:
+    """Lives on the server's event loop; one per process."""
+
+    def __init__(self, window_s, expire_s, channel_layer=None):
+        self.window_s = window_s
+        self.expire_s = expire_s
+        self._channel_layer = channel_layer
+        self._typing = defaultdict(dict)    # room -> {user_id: expires_at}
+        self._users = defaultdict(dict)     # room -> {user_id: user payload}
+        self._changes = defaultdict(dict)   # room -> {user_id: typing}, not yet sent
+        self._last_flush = {}               # room -> loop time of last broadcast
+        self._timers = {}                   # room -> (wake time, TimerHandle)
+        self.events_sent = 0
+
+    @property
+    def channel_layer(self):
+        return self._channel_layer or get_channel_layer()
+
+    def update(self, room_id, user, typing):
+        """Record a typing frame from `user` (a {'id', 'username', ...} dict)."""
+        now = asyncio.get_running_loop().time()
+        user_id = user['id']
+        if typing:
+            room = self._typing[room_id]
+            already = user_id in room
+            room[user_id] = now + self.expire_s
+            self._users[room_id][user_id] = user
+            if already:
+                self._arm(room_id)  # suppressed repeat: only the expiry moves
+                return
+            self._changes[room_id][user_id] = True
+        else:
+            # .get: a stop from someone not typing must not create room state
+            room = self._typing.get(room_id)
+            if room is None or room.pop(user_id, None) is None:
+                return
+            self._changes[room_id][user_id] = False
+        self._arm(room_id)
+
+    def _arm(self, room_id):
+        """Schedule the next wake-up: a pending flush or the earliest expiry."""
+        loop = asyncio.get_running_loop()
+        due = []
+        if self._changes.get(room_id):
+            due.append(self._last_flush.get(room_id, float('-inf')) + self.window_s)
+        if self._typing.get(room_id):
+            due.append(min(self._typing[room_id].values()))
+        if not due:
+            return
+        wake = max(min(due), loop.time())
+        scheduled = self._timers.get(room_id)
+        if scheduled is not None:
+            if scheduled[0] <= wake:
+                return
+            scheduled[1].cancel()
+        self._timers[room_id] = (wake, loop.call_at(wake, self._wake, room_id))
+
+    def _wake(self, room_id):
+        self._timers.pop(room_id, None)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        room = self._typing.get(room_id, {})
+        for user_id, expires_at in list(room.items()):
+            if expires_at <= now:
+                del room[user_id]
+                self._changes[room_id][user_id] = False
+
+        changes = self._changes.get(room_id)
+        next_flush = self._last_flush.get(room_id, float('-inf')) + self.window_s
+        if changes and now >= next_flush:
+            self._last_flush[room_id] = next_flush = now + self.window_s
+            self._changes[room_id] = {}
+            users = self._users[room_id]
+            payload = [{'user': users[user_id], 'typing': typing} for user_id, typing in changes.items()]
+            for user_id in changes:
+                if user_id not in room:
+                    del users[user_id]
+            loop.create_task(self._send(room_id, payload))
+
+        if room or self._changes.get(room_id):
+            self._arm(room_id)
+        elif now < next_flush:
+            # Idle, but keep the throttle until the window closes, then come back to drop it
+            self._timers[room_id] = (next_flush, loop.call_at(next_flush, self._wake, room_id))
+        else:
+            # Idle room: drop its state
+            self._typing.pop(room_id, None)
+            self._changes.pop(room_id, None)
+            self._users.pop(room_id, None)
+            self._last_flush.pop(room_id, None)
+
+    async def _send(self, room_id, changes):
+        self.events_sent += 1
+        await self.channel_layer.group_send(f'chat_{room_id}', {'type': 'chat_typing', 'changes': changes})
+
+
+coalescer = TypingCoalescer(
+    settings.CHAT_REALTIME['TYPING_BATCH_MS'] / 1000,
+    settings.CHAT_REALTIME['TYPING_EXPIRE_MS'] / 1000,
+)
@@ -15,6 +15,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import get_object_or_404
 from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db import transaction
+from django.db.models.functions import Coalesce
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -23,6 +27,10 @@ from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from .models import Room, Message, MessageRead, CallSession, Channel
 from .serializers import UserSerializer, RoomSerializer, RoomDetailSerializer, RoomCreateSerializer, MessageSerializer, CallSessionSerializer
+from .pagination import MessageKeysetPagination
+from .activity import record_message, record_deletion
+from .receipts import mark_read, summarize_reads
+from .reactions import batcher as reaction_batcher, summarize_reactions, toggle_reaction
 
 User = get_user_model()
 
@@ -327,6 +335,22 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response({'regions': data, 'total': sum(buckets.values())})
 
 
+def _annotate_rooms(queryset, user):
+    """
+    Annotate what RoomSerializer needs (member count, DM peer) as correlated
+    subqueries and join the creator and the denormalized last message, so a
+    room list is one query however many rooms the user is in.
+    """
+    memberships = Room.members.through.objects.filter(room_id=OuterRef('pk'))
+    member_count = memberships.order_by().values('room_id').annotate(n=Count('id')).values('n')
+    dm_peer = memberships.exclude(user_id=user.id).order_by('user_id')
+    return queryset.select_related('created_by', 'last_message__sender').annotate(
+        num_members=Coalesce(Subquery(member_count), 0),
+        dm_user_id=Subquery(dm_peer.values('user_id')[:1]),
+        dm_username=Subquery(dm_peer.values('user__username')[:1]),
+    )
+
+
 class RoomViewSet(viewsets.ModelViewSet):
     serializer_class = RoomSerializer
 
@@ -340,7 +364,14 @@ class RoomViewSet(viewsets.ModelViewSet):
         return RoomSerializer
 
     def get_queryset(self):
-        return Room.objects.filter(members=self.request.user).distinct()
+        # Membership rows are unique per (room, user), so no distinct() needed
+        rooms = Room.objects.filter(members=self.request.user)
+        if self.action in ('list', 'retrieve', 'dm'):
+            rooms = _annotate_rooms(rooms, self.request.user)
+        if self.action == 'list':
+            # Inbox order, served by the (last_activity_at, id) index
+            rooms = rooms.order_by('-last_activity_at', '-id')
+        return rooms
 
     def perform_create(self, serializer):
         room = serializer.save(created_by=self.request.user)
@@ -394,7 +425,8 @@ class RoomViewSet(viewsets.ModelViewSet):
                 created_by=request.user
             )
             room.members.add(request.user, other)
-        return Response(RoomSerializer(room).data)
+        room = self.get_queryset().get(pk=room.pk)
+        return Response(RoomSerializer(room, context={'request': request}).data)
 
     @action(detail=True, methods=['post'])
     def join(self, request, pk=None):
@@ -500,6 +532,8 @@ class RoomViewSet(viewsets.ModelViewSet):
 
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
+    # List responses are paged newest-first with ?before / ?after cursors
+    pagination_class = MessageKeysetPagination
 
     def get_queryset(self):
         """
@@ -507,13 +541,17 @@ class MessageViewSet(viewsets.ModelViewSet):
         For detail / actions (e.g. react), allow lookup by pk as long as the
         current user is a member of the room.
         """
-        base_qs = Message.objects.filter(room__members=self.request.user)
+        base_qs = Message.objects.filter(room__members=self.request.user).select_related('sender')
         room_id = self.request.query_params.get('room')
         channel_id = self.request.query_params.get('channel')
         if room_id:
             base_qs = base_qs.filter(room_id=room_id)
         if channel_id:
             base_qs = base_qs.filter(channel_id=channel_id)
+        elif room_id and self.action == 'list' and Room.objects.filter(id=room_id, is_direct=True).exists():
+            # DMs have no channels; pinning channel to NULL lets history pages
+            # use the (room, channel, created_at) index for ordering.
+            base_qs = base_qs.filter(channel__isnull=True)
         return base_qs
 
     def get_object(self):
@@ -525,14 +563,33 @@ class MessageViewSet(viewsets.ModelViewSet):
         individual message.
         """
         lookup_value = self.kwargs.get(self.lookup_field or 'pk')
+        messages = Message.objects.select_related('sender').prefetch_related(
+            Prefetch('reads', queryset=MessageRead.objects.select_related('user'))
+        )
         return get_object_or_404(
-            Message,
+            messages,
             pk=lookup_value,
             room__members=self.request.user,
         )
 
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        # One grouped query for the whole page's read receipts
+        context['read_summary'] = summarize_reads(page, request.user)
+        context['reaction_summary'] = summarize_reactions([m.id for m in page], request.user)
+        serializer = self.get_serializer_class()(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
     def perform_create(self, serializer):
-        serializer.save(sender=self.request.user)
+        with transaction.atomic():
+            message = serializer.save(sender=self.request.user)
+            record_message(message)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            _, deleted = instance.delete()
+            record_deletion(instance.room_id, deleted)
 
     @action(detail=False, methods=['post'], url_path='upload')
     def upload(self, request):
@@ -551,33 +608,20 @@ class MessageViewSet(viewsets.ModelViewSet):
     def react(self, request, pk=None):
         msg = self.get_object()
         emoji = request.data.get('emoji')
-        if not emoji:
+        if not emoji or not isinstance(emoji, str):
             return Response({'error': 'Emoji required'}, status=status.HTTP_400_BAD_REQUEST)
-        reactions = msg.reactions or {}
-        user_id = str(request.user.id)
-        if emoji not in reactions:
-            reactions[emoji] = []
-        if user_id in reactions[emoji]:
-            reactions[emoji].remove(user_id)
-        else:
-            reactions[emoji].append(user_id)
-        if not reactions[emoji]:
-            del reactions[emoji]
-        msg.reactions = reactions
-        msg.save()
+        if len(emoji) > 64:
+            return Response({'error': 'Emoji too long'}, status=status.HTTP_400_BAD_REQUEST)
+        added = toggle_reaction(msg, request.user, emoji)
         serialized = MessageSerializer(msg, context={'request': request}).data
 
-        # Broadcast reaction updates to all WebSocket clients in this room.
+        # Other clients get the change in the room's next batched reactions frame.
+        # Outside ASGI, async_to_sync runs on a throwaway loop, so broadcast now.
+        under_asgi = isinstance(request._request, ASGIRequest)
         try:
-            channel_layer = get_channel_layer()
-            if channel_layer is not None:
-                async_to_sync(channel_layer.group_send)(
-                    f'chat_{msg.room_id}',
-                    {
-                        'type': 'chat_message_reacted',
-                        'message': serialized,
-                    },
-                )
+            async_to_sync(reaction_batcher.add)(
+                msg.room_id, msg.id, emoji, request.user.id, added, flush=not under_asgi
+            )
         except Exception:
             # WebSocket broadcast failures should not break the HTTP request.
             pass
@@ -586,7 +630,15 @@ class MessageViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'], url_path='mark-read')
     def mark_read(self, request):
-        """Mark messages as read by the current user. Body: { message_ids: [1, 2, 3] }"""
+        """
+        Mark messages as read by the current user.
+        Body: { room_id: 1, message_ids: [1, 2, 3], explicit: false }
+
+        Advances the user's read marker to the newest message given; with
+        "explicit": true, stores receipts for exactly these messages instead.
+        The room hears about it in the same message_read frame the WebSocket
+        sends, markers included.
+        """
         message_ids = request.data.get('message_ids', [])
         if not message_ids:
             return Response({'marked': []})
@@ -595,11 +647,17 @@ class MessageViewSet(viewsets.ModelViewSet):
             return Response({'error': 'room_id required'}, status=status.HTTP_400_BAD_REQUEST)
         if not Room.objects.filter(id=room_id, members=request.user).exists():
             return Response({'error': 'Not a member of this room'}, status=status.HTTP_403_FORBIDDEN)
-        created = []
-        for msg in Message.objects.filter(id__in=message_ids, room_id=room_id).exclude(sender=request.user):
-            _, created_flag = MessageRead.objects.get_or_create(
-                message=msg, user=request.user, defaults={}
-            )
-            if created_flag:
-                created.append(msg.id)
-        return Response({'marked': created})
+        marked, markers = mark_read(request.user, room_id, message_ids, explicit=bool(request.data.get('explicit')))
+        if marked or markers:
+            try:
+                channel_layer = get_channel_layer()
+                if channel_layer is not None:
+                    async_to_sync(channel_layer.group_send)(f'chat_{room_id}', {
+                        'type': 'message_read', 'message_ids': marked, 'markers': markers,
+                        'user': {'id': request.user.id, 'username': request.user.username,
+                                 'title': request.user.title or ''},
+                    })
+            except Exception:
+                # WebSocket broadcast failures should not break the HTTP request.
+                pass
+        return Response({'marked': marked, 'markers': markers})
@@ -5,6 +5,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'dev-secret-key-change-in-production-trutim-2024')
@@ -131,22 +133,72 @@ else:
         'http://127.0.0.1:3000',
     ]
 CORS_ALLOW_CREDENTIALS = True
+# Message history page cursors (see chat.pagination)
+CORS_EXPOSE_HEADERS = ['X-Cursor-Before', 'X-Cursor-After']
+
+# Channels - InMemory for a single dev process; Redis for several workers.
+# CHANNEL_LAYER=redis (or redis-pubsub) with REDIS_URL as one URL or a
+# comma-separated list: channels and group membership are sharded across
+# the listed servers by consistent hashing, so every worker must be given
+# the same list in the same order.
+CHANNEL_LAYER = os.environ.get('CHANNEL_LAYER', 'memory')
+REDIS_URLS = [
+    url.strip() for url in os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0').split(',') if url.strip()
+]
 
-# Channels - Redis for production, InMemory for dev
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer'
+if CHANNEL_LAYER == 'memory':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer'
+        }
+    }
+elif CHANNEL_LAYER == 'redis':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': REDIS_URLS,
+                'prefix': os.environ.get('CHANNEL_LAYER_PREFIX', 'trutim'),
+                'capacity': int(os.environ.get('CHANNEL_LAYER_CAPACITY', '1500')),
+                'expiry': 60,
+                'group_expiry': 86400,
+            },
+        }
+    }
+elif CHANNEL_LAYER == 'redis-pubsub':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.pubsub.RedisPubSubChannelLayer',
+            'CONFIG': {
+                'hosts': REDIS_URLS,
+                'prefix': os.environ.get('CHANNEL_LAYER_PREFIX', 'trutim'),
+            },
+        }
     }
+else:
+    raise ImproperlyConfigured(f"CHANNEL_LAYER must be memory, redis or redis-pubsub, not {CHANNEL_LAYER!r}")
+
+# Realtime chat tuning (chat/consumers.py and friends)
+CHAT_REALTIME = {
+    # Reaction changes per room are coalesced into one broadcast per window
+    'REACTION_BATCH_WINDOW_MS': int(os.environ.get('REACTION_BATCH_WINDOW_MS', '100')),
+    # Typing state changes per room are broadcast at most once per window;
+    # a user who stops sending typing frames is cleared after the expiry
+    'TYPING_BATCH_MS': int(os.environ.get('TYPING_BATCH_MS', '300')),
+    'TYPING_EXPIRE_MS': int(os.environ.get('TYPING_EXPIRE_MS', '6000')),
+    # Presence / last_seen writes are buffered and flushed as one bulk UPDATE
+    # per interval (or sooner once this many users are pending)
+    'PRESENCE_FLUSH_INTERVAL_MS': int(os.environ.get('PRESENCE_FLUSH_INTERVAL_MS', '2000')),
+    'PRESENCE_FLUSH_MAX_PENDING': int(os.environ.get('PRESENCE_FLUSH_MAX_PENDING', '1000')),
+    # Where live presence (open tabs per user) is tracked: 'memory' is per
+    # process, 'redis' is shared by every worker (uses REDIS_URLS)
+    'PRESENCE_BACKEND': os.environ.get('PRESENCE_BACKEND', 'memory' if CHANNEL_LAYER == 'memory' else 'redis'),
+    # Clients connecting with ?batch=1 get events as JSON arrays, flushed
+    # after this many ms or once this many events are queued (chat.outbound)
+    'OUTBOUND_BATCH_MS': int(os.environ.get('OUTBOUND_BATCH_MS', '10')),
+    'OUTBOUND_BATCH_MAX_EVENTS': int(os.environ.get('OUTBOUND_BATCH_MAX_EVENTS', '50')),
 }
 
-# For production with Redis, use:
-# CHANNEL_LAYERS = {
-#     'default': {
-#         'BACKEND': 'channels_redis.core.RedisChannelLayer',
-#         'CONFIG': {'hosts': [('127.0.0.1', 6379)]},
-#     }
-# }
-
 # Voice Control & Keyword Spotting
 VOICE_CONTROL = {
     'WAKE_WORD': 'trutim',
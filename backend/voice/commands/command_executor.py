@@ -453,9 +453,12 @@ class CommandExecutor:
 
     @database_sync_to_async
     def _send_chat_message(self, room_id, user, content):
+        from django.db import transaction
         from chat.models import Message, Room
+        from chat.activity import record_message
         room = Room.objects.get(id=room_id)
-        Message.objects.create(room=room, sender=user, content=content)
+        with transaction.atomic():
+            record_message(Message.objects.create(room=room, sender=user, content=content))
 
     @database_sync_to_async
     def _join_room_db(self, user, room_id):
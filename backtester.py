@@ -16,9 +16,15 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 import logging
 import json
+import os
+import pickle
+import struct
+import zipfile
 
 import config
 from strategy import TradingStrategy
+from result_cache import ResultCache, atomic_write
+from candle_store import CandleStore, is_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +32,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Trading window: 08:00 to 24:00 UTC
+TRADING_START_MINUTE = 480
+TRADING_END_MINUTE = 1440
+TRADING_MINUTES_PER_DAY = TRADING_END_MINUTE - TRADING_START_MINUTE
+
+# Eligibility: absolute change vs the close 1440 candles earlier
+QUALIFY_CHANGE_PCT = 20.0
+LOOKBACK_24H = 1440
+
+# Bump when the checkpoint layout changes
+CHECKPOINT_VERSION = 2
+
+# Zip local file header: signature .. extra field length (30 bytes)
+_ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+# One equity sample per simulated minute
+EQUITY_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[s]'),
+    ('equity', np.float64),
+    ('balance', np.float64),
+])
+
 
 @dataclass
 class Trade:
@@ -95,6 +123,7 @@ class BacktestResult:
     sharpe_ratio: float
     daily_results: List[DailyResult] = field(default_factory=list)
     all_trades: List[Trade] = field(default_factory=list)
+    equity_curve: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=EQUITY_DTYPE))
 
 
 class Backtester:
@@ -102,8 +131,12 @@ class Backtester:
     Backtesting engine that simulates the challenge environment.
     """
     
-    def __init__(self, data_path: str = 'december_2025_dataset.npz'):
+    def __init__(self, data_path: str = 'december_2025_dataset.npz',
+                 checkpoint_path: Optional[str] = None,
+                 checkpoint_every: int = config.CHECKPOINT_EVERY_MINUTES):
         self.data_path = data_path
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
         self.data: Dict[str, np.ndarray] = {}
         self.strategy = TradingStrategy()
         
@@ -112,18 +145,48 @@ class Backtester:
         self.position: Optional[Position] = None
         self.trades: List[Trade] = []
         self.daily_results: List[DailyResult] = []
-        self.equity_curve: List[float] = []
+        self.equity_curve: np.ndarray = np.empty(0, dtype=EQUITY_DTYPE)
+        self.equity_len = 0
+        
+        # Checkpoint bookkeeping
+        self.minutes_simulated = 0
+        self._last_checkpoint_at = 0
+        self._run_range: Optional[Tuple[str, str]] = None
+        # Dataset + effective config + source hash (ResultCache.base_key)
+        self._inputs_key: Optional[str] = None
+        
+    def load_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """
+        Load the historical dataset.
         
-    def load_data(self):
-        """Load the historical dataset"""
+        With a date range, loading is two-phase: close prices are scanned first
+        and full OHLCV is only loaded for tickers that qualify at some minute
+        in the range. The rest stay on disk.
+        
+        `data_path` may also be a candle store directory (see ingest.py), whose
+        columns stay memory-mapped instead of being read into memory.
+        """
         logger.info(f"Loading data from {self.data_path}...")
-        npz_data = np.load(self.data_path, allow_pickle=True)
+        if is_store(self.data_path):
+            npz_data = CandleStore(self.data_path)
+        else:
+            npz_data = np.load(self.data_path, allow_pickle=True)
+        self.data = {}
+        
+        tickers = list(npz_data.keys())
+        if start_date and end_date:
+            total = len(tickers)
+            tickers = self.scan_qualifying_tickers(npz_data, start_date, end_date)
+            logger.info(f"{len(tickers)}/{total} tickers qualify between {start_date} and {end_date}")
         
-        for key in npz_data.keys():
+        for key in tickers:
             self.data[key] = npz_data[key]
         
         logger.info(f"Loaded {len(self.data)} tickers")
         
+        if not self.data:
+            return
+        
         # Get date range
         sample_ticker = list(self.data.keys())[0]
         sample_data = self.data[sample_ticker]
@@ -132,6 +195,84 @@ class Backtester:
         
         logger.info(f"Date range: {first_ts} to {last_ts}")
     
+    def _memmap_npz_member(self, archive: zipfile.ZipFile, name: str) -> Optional[np.ndarray]:
+        """
+        Memory-map an uncompressed array inside the npz without reading it.
+        Returns None for compressed or pickled members.
+        """
+        info = archive.getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+        
+        with archive.open(info) as member:
+            version = np.lib.format.read_magic(member)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(member)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(member)
+            array_offset = member.tell()
+        
+        if dtype.hasobject:
+            return None
+        
+        # Data starts after the local file header, name and extra field
+        with open(self.data_path, 'rb') as f:
+            f.seek(info.header_offset)
+            fields = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+        name_len, extra_len = fields[-2], fields[-1]
+        offset = info.header_offset + _ZIP_LOCAL_HEADER.size + name_len + extra_len + array_offset
+        
+        return np.memmap(self.data_path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                         order='F' if fortran_order else 'C')
+    
+    @staticmethod
+    def ever_qualifies(ticker_data: np.ndarray, window_start: np.datetime64,
+                       window_end: np.datetime64) -> bool:
+        """True if the ticker passes the 24h-change filter at any trading minute in the window"""
+        timestamps = ticker_data['timestamp']
+        in_window = (timestamps >= window_start) & (timestamps <= window_end)
+        
+        # Only minutes inside the daily trading window are ever evaluated
+        minute_of_day = (timestamps - timestamps.astype('datetime64[D]')).astype('timedelta64[m]').astype(np.int64)
+        in_window &= minute_of_day >= TRADING_START_MINUTE
+        
+        idx = np.flatnonzero(in_window)
+        idx = idx[idx >= LOOKBACK_24H]
+        if idx.size == 0:
+            return False
+        
+        closes = ticker_data['close']
+        current = closes[idx].astype(np.float64)
+        past = closes[idx - LOOKBACK_24H].astype(np.float64)
+        
+        valid = past != 0
+        change = (current[valid] - past[valid]) / past[valid] * 100
+        return bool(np.any(np.abs(change) >= QUALIFY_CHANGE_PCT))
+    
+    def scan_qualifying_tickers(self, npz_data, start_date: str, end_date: str) -> List[str]:
+        """Phase one of load_data: find tickers that qualify at any minute in the range"""
+        window_start = np.datetime64(f'{start_date}T08:00:00')
+        window_end = np.datetime64(f'{end_date}T23:59:00')
+        
+        if isinstance(npz_data, CandleStore):
+            # Columnar store: only timestamp and close pages are ever touched
+            return [key for key in npz_data.keys()
+                    if self.ever_qualifies(npz_data[key], window_start, window_end)]
+        
+        qualifying = []
+        with zipfile.ZipFile(self.data_path) as archive:
+            for key in npz_data.keys():
+                ticker_data = self._memmap_npz_member(archive, f'{key}.npy')
+                if ticker_data is None:
+                    # Compressed member - read it, but keep only one ticker in memory at a time
+                    ticker_data = npz_data[key]
+                
+                if self.ever_qualifies(ticker_data, window_start, window_end):
+                    qualifying.append(key)
+                del ticker_data
+        
+        return qualifying
+    
     def get_candle_at_time(self, ticker: str, timestamp: np.datetime64) -> Optional[Dict]:
         """Get candle data for a specific timestamp"""
         if ticker not in self.data:
@@ -197,14 +338,14 @@ class Backtester:
             return None
         
         current_idx = np.where(current_mask)[0][0]
-        current_close = float(ticker_data[current_idx]['close'])
+        current_close = float(ticker_data['close'][current_idx])
         
         # Find price 24h ago (1440 minutes)
-        past_idx = current_idx - 1440
+        past_idx = current_idx - LOOKBACK_24H
         if past_idx < 0:
             return None
         
-        past_close = float(ticker_data[past_idx]['close'])
+        past_close = float(ticker_data['close'][past_idx])
         
         if past_close == 0:
             return None
@@ -218,7 +359,7 @@ class Backtester:
         
         for ticker in self.data.keys():
             change = self.calculate_24h_change(ticker, timestamp)
-            if change is not None and abs(change) >= 20.0:
+            if change is not None and abs(change) >= QUALIFY_CHANGE_PCT:
                 qualifying.append((ticker, change))
         
         # Sort by absolute change (most volatile first)
@@ -281,6 +422,24 @@ class Backtester:
         
         return trade
     
+    def record_equity(self, timestamp: np.datetime64, equity: float):
+        """Append one sample to the preallocated equity curve"""
+        if self.equity_len >= len(self.equity_curve):
+            # Only reachable if the curve was sized for a shorter range
+            self.equity_curve = np.resize(self.equity_curve, max(1, 2 * len(self.equity_curve)))
+        
+        self.equity_curve[self.equity_len] = (timestamp, equity, self.balance)
+        self.equity_len += 1
+    
+    def extend_equity(self, samples: np.ndarray):
+        """Append a block of previously recorded equity samples"""
+        end = self.equity_len + len(samples)
+        if end > len(self.equity_curve):
+            self.equity_curve = np.resize(self.equity_curve, max(end, 2 * len(self.equity_curve)))
+        
+        self.equity_curve[self.equity_len:end] = samples
+        self.equity_len = end
+    
     def build_tick_data(self, timestamp: np.datetime64, day: int, minute_of_day: int,
                         qualifying_tickers: List[Tuple[str, float]]) -> Dict:
         """Build tick data structure matching the challenge format"""
@@ -361,148 +520,340 @@ class Backtester:
         }
     
     def run(self, start_date: str = '2025-12-01', end_date: str = '2025-12-31',
-            verbose: bool = True) -> BacktestResult:
+            verbose: bool = True, use_cache: bool = True, resume: bool = False) -> BacktestResult:
         """
         Run the backtest over the specified date range.
+        
+        With `use_cache`, a run with identical inputs (dataset, config, source,
+        date range) is returned from the on-disk result cache, and individual
+        days are reused whenever their starting state matches a cached day.
+        
+        With `resume`, the run continues from the latest checkpoint for the
+        same dataset, date range, source and effective config, if one exists.
         """
-        self.load_data()
+        checkpoint = self.load_checkpoint(start_date, end_date) if resume else None
+        
+        cache = ResultCache() if use_cache else None
+        run_key = None
+        if cache:
+            run_key = cache.run_key(self.data_path, start_date, end_date)
+            cached = cache.get_run(run_key) if checkpoint is None else None
+            if cached is not None:
+                logger.info(f"Result cache hit for {start_date} to {end_date}")
+                self._restore_result(cached)
+                return cached
+        
+        # Parse dates
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        num_days = max((end - start).days + 1, 0)
         
         # Reset state
         self.balance = config.INITIAL_BALANCE
         self.position = None
         self.trades = []
         self.daily_results = []
-        self.equity_curve = [self.balance]
+        self.minutes_simulated = 0
+        self._last_checkpoint_at = 0
+        self._run_range = (start_date, end_date)
+        
+        # Preallocate one equity sample per trading minute, plus the initial balance
+        self.equity_curve = np.zeros(num_days * TRADING_MINUTES_PER_DAY + 1, dtype=EQUITY_DTYPE)
+        self.equity_len = 0
         
         # Reset strategy
         self.strategy.reset()
         
         initial_balance = self.balance
-        peak_equity = initial_balance
-        max_drawdown = 0.0
-        
-        # Parse dates
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
         
         day_num = 1
         current_date = start
         
+        if checkpoint is None:
+            self.record_equity(np.datetime64(f'{start_date}T08:00:00'), self.balance)
+        else:
+            self._restore_checkpoint(checkpoint)
+            day_num = checkpoint['day_num']
+            current_date = datetime.strptime(checkpoint['date'], '%Y-%m-%d')
+            logger.info(f"Resuming from checkpoint: day {day_num} ({checkpoint['date']}), "
+                        f"minute {checkpoint['minute']}")
+        
+        # Data is only loaded once a day actually has to be simulated
+        data_loaded = False
+        
         while current_date <= end:
             date_str = current_date.strftime('%Y-%m-%d')
+            
+            resume_day = checkpoint if checkpoint and checkpoint['date'] == date_str else None
+            if resume_day:
+                start_balance = resume_day['day_start_balance']
+                start_position = resume_day['day_start_position']
+                segment_start = resume_day['day_equity_start']
+            else:
+                start_balance = self.balance
+                start_position = self.position
+                segment_start = self.equity_len
+            
+            day_key = None
+            cached_day = None
+            if cache:
+                day_key = cache.day_key(self.data_path, date_str, day_num, start_balance, start_position)
+                cached_day = cache.get_day(day_key) if resume_day is None else None
+            
+            if cached_day is not None:
+                daily_result, equity_segment, self.position = cached_day
+                self.balance = daily_result.ending_balance
+                self.trades.extend(daily_result.trades)
+                self.extend_equity(equity_segment)
+                if verbose:
+                    logger.info(f"Day {day_num} ({date_str}) restored from result cache")
+            else:
+                if not data_loaded:
+                    self.load_data(start_date, end_date)
+                    data_loaded = True
+                
+                daily_result = self.run_day(day_num, date_str, verbose, resume=resume_day)
+                if cache:
+                    equity_segment = self.equity_curve[segment_start:self.equity_len].copy()
+                    cache.put_day(day_key, (daily_result, equity_segment, self.position))
+            
+            self.daily_results.append(daily_result)
+            
+            day_num += 1
+            current_date += timedelta(days=1)
+        
+        result = self._build_result(initial_balance)
+        
+        if cache:
+            cache.put_run(run_key, result)
+        
+        # A completed run leaves nothing to resume
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        
+        return result
+    
+    def run_day(self, day_num: int, date_str: str, verbose: bool = True,
+                resume: Optional[Dict[str, Any]] = None) -> DailyResult:
+        """
+        Simulate one trading day from the current balance and position.
+        `resume` is a checkpoint taken part-way through this day.
+        """
+        if resume:
+            day_start_balance = resume['day_start_balance']
+            day_start_position = resume['day_start_position']
+            day_equity_start = resume['day_equity_start']
+            day_trades = resume['day_trades']
+            first_minute = resume['minute']
+        else:
             day_start_balance = self.balance
+            day_start_position = self.position
+            day_equity_start = self.equity_len
             day_trades = []
+            first_minute = TRADING_START_MINUTE
             
             if verbose:
                 logger.info(f"=== Day {day_num}: {date_str} ===")
             
             # Notify strategy of day start
             self.strategy.start_day(day_num, date_str, self.balance)
+        
+        # Trading window: 08:00 to 24:00 (960 minutes)
+        for minute in range(first_minute, TRADING_END_MINUTE):  # 08:00 = minute 480
+            if (self.checkpoint_path and self.checkpoint_every > 0
+                    and self.minutes_simulated % self.checkpoint_every == 0
+                    and self.minutes_simulated != self._last_checkpoint_at):
+                self.save_checkpoint(day_num, date_str, minute, day_start_balance,
+                                     day_start_position, day_equity_start, day_trades)
+            self.minutes_simulated += 1
             
-            # Trading window: 08:00 to 24:00 (960 minutes)
-            for minute in range(480, 1440):  # 08:00 = minute 480
-                hour = minute // 60
-                min_of_hour = minute % 60
-                
-                timestamp = np.datetime64(f'{date_str}T{hour:02d}:{min_of_hour:02d}:00')
-                
-                # Get qualifying tickers
-                qualifying = self.get_qualifying_tickers(timestamp)
-                
-                if not qualifying:
-                    continue
-                
-                # Build tick data
-                tick_data = self.build_tick_data(timestamp, day_num, minute, qualifying)
-                
-                # Get strategy decision
-                decision = self.strategy.decide(tick_data)
-                action = decision.get('action', 'HOLD')
-                
-                # Execute action (next minute's price - simulate real trading)
-                next_minute = minute + 1
-                if next_minute >= 1440:
-                    # End of day - will be force closed
-                    continue
-                
-                next_hour = next_minute // 60
-                next_min = next_minute % 60
-                next_timestamp = np.datetime64(f'{date_str}T{next_hour:02d}:{next_min:02d}:00')
-                
-                if action == 'OPEN_LONG' or action == 'OPEN_SHORT':
-                    if self.position is None:
-                        ticker = decision.get('ticker')
-                        leverage = decision.get('leverage', config.DEFAULT_LEVERAGE)
-                        size_pct = decision.get('size_pct', config.DEFAULT_SIZE_PCT)
-                        
-                        # Get execution price (next minute's open)
-                        candle = self.get_candle_at_time(ticker, next_timestamp)
-                        if candle:
-                            exec_price = candle['open']
-                            side = 'LONG' if action == 'OPEN_LONG' else 'SHORT'
-                            self.open_position(ticker, side, leverage, size_pct, 
-                                             exec_price, str(next_timestamp))
-                
-                elif action == 'CLOSE':
-                    if self.position:
-                        candle = self.get_candle_at_time(self.position.ticker, next_timestamp)
-                        if candle:
-                            exec_price = candle['open']
-                            trade = self.close_position(exec_price, str(next_timestamp),
-                                                       decision.get('reason', ''))
-                            if trade:
-                                day_trades.append(trade)
-                
-                # Track equity for drawdown
-                current_equity = self.balance
+            hour = minute // 60
+            min_of_hour = minute % 60
+            
+            timestamp = np.datetime64(f'{date_str}T{hour:02d}:{min_of_hour:02d}:00')
+            
+            # Get qualifying tickers
+            qualifying = self.get_qualifying_tickers(timestamp)
+            
+            if not qualifying:
+                continue
+            
+            # Build tick data
+            tick_data = self.build_tick_data(timestamp, day_num, minute, qualifying)
+            
+            # Get strategy decision
+            decision = self.strategy.decide(tick_data)
+            action = decision.get('action', 'HOLD')
+            
+            # Execute action (next minute's price - simulate real trading)
+            next_minute = minute + 1
+            if next_minute >= 1440:
+                # End of day - will be force closed
+                continue
+            
+            next_hour = next_minute // 60
+            next_min = next_minute % 60
+            next_timestamp = np.datetime64(f'{date_str}T{next_hour:02d}:{next_min:02d}:00')
+            
+            if action == 'OPEN_LONG' or action == 'OPEN_SHORT':
+                if self.position is None:
+                    ticker = decision.get('ticker')
+                    leverage = decision.get('leverage', config.DEFAULT_LEVERAGE)
+                    size_pct = decision.get('size_pct', config.DEFAULT_SIZE_PCT)
+                    
+                    # Get execution price (next minute's open)
+                    candle = self.get_candle_at_time(ticker, next_timestamp)
+                    if candle:
+                        exec_price = candle['open']
+                        side = 'LONG' if action == 'OPEN_LONG' else 'SHORT'
+                        self.open_position(ticker, side, leverage, size_pct, 
+                                         exec_price, str(next_timestamp))
+            
+            elif action == 'CLOSE':
                 if self.position:
-                    candle = self.get_candle_at_time(self.position.ticker, timestamp)
+                    candle = self.get_candle_at_time(self.position.ticker, next_timestamp)
                     if candle:
-                        pnl, _ = self.position.calculate_pnl(candle['close'])
-                        current_equity += pnl
-                
-                self.equity_curve.append(current_equity)
-                
-                if current_equity > peak_equity:
-                    peak_equity = current_equity
-                
-                drawdown = peak_equity - current_equity
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
+                        exec_price = candle['open']
+                        trade = self.close_position(exec_price, str(next_timestamp),
+                                                   decision.get('reason', ''))
+                        if trade:
+                            day_trades.append(trade)
             
-            # End of day - force close any open position
+            # Track equity for drawdown
+            current_equity = self.balance
             if self.position:
-                # Get last price of the day
-                eod_timestamp = np.datetime64(f'{date_str}T23:59:00')
-                candle = self.get_candle_at_time(self.position.ticker, eod_timestamp)
+                candle = self.get_candle_at_time(self.position.ticker, timestamp)
                 if candle:
-                    trade = self.close_position(candle['close'], str(eod_timestamp), 'EOD force close')
-                    if trade:
-                        day_trades.append(trade)
+                    pnl, _ = self.position.calculate_pnl(candle['close'])
+                    current_equity += pnl
             
-            # Record daily results
-            daily_pnl = self.balance - day_start_balance
-            daily_result = DailyResult(
-                day=day_num,
-                date=date_str,
-                starting_balance=day_start_balance,
-                ending_balance=self.balance,
-                daily_pnl=daily_pnl,
-                trades=day_trades
+            self.record_equity(timestamp, current_equity)
+        
+        # End of day - force close any open position
+        if self.position:
+            # Get last price of the day
+            eod_timestamp = np.datetime64(f'{date_str}T23:59:00')
+            candle = self.get_candle_at_time(self.position.ticker, eod_timestamp)
+            if candle:
+                trade = self.close_position(candle['close'], str(eod_timestamp), 'EOD force close')
+                if trade:
+                    day_trades.append(trade)
+        
+        # Record daily results
+        daily_pnl = self.balance - day_start_balance
+        daily_result = DailyResult(
+            day=day_num,
+            date=date_str,
+            starting_balance=day_start_balance,
+            ending_balance=self.balance,
+            daily_pnl=daily_pnl,
+            trades=day_trades
+        )
+        
+        # Notify strategy
+        self.strategy.end_day(day_num, self.balance, daily_pnl)
+        
+        if verbose:
+            logger.info(
+                f"Day {day_num} complete: ${day_start_balance:.2f} -> ${self.balance:.2f} "
+                f"(PnL: ${daily_pnl:+.2f}, {len(day_trades)} trades)"
             )
-            self.daily_results.append(daily_result)
-            
-            # Notify strategy
-            self.strategy.end_day(day_num, self.balance, daily_pnl)
-            
-            if verbose:
-                logger.info(
-                    f"Day {day_num} complete: ${day_start_balance:.2f} -> ${self.balance:.2f} "
-                    f"(PnL: ${daily_pnl:+.2f}, {len(day_trades)} trades)"
-                )
-            
-            day_num += 1
-            current_date += timedelta(days=1)
+        
+        return daily_result
+    
+    def save_checkpoint(self, day_num: int, date_str: str, minute: int,
+                        day_start_balance: float, day_start_position: Optional[Position],
+                        day_equity_start: int, day_trades: List[Trade]):
+        """Atomically write the full simulation state before `minute` of `date_str`"""
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'data_path': os.path.abspath(self.data_path),
+            'start_date': self._run_range[0],
+            'end_date': self._run_range[1],
+            'inputs_key': self.inputs_key(),
+            'day_num': day_num,
+            'date': date_str,
+            'minute': minute,
+            'day_start_balance': day_start_balance,
+            'day_start_position': day_start_position,
+            'day_equity_start': day_equity_start,
+            'day_trades': day_trades,
+            'balance': self.balance,
+            'position': self.position,
+            'trades': self.trades,
+            'daily_results': self.daily_results,
+            'equity_curve': self.equity_curve[:self.equity_len],
+            'minutes_simulated': self.minutes_simulated,
+            'strategy': self.strategy.snapshot(),
+        }
+        atomic_write(self.checkpoint_path, pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL))
+        self._last_checkpoint_at = self.minutes_simulated
+        logger.debug(f"Checkpoint written: {date_str} minute {minute}")
+    
+    def inputs_key(self) -> str:
+        """Hash of the dataset, effective config and strategy/backtester source"""
+        if self._inputs_key is None:
+            self._inputs_key = ResultCache().base_key(self.data_path)
+        return self._inputs_key
+    
+    def load_checkpoint(self, start_date: str, end_date: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the latest checkpoint, if it belongs to this dataset and date range
+        and was written by the same code and effective config
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            logger.info("No checkpoint found - starting from the beginning")
+            return None
+        
+        with open(self.checkpoint_path, 'rb') as f:
+            checkpoint = pickle.load(f)
+        
+        expected = (CHECKPOINT_VERSION, os.path.abspath(self.data_path), start_date, end_date)
+        found = (checkpoint.get('version'), checkpoint.get('data_path'),
+                 checkpoint.get('start_date'), checkpoint.get('end_date'))
+        if found != expected:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was written for {found[1]} "
+                f"{found[2]}..{found[3]} (version {found[0]}), cannot resume this run"
+            )
+        if checkpoint.get('inputs_key') != self.inputs_key():
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was written by different strategy/backtester "
+                f"code, config or dataset contents; cannot resume this run"
+            )
+        
+        return checkpoint
+    
+    def _restore_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Adopt the simulation state stored in a checkpoint"""
+        self.balance = checkpoint['balance']
+        self.position = checkpoint['position']
+        self.trades = checkpoint['trades']
+        self.daily_results = checkpoint['daily_results']
+        self.extend_equity(checkpoint['equity_curve'])
+        self.minutes_simulated = checkpoint['minutes_simulated']
+        self._last_checkpoint_at = self.minutes_simulated
+        self.strategy.restore(checkpoint['strategy'])
+    
+    def _restore_result(self, result: BacktestResult):
+        """Adopt the state of a cached result"""
+        self.balance = result.final_balance
+        self.position = None
+        self.trades = result.all_trades
+        self.daily_results = result.daily_results
+        self.equity_curve = result.equity_curve
+        self.equity_len = len(result.equity_curve)
+    
+    def _build_result(self, initial_balance: float) -> BacktestResult:
+        """Compute final statistics from the recorded trades and equity curve"""
+        # Trim the equity curve to the samples actually recorded
+        self.equity_curve = self.equity_curve[:self.equity_len]
+        equity = self.equity_curve['equity']
+        
+        # Drawdown from running peak equity
+        peaks = np.maximum.accumulate(equity)
+        peak_equity = float(peaks[-1])
+        max_drawdown = float(np.max(peaks - equity))
         
         # Calculate final statistics
         total_pnl = self.balance - initial_balance
@@ -537,7 +888,8 @@ class Backtester:
             max_drawdown_pct=max_drawdown_pct,
             sharpe_ratio=sharpe,
             daily_results=self.daily_results,
-            all_trades=self.trades
+            all_trades=self.trades,
+            equity_curve=self.equity_curve
         )
         
         return result
@@ -596,21 +948,67 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Backtest trading strategy')
+    parser.add_argument('--data', default='december_2025_dataset.npz',
+                        help='Dataset: .npz file or candle store directory')
     parser.add_argument('--start', default='2025-12-01', help='Start date (YYYY-MM-DD)')
     parser.add_argument('--end', default='2025-12-31', help='End date (YYYY-MM-DD)')
     parser.add_argument('--quiet', action='store_true', help='Suppress verbose output')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore and do not update the on-disk result cache')
+    parser.add_argument('--checkpoint', metavar='PATH', default='backtest.ckpt',
+                        help='Checkpoint file for --checkpoint-every and --resume')
+    parser.add_argument('--checkpoint-every', type=int, default=config.CHECKPOINT_EVERY_MINUTES,
+                        metavar='MINUTES', help='Write a checkpoint every N simulated minutes (0 disables)')
+    parser.add_argument('--resume', action='store_true', help='Continue from the latest checkpoint')
+    parser.add_argument('--save', metavar='PATH', help='Save the run to a compact .npz result file')
+    parser.add_argument('--monte-carlo', type=int, default=0, metavar='N',
+                        help='Resample the realized trades N times for robustness analysis')
+    parser.add_argument('--mc-method', choices=['bootstrap', 'shuffle'], default='bootstrap',
+                        help='Resampling method for --monte-carlo')
+    parser.add_argument('--mc-workers', type=int, default=None,
+                        help='Worker processes for --monte-carlo (default: CPU count)')
+    parser.add_argument('--mc-seed', type=int, default=None, help='Seed for --monte-carlo')
     
     args = parser.parse_args()
     
-    backtester = Backtester()
+    checkpointing = args.checkpoint_every > 0 or args.resume
+    backtester = Backtester(
+        data_path=args.data,
+        checkpoint_path=args.checkpoint if checkpointing else None,
+        checkpoint_every=args.checkpoint_every
+    )
     result = backtester.run(
         start_date=args.start,
         end_date=args.end,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        use_cache=not args.no_cache,
+        resume=args.resume
     )
     
     backtester.print_results(result)
     
+    if args.save:
+        from result_store import save_run
+        
+        save_run(args.save, result, {
+            'data_path': backtester.data_path,
+            'start_date': args.start,
+            'end_date': args.end,
+        })
+    
+    if args.monte_carlo > 0:
+        from robustness import run_monte_carlo, print_report
+        
+        report = run_monte_carlo(
+            backtester.trades,
+            resamples=args.monte_carlo,
+            method=args.mc_method,
+            workers=args.mc_workers,
+            seed=args.mc_seed
+        )
+        if report:
+            print_report(report)
+    
     return result
 
 
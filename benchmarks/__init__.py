@@ -0,0 +1,7 @@
+"""
+ThothMind Trading Challenge - Benchmarks
+=========================================
+Standalone performance scripts. Run from the repository root, e.g.:
+
+    python -m benchmarks.bench_result_store
+"""
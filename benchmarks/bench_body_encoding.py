@@ -0,0 +1,129 @@
+"""
+Benchmark: compressed /tick request bodies
+===========================================
+For each payload, compares identity, gzip and zstd bodies on:
+- transfer size and estimated transfer time at a given link bandwidth
+- client-side compression time
+- end-to-end /tick latency through the Flask app (decode + parse + decide)
+
+Payloads are rebuilt from a decision journal when --journal is given
+(see journal.py), otherwise synthetic payloads are used.
+
+Usage:
+    python -m benchmarks.bench_body_encoding [--tickers 50 150 300]
+    python -m benchmarks.bench_body_encoding --journal journal.bin --data december_2025_dataset.npz
+"""
+import os
+import sys
+import json
+import time
+import gzip
+import logging
+import argparse
+from typing import Dict, List
+
+import numpy as np
+
+os.environ.setdefault('WARMUP', 'false')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import config
+from body_encoding import zstandard
+from synthetic import make_tick_payload
+
+
+def _payloads(args) -> List[Dict]:
+    if not args.journal:
+        return [make_tick_payload(seed=n, num_tickers=n, history_len=1440) for n in args.tickers]
+
+    from backtester import Backtester
+    from journal import read_journal, rebuild_tick
+
+    ticks = [r for r in read_journal(args.journal) if r['type'] == 'tick' and r['tickers']]
+    ticks.sort(key=lambda r: len(r['tickers']), reverse=True)
+    ticks = ticks[:args.samples]
+    dates = sorted(r['timestamp'][:10] for r in ticks)
+    backtester = Backtester(data_path=args.data)
+    backtester.load_data(dates[0], dates[-1])
+    return [rebuild_tick(backtester, r) for r in ticks]
+
+
+def _encoders(levels: Dict[str, int]) -> Dict:
+    encoders = {
+        'identity': lambda raw: raw,
+        f"gzip-{levels['gzip']}": lambda raw: gzip.compress(raw, compresslevel=levels['gzip']),
+    }
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=levels['zstd'])
+        encoders[f"zstd-{levels['zstd']}"] = compressor.compress
+    return encoders
+
+
+def _timed_post(client, body: bytes, encoding: str, repeats: int) -> float:
+    headers = {'X-API-Key': config.API_KEY, 'Content-Type': 'application/json'}
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding.split('-')[0]
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        response = client.post('/tick', data=body, headers=headers)
+        best = min(best, (time.perf_counter() - t0) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"/tick returned {response.status_code}: {response.get_data(as_text=True)}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compressed request body benchmark')
+    parser.add_argument('--tickers', type=int, nargs='+', default=[50, 150, 300])
+    parser.add_argument('--journal', help='Rebuild payloads from this decision journal')
+    parser.add_argument('--data', default='december_2025_dataset.npz', help='Dataset for --journal')
+    parser.add_argument('--samples', type=int, default=3, help='Journal ticks to use (largest first)')
+    parser.add_argument('--bandwidth-mbps', type=float, default=100.0)
+    parser.add_argument('--gzip-level', type=int, default=6)
+    parser.add_argument('--zstd-level', type=int, default=3)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    from app import app
+    logging.disable(logging.CRITICAL)
+    client = app.test_client()
+    encoders = _encoders({'gzip': args.gzip_level, 'zstd': args.zstd_level})
+
+    cases = []
+    for payload in _payloads(args):
+        raw = json.dumps(payload).encode()
+        case = {'tickers': len(payload['qualifying_tickers']), 'json_bytes': len(raw), 'encodings': {}}
+        for name, encode in encoders.items():
+            t0 = time.perf_counter()
+            body = encode(raw)
+            compress_ms = (time.perf_counter() - t0) * 1000
+            transfer_ms = len(body) * 8 / (args.bandwidth_mbps * 1e6) * 1000
+            server_ms = _timed_post(client, body, name, args.repeats)
+            case['encodings'][name] = {
+                'bytes': len(body),
+                'ratio': len(raw) / len(body),
+                'compress_ms': compress_ms,
+                'transfer_ms': transfer_ms,
+                'server_ms': server_ms,
+                'end_to_end_ms': compress_ms + transfer_ms + server_ms,
+            }
+        cases.append(case)
+        print(f"  {case['tickers']} tickers, {len(raw) / 1e6:.1f} MB JSON", file=sys.stderr)
+
+    report = {
+        'source': 'journal' if args.journal else 'synthetic',
+        'bandwidth_mbps': args.bandwidth_mbps,
+        'zstd_available': zstandard is not None,
+        'median_ratio': {
+            name: float(np.median([c['encodings'][name]['ratio'] for c in cases])) for name in encoders
+        },
+        'cases': cases,
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
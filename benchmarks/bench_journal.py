@@ -0,0 +1,80 @@
+"""
+Benchmark: decision journal overhead
+=====================================
+Measures the per-tick cost the journal adds to a request (record_tick, which
+copies the journaled fields) and the background encode cost per record,
+across qualifying-ticker counts.
+Also round-trips the written file through the reader.
+
+Usage:
+    python -m benchmarks.bench_journal [--ticks 2000]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+
+from journal import DecisionJournal, read_journal, _encode_tick
+from strategy import TradingStrategy
+from synthetic import make_tick_payload
+
+BUDGET_US = 100.0
+
+
+def bench(tickers: int, ticks: int, directory: str) -> dict:
+    payload = make_tick_payload(seed=tickers, num_tickers=tickers, history_len=240)
+    strategy = TradingStrategy()
+    decision = strategy.decide(payload)
+    analyses = strategy.last_analyses
+
+    path = os.path.join(directory, f'journal-{tickers}.bin')
+    journal = DecisionJournal(path, fsync_interval=0.2)
+    record_us = []
+    for _ in range(ticks):
+        t0 = time.perf_counter_ns()
+        journal.record_tick(payload, decision, analyses, 1234.5)
+        record_us.append((time.perf_counter_ns() - t0) / 1000)
+    journal.close()
+
+    encode_us = []
+    for _ in range(min(ticks, 500)):
+        t0 = time.perf_counter_ns()
+        _encode_tick(0.0, payload, decision, analyses, 1234.5)
+        encode_us.append((time.perf_counter_ns() - t0) / 1000)
+
+    records = sum(1 for _ in read_journal(path))
+    record_us = np.array(record_us)
+    return {
+        'tickers': tickers,
+        'record_p50_us': float(np.percentile(record_us, 50)),
+        'record_p99_us': float(np.percentile(record_us, 99)),
+        'encode_p50_us': float(np.median(encode_us)),
+        'bytes_per_record': os.path.getsize(path) / max(records, 1),
+        'records_read_back': records,
+        'dropped': journal.dropped,
+        'within_budget': bool(np.percentile(record_us, 99) < BUDGET_US),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Decision journal overhead')
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1, 10, 50, 300])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        cases = [bench(n, args.ticks, directory) for n in args.tickers]
+
+    json.dump({'budget_us': BUDGET_US, 'cases': cases}, sys.stdout, indent=2)
+    print()
+    return 0 if all(c['within_budget'] for c in cases) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
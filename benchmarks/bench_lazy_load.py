@@ -0,0 +1,112 @@
+"""
+Benchmark: eager vs two-phase (lazy) dataset loading
+=====================================================
+Writes a synthetic wide-universe npz where only a few tickers ever pass the
+24h-change filter, then loads it in fresh subprocesses and reports load time
+and peak RSS for both modes.
+
+Usage:
+    python -m benchmarks.bench_lazy_load [--tickers 500] [--days 31] [--movers 10]
+"""
+import os
+import sys
+import json
+import argparse
+import resource
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[ns]'),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+    ('volume', np.float64),
+])
+
+
+def write_dataset(path: str, tickers: int, days: int, movers: int, seed: int = 0):
+    """Random-walk universe; `movers` tickers get a +40% trend on day 10"""
+    rng = np.random.default_rng(seed)
+    n = days * 1440
+    timestamps = np.datetime64('2025-11-30T00:00:00', 'ns') + np.arange(n).astype('timedelta64[m]')
+
+    arrays = {}
+    for i in range(tickers):
+        steps = rng.normal(0, 0.0003, n)
+        if i < movers:
+            steps[10 * 1440:11 * 1440] += np.log(1.4) / 1440
+        close = 10.0 * np.exp(np.cumsum(steps))
+        candles = np.empty(n, dtype=CANDLE_DTYPE)
+        candles['timestamp'] = timestamps
+        candles['open'] = np.concatenate(([close[0]], close[:-1]))
+        candles['high'] = np.maximum(candles['open'], close) * 1.0005
+        candles['low'] = np.minimum(candles['open'], close) * 0.9995
+        candles['close'] = close
+        candles['volume'] = rng.lognormal(8, 1, n)
+        arrays[f'T{i:04d}USDT'] = candles
+
+    # Uncompressed so phase one can memory-map each member
+    np.savez(path, **arrays)
+
+
+def measure(path: str, start: str, end: str, lazy: bool) -> dict:
+    """Run load_data in-process and report time and peak RSS"""
+    from backtester import Backtester
+
+    backtester = Backtester(path)
+    t0 = time.perf_counter()
+    if lazy:
+        backtester.load_data(start, end)
+    else:
+        backtester.load_data()
+    elapsed = time.perf_counter() - t0
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        maxrss *= 1024
+
+    return {'load_s': elapsed, 'peak_rss_bytes': maxrss, 'tickers_loaded': len(backtester.data)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark eager vs lazy dataset loading')
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--movers', type=int, default=10)
+    parser.add_argument('--start', default='2025-12-05')
+    parser.add_argument('--end', default='2025-12-20')
+    parser.add_argument('--child', choices=['eager', 'lazy'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        json.dump(measure(args.path, args.start, args.end, args.child == 'lazy'), sys.stdout)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wide.npz')
+        write_dataset(path, args.tickers, args.days, args.movers)
+
+        report = {'tickers': args.tickers, 'days': args.days, 'movers': args.movers,
+                  'file_bytes': os.path.getsize(path)}
+        for mode in ('eager', 'lazy'):
+            # Fresh interpreter per mode so peak RSS is not shared
+            out = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_lazy_load', '--child', mode,
+                 '--path', path, '--start', args.start, '--end', args.end],
+                check=True, capture_output=True, text=True
+            ).stdout
+            report[mode] = json.loads(out.strip().splitlines()[-1])
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: serial vs process-pool ticker analysis
+==================================================
+Analyzes the same synthetic tick serially and with ParallelAnalyzer, checks
+that both produce identical analyses, and reports timings as JSON.
+
+Usage:
+    python -m benchmarks.bench_parallel_analysis [--tickers 50 150 300] [--workers 4]
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+from dataclasses import asdict
+
+from strategy import MomentumAnalyzer
+from parallel_analysis import ParallelAnalyzer
+from synthetic import make_tick_payload
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serial vs parallel ticker analysis')
+    parser.add_argument('--tickers', type=int, nargs='+', default=[50, 150, 300])
+    parser.add_argument('--history', type=int, default=1440)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    analyzer = MomentumAnalyzer()
+    parallel = ParallelAnalyzer(args.workers, min_tickers=1)
+
+    report = {'workers': args.workers, 'history': args.history, 'cases': []}
+    mismatches = 0
+    try:
+        for count in args.tickers:
+            payload = make_tick_payload(seed=count, num_tickers=count, history_len=args.history)
+            tickers = payload['qualifying_tickers']
+            history, market = payload['history'], payload['market_data']
+
+            serial = ParallelAnalyzer._serial(analyzer, tickers, history, market)
+            pooled = parallel.analyze(analyzer, tickers, history, market)
+            identical = [asdict(a) for a in serial] == [asdict(b) for b in pooled]
+            mismatches += not identical
+
+            serial_ms = _best_of(lambda: ParallelAnalyzer._serial(analyzer, tickers, history, market), args.repeats)
+            parallel_ms = _best_of(lambda: parallel.analyze(analyzer, tickers, history, market), args.repeats)
+            report['cases'].append({
+                'tickers': count,
+                'serial_ms': serial_ms,
+                'parallel_ms': parallel_ms,
+                'speedup': serial_ms / parallel_ms,
+                'identical': identical,
+            })
+    finally:
+        parallel.close()
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Benchmark: result store memory use and save/load times
+=======================================================
+Compares the old list-of-floats equity curve with the preallocated
+structured array, then times save_run()/load_run() for synthetic
+month-long runs.
+
+Usage:
+    python -m benchmarks.bench_result_store [--days 31] [--trades-per-day 8] [--repeat 5]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+from backtester import (
+    Trade, DailyResult, BacktestResult, EQUITY_DTYPE, TRADING_MINUTES_PER_DAY
+)
+from result_store import save_run, load_run
+
+
+def make_run(days: int, trades_per_day: int, seed: int = 0) -> BacktestResult:
+    """Build a synthetic BacktestResult with realistic array sizes"""
+    rng = np.random.default_rng(seed)
+    n = days * TRADING_MINUTES_PER_DAY + 1
+
+    equity = np.empty(n, dtype=EQUITY_DTYPE)
+    start = np.datetime64('2025-12-01T08:00:00')
+    equity['timestamp'] = start + np.arange(n).astype('timedelta64[m]')
+    equity['equity'] = 1000.0 * np.cumprod(1 + rng.normal(0, 0.001, n))
+    equity['balance'] = equity['equity']
+
+    trades = []
+    daily = []
+    balance = 1000.0
+    for day in range(days):
+        date = str(np.datetime64('2025-12-01') + day)
+        day_trades = []
+        for k in range(trades_per_day):
+            pnl = float(rng.normal(0, 20))
+            day_trades.append(Trade(
+                ticker=f"TICK{rng.integers(0, 300)}USDT",
+                side='LONG' if k % 2 else 'SHORT',
+                entry_time=f"{date}T{8 + k:02d}:00:00",
+                entry_price=float(rng.uniform(0.01, 100)),
+                exit_time=f"{date}T{8 + k:02d}:30:00",
+                exit_price=float(rng.uniform(0.01, 100)),
+                size=600.0,
+                leverage=4,
+                pnl=pnl,
+                pnl_pct=pnl / 6,
+                reason=f"Trailing stop: PnL {pnl:.2f} below trail level {pnl * 2:.2f}",
+            ))
+        daily_pnl = sum(t.pnl for t in day_trades)
+        daily.append(DailyResult(day + 1, date, balance, balance + daily_pnl, daily_pnl, day_trades))
+        balance += daily_pnl
+        trades.extend(day_trades)
+
+    return BacktestResult(
+        initial_balance=1000.0, final_balance=balance, total_pnl=balance - 1000.0,
+        total_return_pct=(balance - 1000.0) / 10, total_trades=len(trades),
+        winning_trades=sum(t.pnl > 0 for t in trades), losing_trades=sum(t.pnl <= 0 for t in trades),
+        win_rate=0.0, max_drawdown=0.0, max_drawdown_pct=0.0, sharpe_ratio=0.0,
+        daily_results=daily, all_trades=trades, equity_curve=equity,
+    )
+
+
+def measure_list_curve(n: int) -> int:
+    """Bytes allocated by the previous list-of-floats equity curve"""
+    tracemalloc.start()
+    curve = [1000.0]
+    for i in range(n - 1):
+        curve.append(1000.0 + i * 0.01)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del curve
+    return peak
+
+
+def measure_array_curve(n: int) -> int:
+    """Bytes allocated by the preallocated structured equity curve"""
+    tracemalloc.start()
+    curve = np.zeros(n, dtype=EQUITY_DTYPE)
+    for i in range(n):
+        curve[i] = (np.datetime64('2025-12-01T08:00:00'), 1000.0 + i * 0.01, 1000.0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del curve
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the backtest result store')
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--trades-per-day', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    result = make_run(args.days, args.trades_per_day)
+    n = len(result.equity_curve)
+
+    report = {
+        'days': args.days,
+        'equity_samples': n,
+        'trades': result.total_trades,
+        'memory_bytes': {
+            'equity_list_of_floats': measure_list_curve(n),
+            'equity_structured_array': measure_array_curve(n),
+        },
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.npz')
+
+        save_times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            save_run(path, result, {'start_date': '2025-12-01'})
+            save_times.append(time.perf_counter() - t0)
+
+        load_times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            stored = load_run(path)
+            load_times.append(time.perf_counter() - t0)
+
+        assert len(stored.equity) == n
+        assert len(stored.trades) == result.total_trades
+
+        report['file_bytes'] = os.path.getsize(path)
+        report['save_ms'] = {'min': min(save_times) * 1000, 'median': float(np.median(save_times)) * 1000}
+        report['load_ms'] = {'min': min(load_times) * 1000, 'median': float(np.median(load_times)) * 1000}
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
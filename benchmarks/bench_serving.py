@@ -0,0 +1,148 @@
+"""
+Benchmark: Flask vs ASGI serving under concurrent load
+=======================================================
+Starts each server in a subprocess, then drives it with several concurrent
+/tick senders posting heavy synthetic payloads while a prober polls /health.
+Reports tick and health latency percentiles per server as JSON.
+
+Usage:
+    python -m benchmarks.bench_serving [--tickers 150] [--clients 4] [--duration 10]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+import http.client
+from typing import Dict, List
+
+import numpy as np
+
+import config
+from synthetic import make_tick_payload
+
+SERVERS = {
+    'flask': [sys.executable, 'app.py'],
+    'asgi': [sys.executable, 'asgi_app.py'],
+}
+
+
+def _request(port: int, method: str, path: str, body: bytes = None) -> float:
+    """One request on a fresh connection; returns latency in ms"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    headers = {'X-API-Key': config.API_KEY, 'Content-Type': 'application/json'}
+    t0 = time.perf_counter()
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    elapsed = (time.perf_counter() - t0) * 1000
+    conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"{method} {path} returned {response.status}")
+    return elapsed
+
+
+def _wait_ready(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            _request(port, 'GET', '/health')
+            return
+        except (OSError, RuntimeError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {'count': 0}
+    arr = np.array(samples)
+    return {
+        'count': len(samples),
+        'p50_ms': float(np.percentile(arr, 50)),
+        'p90_ms': float(np.percentile(arr, 90)),
+        'p99_ms': float(np.percentile(arr, 99)),
+        'max_ms': float(arr.max()),
+    }
+
+
+def run_load(port: int, payload: bytes, clients: int, duration: float) -> Dict:
+    tick_latencies: List[float] = []
+    health_latencies: List[float] = []
+    errors = []
+    stop = time.time() + duration
+
+    def tick_sender():
+        while time.time() < stop:
+            try:
+                tick_latencies.append(_request(port, 'POST', '/tick', payload))
+            except Exception as e:
+                errors.append(str(e))
+
+    def health_prober():
+        while time.time() < stop:
+            try:
+                health_latencies.append(_request(port, 'GET', '/health'))
+            except Exception as e:
+                errors.append(str(e))
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=tick_sender) for _ in range(clients)]
+    threads.append(threading.Thread(target=health_prober))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return {
+        'tick': _percentiles(tick_latencies),
+        'ticks_per_sec': len(tick_latencies) / duration,
+        'health': _percentiles(health_latencies),
+        'errors': len(errors),
+    }
+
+
+def bench_server(name: str, port: int, payload: bytes, clients: int, duration: float) -> Dict:
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', LOG_LEVEL='WARNING')
+    proc = subprocess.Popen(SERVERS[name], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(port)
+        return run_load(port, payload, clients, duration)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flask vs ASGI latency under concurrent ticks')
+    parser.add_argument('--tickers', type=int, default=150)
+    parser.add_argument('--history', type=int, default=1440)
+    parser.add_argument('--clients', type=int, default=4, help='Concurrent /tick senders')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per server')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+    args = parser.parse_args()
+
+    payload = json.dumps(make_tick_payload(seed=1, num_tickers=args.tickers, history_len=args.history)).encode()
+
+    report = {
+        'tickers': args.tickers,
+        'history': args.history,
+        'payload_bytes': len(payload),
+        'clients': args.clients,
+        'duration_s': args.duration,
+        'servers': {},
+    }
+    for name in args.servers:
+        print(f"Benchmarking {name}...", file=sys.stderr)
+        report['servers'][name] = bench_server(name, args.port, payload, args.clients, args.duration)
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Benchmark: strategy microbenchmarks
+====================================
+Measures TradingStrategy.decide and MomentumAnalyzer.analyze_ticker on
+seeded synthetic payloads across history lengths, qualifying-ticker counts
+and position state. Reports per-call latency percentiles and peak
+allocation per call as JSON, and can compare against a stored baseline.
+
+Usage:
+    python -m benchmarks.bench_strategy --output current.json
+    python -m benchmarks.bench_strategy --baseline baseline.json --threshold 0.15
+
+Exits with status 1 if any case's p50 latency regresses by more than the
+threshold relative to the baseline.
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from strategy import TradingStrategy, MomentumAnalyzer
+from synthetic import make_tick_payload
+
+HISTORY_LENGTHS = [60, 240, 720, 1440]
+TICKER_COUNTS = [1, 10, 50, 150, 300]
+QUICK_TICKER_COUNTS = [1, 10, 50]
+
+
+def _latency(fn: Callable[[], object], iterations: int, budget_s: float) -> Dict[str, float]:
+    """Per-call latency percentiles in microseconds"""
+    fn()  # warm-up
+    samples: List[float] = []
+    deadline = time.perf_counter() + budget_s
+    for _ in range(iterations):
+        t0 = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - t0) / 1000)
+        if time.perf_counter() > deadline and len(samples) >= 5:
+            break
+
+    arr = np.array(samples)
+    return {
+        'calls': len(samples),
+        'mean_us': float(arr.mean()),
+        'min_us': float(arr.min()),
+        'p50_us': float(np.percentile(arr, 50)),
+        'p90_us': float(np.percentile(arr, 90)),
+        'p99_us': float(np.percentile(arr, 99)),
+    }
+
+
+def _allocations(fn: Callable[[], object]) -> Dict[str, int]:
+    """Peak and retained bytes allocated by one call"""
+    fn()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'peak_alloc_bytes': peak - before, 'retained_bytes': after - before}
+
+
+def bench_decide(history_len: int, tickers: int, with_position: bool,
+                 iterations: int, budget_s: float, seed: int) -> Dict:
+    payload = make_tick_payload(seed=seed, num_tickers=tickers, history_len=history_len,
+                                with_position=with_position)
+    strategy = TradingStrategy()
+
+    def call():
+        # Fresh counters so every call does the full analysis instead of hitting a cooldown
+        strategy.last_trade_minute = -999
+        strategy.trades_today = 0
+        strategy.position_peak_pnl = 0.0
+        return strategy.decide(payload)
+
+    return {**_latency(call, iterations, budget_s), **_allocations(call)}
+
+
+def bench_analyze(history_len: int, iterations: int, budget_s: float, seed: int) -> Dict:
+    payload = make_tick_payload(seed=seed, num_tickers=1, history_len=history_len)
+    ticker = payload['qualifying_tickers'][0]
+    analyzer = MomentumAnalyzer()
+    market = payload['market_data'][ticker]
+
+    def call():
+        return analyzer.analyze_ticker(ticker, payload['history'][ticker], market, market['change_24h_pct'])
+
+    return {**_latency(call, iterations, budget_s), **_allocations(call)}
+
+
+def run_suite(iterations: int, budget_s: float, seed: int, quick: bool) -> Dict:
+    results = {}
+    for history_len in HISTORY_LENGTHS:
+        results[f'analyze_ticker/h={history_len}'] = bench_analyze(history_len, iterations, budget_s, seed)
+
+    for history_len in HISTORY_LENGTHS:
+        for tickers in (QUICK_TICKER_COUNTS if quick else TICKER_COUNTS):
+            for with_position in (False, True):
+                name = f"decide/h={history_len}/t={tickers}/{'position' if with_position else 'flat'}"
+                results[name] = bench_decide(history_len, tickers, with_position, iterations, budget_s, seed)
+                print(f"  {name}: p50={results[name]['p50_us']:.0f}us", file=sys.stderr)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Names of cases whose p50 latency regressed by more than `threshold`"""
+    regressions = []
+    for name, base in baseline.get('results', {}).items():
+        cur = current['results'].get(name)
+        if cur is None:
+            continue
+        ratio = cur['p50_us'] / base['p50_us'] if base['p50_us'] > 0 else 1.0
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: p50 {base['p50_us']:.0f}us -> {cur['p50_us']:.0f}us ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Strategy microbenchmarks')
+    parser.add_argument('--iterations', type=int, default=200, help='Max calls per case')
+    parser.add_argument('--budget', type=float, default=2.0, help='Max seconds per case')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--quick', action='store_true', help='Skip the 150/300-ticker cases')
+    parser.add_argument('--output', help='Write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Allowed p50 slowdown vs baseline (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    # Strategy logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+
+    current = run_suite(args.iterations, args.budget, args.seed, args.quick)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    else:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%}", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
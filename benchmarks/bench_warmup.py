@@ -0,0 +1,85 @@
+"""
+Benchmark: cold vs warm first-tick latency
+===========================================
+Each trial runs in a fresh interpreter. A "cold" process handles its first
+/tick immediately after import; a "warm" process runs handlers.warm_up()
+first. Reports the median first- and second-tick latencies for both.
+
+Usage:
+    python -m benchmarks.bench_warmup [--trials 5] [--tickers 20]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+import numpy as np
+
+
+def child(mode: str, tickers: int) -> dict:
+    """Runs inside the fresh interpreter"""
+    t0 = time.perf_counter()
+    import handlers
+    from synthetic import make_tick_payload
+    import_ms = (time.perf_counter() - t0) * 1000
+
+    warmup_ms = 0.0
+    if mode == 'warm':
+        t0 = time.perf_counter()
+        handlers.warm_up()
+        warmup_ms = (time.perf_counter() - t0) * 1000
+
+    # A different payload than warm-up uses, so nothing is trivially reused
+    payload = make_tick_payload(seed=7, num_tickers=tickers)
+    latencies = []
+    for _ in range(2):
+        t0 = time.perf_counter()
+        handlers.handle_tick(payload)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        handlers.strategy.last_trade_minute = -999
+
+    return {'import_ms': import_ms, 'warmup_ms': warmup_ms,
+            'first_tick_ms': latencies[0], 'second_tick_ms': latencies[1]}
+
+
+def run_trials(mode: str, trials: int, tickers: int) -> dict:
+    env = dict(os.environ, WARMUP='false', LOG_LEVEL='WARNING', JOURNAL_PATH='')
+    samples = []
+    for _ in range(trials):
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_warmup', '--child', mode, '--tickers', str(tickers)],
+            env=env, capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {key: float(np.median([s[key] for s in samples])) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold vs warm first-tick latency')
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--tickers', type=int, default=20)
+    parser.add_argument('--child', choices=['cold', 'warm'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.tickers)))
+        return 0
+
+    cold = run_trials('cold', args.trials, args.tickers)
+    warm = run_trials('warm', args.trials, args.tickers)
+    report = {
+        'trials': args.trials,
+        'tickers': args.tickers,
+        'cold': cold,
+        'warm': warm,
+        'first_tick_speedup': cold['first_tick_ms'] / warm['first_tick_ms'],
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+ThothMind Trading Challenge - Request Body Encoding
+====================================================
+Streaming decoding of compressed request bodies (Content-Encoding).
+
+Supported encodings:
+- identity (no compression)
+- gzip / x-gzip (stdlib zlib)
+- zstd (requires the optional `zstandard` package)
+
+Both the compressed input and the decompressed output are capped, so a
+small "zip bomb" body cannot exhaust memory: decompression stops and
+BodyTooLarge is raised as soon as the cap is crossed.
+"""
+import zlib
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Decompressed bytes produced per step
+_CHUNK_SIZE = 256 * 1024
+
+# zstd decompressobj has no output limit per call, so compressed input is
+# fed in slices this small to bound what one call can expand to before the
+# decoded-size cap is checked
+_ZSTD_FEED_SIZE = 4 * 1024
+
+
+class BodyDecodeError(ValueError):
+    """Malformed compressed body"""
+    status = 400
+
+
+class UnsupportedEncoding(BodyDecodeError):
+    """Content-Encoding the server cannot decode"""
+    status = 415
+
+
+class BodyTooLarge(BodyDecodeError):
+    """Body exceeds the configured size cap"""
+    status = 413
+
+
+def supported_encodings() -> List[str]:
+    encodings = ['identity', 'gzip']
+    if zstandard is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+class StreamDecoder:
+    """
+    Incremental decoder: feed() compressed chunks as they arrive, then
+    finish() to get the decoded body.
+    """
+
+    def __init__(self, encoding: Optional[str], max_size: int):
+        self.encoding = (encoding or 'identity').strip().lower()
+        if self.encoding == 'x-gzip':
+            self.encoding = 'gzip'
+        self.max_size = max_size
+        self.compressed_size = 0
+        self.size = 0
+        self._chunks: List[bytes] = []
+        self._gzip = None
+        self._zstd = None
+
+        if self.encoding == 'gzip':
+            self._gzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == 'zstd':
+            if zstandard is None:
+                raise UnsupportedEncoding("zstd bodies need the 'zstandard' package")
+            self._zstd = zstandard.ZstdDecompressor().decompressobj(write_size=_CHUNK_SIZE)
+        elif self.encoding != 'identity':
+            raise UnsupportedEncoding(f"Unsupported Content-Encoding: {encoding}")
+
+    def _append(self, data: bytes):
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise BodyTooLarge(f"Decoded body exceeds {self.max_size} bytes")
+        self._chunks.append(data)
+
+    def feed(self, data: bytes):
+        if not data:
+            return
+        self.compressed_size += len(data)
+        if self.compressed_size > self.max_size:
+            raise BodyTooLarge(f"Request body exceeds {self.max_size} bytes")
+
+        if self._gzip is not None:
+            try:
+                while data:
+                    self._append(self._gzip.decompress(data, _CHUNK_SIZE))
+                    data = self._gzip.unconsumed_tail
+            except zlib.error as e:
+                raise BodyDecodeError(f"Invalid gzip body: {e}")
+        elif self._zstd is not None:
+            try:
+                for start in range(0, len(data), _ZSTD_FEED_SIZE):
+                    self._append(self._zstd.decompress(data[start:start + _ZSTD_FEED_SIZE]))
+            except zstandard.ZstdError as e:
+                raise BodyDecodeError(f"Invalid zstd body: {e}")
+        else:
+            self._chunks.append(data)
+            self.size += len(data)
+
+    def finish(self) -> bytes:
+        if self._gzip is not None:
+            try:
+                self._append(self._gzip.flush())
+            except zlib.error as e:
+                raise BodyDecodeError(f"Invalid gzip body: {e}")
+            if not self._gzip.eof and self.compressed_size:
+                raise BodyDecodeError("Truncated gzip body")
+
+        elif self._zstd is not None:
+            try:
+                self._append(self._zstd.flush())
+            except zstandard.ZstdError as e:
+                raise BodyDecodeError(f"Invalid zstd body: {e}")
+            if not getattr(self._zstd, 'eof', True) and self.compressed_size:
+                raise BodyDecodeError("Truncated zstd body")
+
+        return b''.join(self._chunks)
+
+
+def decode_body(stream, encoding: Optional[str], max_size: int, read_size: int = 64 * 1024) -> bytes:
+    """Read a file-like body stream to the end and decode it"""
+    decoder = StreamDecoder(encoding, max_size)
+    for chunk in iter(lambda: stream.read(read_size), b''):
+        decoder.feed(chunk)
+    return decoder.finish()
@@ -0,0 +1,285 @@
+"""
+ThothMind Trading Challenge - Candle Store
+===========================================
+Per-ticker, memory-mapped columnar storage for minute candles.
+
+Layout:
+    <store>/manifest.json             - columns, dtypes, per-ticker row counts
+                                        and data directory
+    <store>/data/<TICKER>/<col>.bin   - raw little-endian column values
+    <store>/data/<TICKER>@<n>/...     - generation n, after n rewriting merges
+
+Each ticker's rows are sorted by timestamp with no duplicates. Columns are
+opened with np.memmap, so a store far larger than RAM can be backtested at
+constant memory. Use ingest.py to build or extend a store.
+"""
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from result_cache import atomic_write
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 2
+# Version 1 manifests have no per-ticker 'dir' (always data/<TICKER>)
+READABLE_VERSIONS = (1, 2)
+MANIFEST_NAME = 'manifest.json'
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Same field layout as the backtester's npz input
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', '<M8[s]'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+# Ticker names become directory names
+TICKER_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$')
+
+
+def is_store(path: str) -> bool:
+    """True if `path` is a candle store directory"""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_NAME))
+
+
+class TickerCandles:
+    """
+    Read-only view of one ticker's candles.
+
+    Indexing by column name returns a memory-mapped column; indexing by row
+    number returns that candle as a dict, mirroring a structured array record.
+    """
+
+    def __init__(self, directory: str, rows: int):
+        self.directory = directory
+        self.rows = rows
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            dtype = CANDLE_DTYPE[name]
+            path = os.path.join(self.directory, f'{name}.bin')
+            if self.rows == 0:
+                self._columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(path, dtype=dtype, mode='r', shape=(self.rows,))
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        return {name: self.column(name)[key] for name in COLUMNS}
+
+    def to_array(self) -> np.ndarray:
+        """Materialize as a structured array (loads the ticker into memory)"""
+        array = np.empty(self.rows, dtype=CANDLE_DTYPE)
+        for name in COLUMNS:
+            array[name] = self.column(name)
+        return array
+
+
+class CandleStore:
+    """
+    Reader for a candle store directory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict:
+        with open(os.path.join(self.path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        if manifest.get('version') not in READABLE_VERSIONS:
+            raise ValueError(f"Unsupported candle store version {manifest.get('version')} in {self.path}")
+        return manifest
+
+    def keys(self) -> List[str]:
+        return list(self.manifest['tickers'].keys())
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.manifest['tickers']
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.manifest['tickers'])
+
+    def __getitem__(self, ticker: str) -> TickerCandles:
+        info = self.manifest['tickers'][ticker]
+        return TickerCandles(os.path.join(self.path, 'data', info.get('dir', ticker)), info['rows'])
+
+
+class CandleStoreWriter:
+    """
+    Appends validated candle batches to a store.
+
+    Batches are staged per ticker as they arrive; finalize() then sorts,
+    de-duplicates (the most recently ingested row wins) and merges each
+    touched ticker into its columns. Only one ticker is held in memory at a
+    time, and tickers whose new rows all follow the stored ones are appended
+    in place without rewriting existing data (rows past the manifest's count
+    are invisible to readers). A merge that rewrites a ticker writes a new
+    generation directory instead; the manifest switches to it and the old
+    directory is removed only once the manifest is committed, so a crash at
+    any point leaves the previous data intact.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.staging_dir = os.path.join(path, 'staging')
+        self._staged: Dict[str, int] = {}
+
+        os.makedirs(os.path.join(path, 'data'), exist_ok=True)
+        if is_store(path):
+            self.manifest = CandleStore(path).manifest
+        else:
+            self.manifest = {
+                'version': STORE_VERSION,
+                'columns': {name: CANDLE_DTYPE[name].str for name in COLUMNS},
+                'tickers': {},
+            }
+
+        # Leftovers from an interrupted ingestion are discarded
+        if os.path.isdir(self.staging_dir):
+            shutil.rmtree(self.staging_dir)
+        self._remove_unreferenced_dirs()
+
+    def _data_dir(self, ticker: str) -> str:
+        info = self.manifest['tickers'].get(ticker)
+        return os.path.join(self.path, 'data', info.get('dir', ticker) if info else ticker)
+
+    def _remove_unreferenced_dirs(self):
+        """Drop ticker directories the manifest does not point at (interrupted or superseded writes)"""
+        live = {info.get('dir', ticker) for ticker, info in self.manifest['tickers'].items()}
+        data_root = os.path.join(self.path, 'data')
+        for name in os.listdir(data_root):
+            if name not in live:
+                shutil.rmtree(os.path.join(data_root, name))
+
+    def append(self, ticker: str, candles: np.ndarray):
+        """Stage a batch of candles (structured array of CANDLE_DTYPE) for one ticker"""
+        if len(candles) == 0:
+            return
+        directory = os.path.join(self.staging_dir, ticker)
+        os.makedirs(directory, exist_ok=True)
+        for name in COLUMNS:
+            with open(os.path.join(directory, f'{name}.bin'), 'ab') as f:
+                f.write(np.ascontiguousarray(candles[name]).tobytes())
+        self._staged[ticker] = self._staged.get(ticker, 0) + len(candles)
+
+    def _read_columns(self, directory: str, rows: int) -> np.ndarray:
+        array = np.empty(rows, dtype=CANDLE_DTYPE)
+        for name in COLUMNS:
+            array[name] = np.fromfile(os.path.join(directory, f'{name}.bin'), dtype=CANDLE_DTYPE[name], count=rows)
+        return array
+
+    @staticmethod
+    def _sort_dedupe(candles: np.ndarray) -> np.ndarray:
+        """Sort by timestamp, keeping the last occurrence of each timestamp"""
+        order = np.argsort(candles['timestamp'], kind='stable')
+        candles = candles[order]
+        timestamps = candles['timestamp']
+        keep = np.ones(len(candles), dtype=bool)
+        keep[:-1] = timestamps[1:] != timestamps[:-1]
+        return candles[keep]
+
+    def _write_columns(self, directory: str, candles: np.ndarray, existing_rows: Optional[int] = None):
+        """Rewrite the columns, or append after `existing_rows` committed rows"""
+        os.makedirs(directory, exist_ok=True)
+        for name in COLUMNS:
+            path = os.path.join(directory, f'{name}.bin')
+            payload = np.ascontiguousarray(candles[name]).tobytes()
+            if existing_rows is None:
+                atomic_write(path, payload)
+                continue
+            with open(path, 'r+b') as f:
+                # Drop any tail left by an append that never reached the manifest
+                f.truncate(existing_rows * CANDLE_DTYPE[name].itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _checksum(directory: str) -> str:
+        sha = hashlib.sha256()
+        for name in COLUMNS:
+            with open(os.path.join(directory, f'{name}.bin'), 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+        return sha.hexdigest()
+
+    def finalize(self) -> Dict[str, int]:
+        """Merge all staged batches into the store and write the manifest"""
+        added = {}
+        superseded = []
+        for ticker, staged_rows in sorted(self._staged.items()):
+            staged = self._sort_dedupe(self._read_columns(os.path.join(self.staging_dir, ticker), staged_rows))
+            data_dir = self._data_dir(ticker)
+
+            info = self.manifest['tickers'].get(ticker)
+            existing_rows = info['rows'] if info else 0
+            generation = info.get('generation', 0) if info else 0
+
+            if existing_rows and np.datetime64(info['last']) < staged['timestamp'][0]:
+                # Fast path: strictly newer data is appended in place
+                self._write_columns(data_dir, staged, existing_rows=existing_rows)
+                rows = existing_rows + len(staged)
+                first, last = info['first'], str(staged['timestamp'][-1])
+            else:
+                merged = staged
+                if existing_rows:
+                    existing = self._read_columns(data_dir, existing_rows)
+                    merged = self._sort_dedupe(np.concatenate([existing, staged]))
+                    # Never rewrite live columns: readers keep the old
+                    # generation until the manifest points at the new one
+                    superseded.append(data_dir)
+                    generation += 1
+                    data_dir = os.path.join(self.path, 'data', f'{ticker}@{generation}')
+                    if os.path.isdir(data_dir):
+                        shutil.rmtree(data_dir)
+                self._write_columns(data_dir, merged)
+                rows = len(merged)
+                first, last = str(merged['timestamp'][0]), str(merged['timestamp'][-1])
+
+            self.manifest['tickers'][ticker] = {
+                'rows': rows,
+                'first': first,
+                'last': last,
+                'dir': os.path.basename(data_dir),
+                'generation': generation,
+                'sha256': self._checksum(data_dir),
+            }
+            added[ticker] = rows - existing_rows
+            logger.debug(f"{ticker}: {existing_rows} -> {rows} rows")
+
+        self.manifest['version'] = STORE_VERSION
+        self.manifest['tickers'] = dict(sorted(self.manifest['tickers'].items()))
+        atomic_write(os.path.join(self.path, MANIFEST_NAME),
+                     json.dumps(self.manifest, indent=2).encode())
+
+        # Only now that the manifest points at the new generations
+        for directory in superseded:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        if os.path.isdir(self.staging_dir):
+            shutil.rmtree(self.staging_dir)
+        self._staged = {}
+        return added
+
@@ -73,6 +73,35 @@ VOLUME_SPIKE_THRESHOLD: float = 1.5
 # Legacy parameter kept for compatibility
 MIN_MOMENTUM_SCORE: float = 0.55
 
+# =============================================================================
+# PARALLEL ANALYSIS
+# =============================================================================
+# Worker processes for per-ticker analysis in decide() (0 or 1 = serial)
+PARALLEL_ANALYSIS_WORKERS: int = int(os.environ.get("PARALLEL_ANALYSIS_WORKERS", "0"))
+PARALLEL_ANALYSIS_MIN_TICKERS: int = 32  # Fewer qualifying tickers are analyzed serially
+
+# =============================================================================
+# BACKTEST ROBUSTNESS ANALYSIS
+# =============================================================================
+MONTE_CARLO_RESAMPLES: int = 10000   # Resampled trade sequences per analysis
+MONTE_CARLO_BATCH_SIZE: int = 5000   # Paths simulated per vectorized batch
+RUIN_THRESHOLD_PCT: float = 50.0     # Loss from initial balance counted as ruin
+
+# =============================================================================
+# BACKTEST RESULT CACHE
+# =============================================================================
+BACKTEST_CACHE_DIR: str = os.environ.get("BACKTEST_CACHE_DIR", ".backtest_cache")
+
+# Checkpointing for long runs (0 disables)
+CHECKPOINT_EVERY_MINUTES: int = int(os.environ.get("BACKTEST_CHECKPOINT_EVERY", "0"))
+
+# =============================================================================
+# DECISION JOURNAL
+# =============================================================================
+# Binary journal of every tick and decision made by the live bot ("" disables)
+JOURNAL_PATH: str = os.environ.get("JOURNAL_PATH", "")
+JOURNAL_FSYNC_INTERVAL_S: float = 1.0  # Max seconds between journal fsyncs
+
 # =============================================================================
 # SERVER CONFIGURATION
 # =============================================================================
@@ -80,6 +109,16 @@ SERVER_HOST: str = os.environ.get("HOST", "0.0.0.0")
 SERVER_PORT: int = int(os.environ.get("PORT", "5000"))
 DEBUG_MODE: bool = os.environ.get("DEBUG", "false").lower() == "true"
 
+# Largest request body accepted, before and after Content-Encoding decompression
+MAX_REQUEST_BODY_BYTES: int = int(os.environ.get("MAX_REQUEST_BODY_MB", "128")) * 1024 * 1024
+
+# Run a synthetic decide() at start-up; /ready reports 503 until it finishes
+WARMUP_ENABLED: bool = os.environ.get("WARMUP", "true").lower() == "true"
+
+# ASGI server (asgi_app.py): ticks waiting for the strategy worker beyond this
+# limit are answered with HOLD instead of queueing behind a stale backlog
+ASGI_MAX_PENDING_TICKS: int = int(os.environ.get("ASGI_MAX_PENDING_TICKS", "4"))
+
 # Logging
 LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "INFO")
 LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
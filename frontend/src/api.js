@@ -76,11 +76,13 @@ export const rooms = {
 };
 
 export const messages = {
-  list: (roomId, channelId) =>
+  // Newest page first; pass { before } from the X-Cursor-Before header to load older history.
+  list: (roomId, channelId, page = {}) =>
     API.get('/messages/', {
       params: {
         room: roomId,
         ...(channelId ? { channel: channelId } : {}),
+        ...page,
       },
     }),
   react: (id, emoji) => API.post(`/messages/${id}/react/`, { emoji }),
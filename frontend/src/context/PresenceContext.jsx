@@ -29,7 +29,8 @@ export function PresenceProvider({ children }) {
     if (!token) return;
 
     tokenRef.current = token;
-    const url = `${getWsUrl('/ws/presence/')}?token=${token}`;
+    // batch=1: updates may arrive several per frame, as a JSON array
+    const url = `${getWsUrl('/ws/presence/')}?token=${token}&batch=1`;
     const ws = new WebSocket(url);
     wsRef.current = ws;
 
@@ -40,18 +41,19 @@ export function PresenceProvider({ children }) {
     ws.onmessage = (e) => {
       try {
         const data = JSON.parse(e.data);
-        if (data.type === 'presence_snapshot' && data.presence) {
-          const next = {};
-          for (const [uid, info] of Object.entries(data.presence)) {
-            next[uid] = info.online ? (info.status || 'active') : 'deactive';
+        const next = {};
+        for (const event of Array.isArray(data) ? data : [data]) {
+          if (event.type === 'presence_snapshot' && event.presence) {
+            for (const [uid, info] of Object.entries(event.presence)) {
+              next[uid] = info.online ? (info.status || 'active') : 'deactive';
+            }
+          } else if (event.type === 'presence_update') {
+            const { user_id, status, online } = event;
+            next[String(user_id)] = online ? (status || 'active') : 'deactive';
           }
+        }
+        if (Object.keys(next).length) {
           setPresence((prev) => ({ ...prev, ...next }));
-        } else if (data.type === 'presence_update') {
-          const { user_id, status, online } = data;
-          setPresence((prev) => ({
-            ...prev,
-            [String(user_id)]: online ? (status || 'active') : 'deactive',
-          }));
         }
       } catch (_) {}
     };
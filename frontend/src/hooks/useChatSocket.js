@@ -20,7 +20,8 @@ export function useChatSocket(roomId, token, onMessage) {
   useEffect(() => {
     if (!roomId || !token) return;
 
-    const url = `${getWsUrl(`/ws/chat/${roomId}/`)}?token=${token}`;
+    // batch=1: the server may send several events per frame, as a JSON array
+    const url = `${getWsUrl(`/ws/chat/${roomId}/`)}?token=${token}&batch=1`;
     const ws = new WebSocket(url);
     wsRef.current = ws;
 
@@ -29,7 +30,9 @@ export function useChatSocket(roomId, token, onMessage) {
     ws.onmessage = (e) => {
       try {
         const data = JSON.parse(e.data);
-        onMessageRef.current?.(data);
+        for (const event of Array.isArray(data) ? data : [data]) {
+          onMessageRef.current?.(event);
+        }
       } catch (_) {}
     };
 
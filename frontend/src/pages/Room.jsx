@@ -51,7 +51,15 @@ export default function Room({ type = 'company' }) {
   const [contextMenu, setContextMenu] = useState(null);
   const messagesEndRef = useRef(null);
   const messagesStartRef = useRef(null);
+  const messagesListRef = useRef(null);
   const prevMsgCountRef = useRef(0);
+  // Cursor for the next older page (X-Cursor-Before), null once history is exhausted
+  const [olderCursor, setOlderCursor] = useState(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  // scrollHeight before older messages are prepended, to keep the view in place
+  const prependScrollHeightRef = useRef(null);
+  // Room/channel whose history is shown; older pages for anything else are dropped
+  const historyKeyRef = useRef(null);
 
   const effectiveRoomId = room?.id;
 
@@ -105,13 +113,41 @@ export default function Room({ type = 'company' }) {
   useEffect(() => {
     if (room) {
       const channelIdToUse = type === 'company' ? currentChannelId : null;
-      messages.list(room.id, channelIdToUse).then(({ data }) => {
+      let cancelled = false;
+      historyKeyRef.current = `${room.id}:${channelIdToUse}`;
+      setOlderCursor(null);
+      messages.list(room.id, channelIdToUse).then(({ data, headers }) => {
+        if (cancelled) return;
         const sorted = [...(data || [])].sort((a, b) => new Date(a.created_at) - new Date(b.created_at));
         setMsgList(sorted);
+        setOlderCursor(headers['x-cursor-before'] || null);
       });
+      return () => {
+        cancelled = true;
+      };
     }
   }, [room, type, currentChannelId]);
 
+  const loadOlder = useCallback(() => {
+    if (!room || !olderCursor || loadingOlder) return;
+    const channelIdToUse = type === 'company' ? currentChannelId : null;
+    const historyKey = `${room.id}:${channelIdToUse}`;
+    setLoadingOlder(true);
+    messages
+      .list(room.id, channelIdToUse, { before: olderCursor })
+      .then(({ data, headers }) => {
+        if (historyKeyRef.current !== historyKey) return;
+        prependScrollHeightRef.current = messagesListRef.current?.scrollHeight ?? null;
+        setMsgList((prev) => {
+          const seen = new Set(prev.map((m) => m.id));
+          const older = (data || []).filter((m) => !seen.has(m.id));
+          return [...older, ...prev];
+        });
+        setOlderCursor(headers['x-cursor-before'] || null);
+      })
+      .finally(() => setLoadingOlder(false));
+  }, [room, type, currentChannelId, olderCursor, loadingOlder]);
+
   useEffect(() => {
     const handler = (e) => {
       if (!room || type !== 'company') return;
@@ -146,19 +182,44 @@ export default function Room({ type = 'company' }) {
       window.dispatchEvent(new CustomEvent('room-activity', { detail: { roomId: room?.id, type, contactUserId } }));
     } else if (data.type === 'message_updated' || data.type === 'message_edited') {
       if (data.message) {
-        setMsgList((prev) => prev.map((m) => (m.id === data.message.id ? { ...data.message, isNew: m.isNew } : m)));
+        setMsgList((prev) =>
+          prev.map((m) =>
+            m.id === data.message.id
+              ? { ...data.message, my_reactions: data.message.my_reactions ?? m.my_reactions, isNew: m.isNew }
+              : m
+          )
+        );
       }
+    } else if (data.type === 'reactions') {
+      // Batched per room: current counts per message plus who changed what
+      const counts = data.reactions || {};
+      const changes = data.changes || [];
+      setMsgList((prev) =>
+        prev.map((m) => {
+          if (!(String(m.id) in counts)) return m;
+          let mine = m.my_reactions || [];
+          changes.forEach((c) => {
+            if (c.message_id !== m.id || c.user_id !== user?.id) return;
+            mine = c.added ? [...mine.filter((e) => e !== c.emoji), c.emoji] : mine.filter((e) => e !== c.emoji);
+          });
+          return { ...m, reactions: counts[String(m.id)], my_reactions: mine };
+        })
+      );
     } else if (data.type === 'message_deleted') {
       const deletedId = data.message_id ?? data.id ?? data.message?.id;
       if (deletedId) {
         setMsgList((prev) => prev.filter((m) => m.id !== deletedId));
       }
-    } else if (data.type === 'typing') {
-      if (data.user?.id === user?.id) return; // Don't show typing state for self (only on receiver side)
+    } else if (data.type === 'typing' || data.type === 'typing_batch') {
+      // typing_batch carries every typing change in the room since the last frame
+      const changes = data.type === 'typing' ? [data] : data.changes || [];
       setTypingUsers((prev) => {
         const next = new Set(prev);
-        if (data.typing) next.add(data.user?.username);
-        else next.delete(data.user?.username);
+        changes.forEach((c) => {
+          if (c.user?.id === user?.id) return; // Don't show typing state for self (only on receiver side)
+          if (c.typing) next.add(c.user?.username);
+          else next.delete(c.user?.username);
+        });
         return next;
       });
     } else if (data.type === 'user_joined') {
@@ -170,14 +231,30 @@ export default function Room({ type = 'company' }) {
       setPresence((prev) => prev.filter((u) => u?.id !== data.user?.id));
     } else if (data.type === 'message_read') {
       const ids = data.message_ids || [];
-      const readerId = data.user?.id;
-      if (ids.length && readerId) {
+      const markers = data.markers || [];
+      const reader = data.user;
+      if ((ids.length || markers.length) && reader?.id) {
+        // A marker newly covers every message after its previous position in its channel
+        const covered = (m) =>
+          ids.includes(m.id) ||
+          markers.some(
+            (mk) =>
+              (m.channel ?? null) === (mk.channel_id ?? null) &&
+              m.id > (mk.previous_message_id || 0) &&
+              m.id <= mk.last_read_message_id
+          );
         setMsgList((prev) =>
           prev.map((m) => {
-            if (!ids.includes(m.id)) return m;
+            if (m.sender?.id === reader.id || !covered(m)) return m;
             const readBy = m.read_by || [];
-            if (readBy.includes(readerId)) return m;
-            return { ...m, read_by: [...readBy, readerId] };
+            if (readBy.includes(reader.id)) return m;
+            const readers = m.readers || [];
+            return {
+              ...m,
+              read_by: [...readBy, reader.id],
+              read_count: (m.read_count || 0) + 1,
+              readers: readers.length < 3 ? [...readers, { id: reader.id, username: reader.username }] : readers,
+            };
           })
         );
       }
@@ -240,7 +317,12 @@ export default function Room({ type = 'company' }) {
   }, []);
 
   useEffect(() => {
-    if (msgList.length > prevMsgCountRef.current && prevMsgCountRef.current > 0) {
+    if (prependScrollHeightRef.current !== null) {
+      // Older history was prepended: keep the same messages in view
+      const list = messagesListRef.current;
+      if (list) list.scrollTop += list.scrollHeight - prependScrollHeightRef.current;
+      prependScrollHeightRef.current = null;
+    } else if (msgList.length > prevMsgCountRef.current && prevMsgCountRef.current > 0) {
       messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
     } else if (msgList.length > 0 && prevMsgCountRef.current === 0) {
       messagesEndRef.current?.scrollIntoView({ behavior: 'auto' });
@@ -562,8 +644,13 @@ export default function Room({ type = 'company' }) {
           <div className="messages-panel-decorative">
             <DecorativeSvg variant="compact" />
           </div>
-          <div className="messages-list">
+          <div className="messages-list" ref={messagesListRef}>
             <div ref={messagesStartRef} />
+            {olderCursor && (
+              <button type="button" className="btn-outline btn-sm messages-load-older" onClick={loadOlder} disabled={loadingOlder}>
+                {loadingOlder ? 'Loading…' : 'Load older messages'}
+              </button>
+            )}
             {msgList.length === 0 && !typingUsers.size && (
               <div className="chat-empty-state">
                 <div className="chat-empty-illustrations">
@@ -643,10 +730,8 @@ export default function Room({ type = 'company' }) {
                         </div>
                         {hasReactions && (
                           <div className="message-reactions">
-                            {Object.entries(reactions).map(([emoji, userIds]) => {
-                              const ids = Array.isArray(userIds) ? userIds : [];
-                              const mine = user && ids.includes(user.id);
-                              const count = ids.length;
+                            {Object.entries(reactions).map(([emoji, count]) => {
+                              const mine = (msg.my_reactions || []).includes(emoji);
                               if (!emoji || !count) return null;
                               return (
                                 <button
@@ -0,0 +1,380 @@
+"""
+ThothMind Trading Challenge - Endpoint Handlers
+================================================
+Framework-independent implementation of the bot's HTTP contract.
+
+Each handler takes the parsed JSON body (or None) and returns a
+(response_body, status_code) pair. app.py (Flask) and asgi_app.py (ASGI)
+are thin adapters over these functions and share the strategy instance
+and request counters defined here.
+"""
+import json
+import time
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import config
+from journal import DecisionJournal
+from strategy import TradingStrategy
+
+logger = logging.getLogger(__name__)
+
+Reply = Tuple[Dict[str, Any], int]
+
+# Initialize strategy
+strategy = TradingStrategy()
+
+# Durable record of ticks and decisions (JOURNAL_PATH)
+journal: Optional[DecisionJournal] = None
+if config.JOURNAL_PATH:
+    journal = DecisionJournal(config.JOURNAL_PATH)
+    atexit.register(journal.close)
+
+# Request counter for monitoring
+request_count = {
+    'health': 0,
+    'reset': 0,
+    'start': 0,
+    'tick': 0,
+    'end': 0,
+    'errors': 0
+}
+
+VALID_ACTIONS = ('HOLD', 'OPEN_LONG', 'OPEN_SHORT', 'CLOSE')
+
+# Set once start-up warm-up has finished (or was skipped)
+ready = threading.Event()
+_warm_up_started = False
+_warm_up_lock = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+def check_api_key(api_key: Optional[str]) -> Optional[Reply]:
+    """
+    Validate the X-API-Key header value.
+    Returns a 401 reply if the key is missing or invalid, otherwise None.
+    """
+    if not api_key:
+        logger.warning("Request missing X-API-Key header")
+        request_count['errors'] += 1
+        return {'error': 'Unauthorized'}, 401
+
+    if api_key != config.API_KEY:
+        logger.warning(f"Invalid API key attempted: {api_key[:10]}...")
+        request_count['errors'] += 1
+        return {'error': 'Unauthorized'}, 401
+
+    return None
+
+
+def handle_error(e: Exception) -> Reply:
+    """Reply for an exception that escaped a handler"""
+    logger.exception(f"Unhandled exception: {e}")
+    request_count['errors'] += 1
+    return {'error': 'Internal server error', 'message': str(e)}, 500
+
+
+def handle_health() -> Reply:
+    """
+    Health check endpoint.
+    Called periodically to verify the solution is running.
+    """
+    request_count['health'] += 1
+    logger.debug("Health check requested")
+
+    return {
+        'status': 'ok',
+        'timestamp': _now(),
+        'request_counts': request_count
+    }, 200
+
+
+def warm_up():
+    """
+    Pay one-time first-tick costs before real traffic arrives: lazy imports,
+    numpy's first allocations, the decide() code paths for both a flat and
+    an open position, and JSON encoding of a large payload.
+
+    Uses a separate TradingStrategy so the live strategy's state is never
+    touched, even if a real tick arrives while this runs.
+    """
+    from synthetic import make_tick_payload
+
+    started = time.perf_counter()
+    num_tickers = 10
+    if strategy.parallel is not None:
+        num_tickers = max(num_tickers, strategy.parallel.min_tickers)
+
+    scratch = TradingStrategy()
+    scratch.parallel = strategy.parallel  # starts the worker pool, if enabled
+    for with_position in (False, True):
+        payload = make_tick_payload(seed=0, num_tickers=num_tickers, with_position=with_position)
+        json.loads(json.dumps(payload))
+        scratch.decide(payload)
+
+    logger.info(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def start_warm_up():
+    """
+    Run warm_up() in the background and mark the app ready when done.
+    Safe to call repeatedly: only the first call starts anything.
+    """
+    global _warm_up_started
+    with _warm_up_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started = True
+    if not config.WARMUP_ENABLED:
+        ready.set()
+        return
+
+    def run():
+        try:
+            warm_up()
+        except Exception as e:
+            logger.exception(f"Warm-up failed, serving cold: {e}")
+        finally:
+            ready.set()
+
+    threading.Thread(target=run, name='warm-up', daemon=True).start()
+
+
+def handle_ready() -> Reply:
+    """Readiness endpoint: 503 until warm-up has finished"""
+    if ready.is_set():
+        return {'status': 'ready'}, 200
+    return {'status': 'warming_up'}, 503
+
+
+def handle_reset(data: Optional[Dict]) -> Reply:
+    """
+    Reset endpoint.
+    Clears all stored data and returns to initial state.
+    """
+    request_count['reset'] += 1
+
+    try:
+        data = data or {}
+        reason = data.get('reason', 'No reason provided')
+
+        logger.info(f"Reset requested: {reason}")
+
+        # Reset strategy state
+        strategy.reset()
+        if journal:
+            journal.record_reset(reason)
+
+        # Reset request counters (except this one)
+        for key in request_count:
+            if key != 'reset':
+                request_count[key] = 0
+
+        return {
+            'status': 'reset_complete',
+            'timestamp': _now()
+        }, 200
+
+    except Exception as e:
+        logger.exception(f"Error during reset: {e}")
+        return {
+            'status': 'reset_complete',
+            'warning': str(e)
+        }, 200
+
+
+def handle_start(data: Optional[Dict]) -> Reply:
+    """
+    Start of trading day endpoint.
+    Called at 08:00 UTC each trading day.
+    """
+    request_count['start'] += 1
+
+    try:
+        if not data:
+            logger.warning("Start called with no data")
+            return {'status': 'ready'}, 200
+
+        day = data.get('day', 0)
+        date = data.get('date', '')
+        initial_balance = data.get('initial_balance', config.INITIAL_BALANCE)
+
+        logger.info(f"=== DAY {day} START ({date}) === Balance: ${initial_balance:.2f}")
+
+        # Initialize strategy for the day
+        strategy.start_day(day, date, initial_balance)
+        if journal:
+            journal.record_start(day, date, initial_balance)
+
+        return {
+            'status': 'ready',
+            'day': day,
+            'date': date
+        }, 200
+
+    except Exception as e:
+        logger.exception(f"Error in start: {e}")
+        return {'status': 'ready'}, 200
+
+
+def handle_tick(data: Optional[Dict]) -> Reply:
+    """
+    Main trading tick endpoint.
+    Called every minute with market data.
+    Returns trading decision.
+    """
+    request_count['tick'] += 1
+
+    try:
+        if not data:
+            logger.warning("Tick called with no data")
+            return {'action': 'HOLD'}, 200
+
+        minute_of_day = data.get('minute_of_day', 0)
+
+        # Log periodically (every 60 minutes)
+        if minute_of_day % 60 == 0:
+            account = data.get('account', {})
+            position = data.get('position', {})
+            logger.info(
+                f"Tick {minute_of_day}/1440 | "
+                f"Balance: ${account.get('balance', 0):.2f} | "
+                f"Equity: ${account.get('equity', 0):.2f} | "
+                f"Position: {position.get('ticker', 'None') if position.get('is_open') else 'None'}"
+            )
+
+        # Get trading decision from strategy
+        started = time.perf_counter()
+        decision = strategy.decide(data)
+        if journal:
+            decide_us = (time.perf_counter() - started) * 1e6
+            journal.record_tick(data, decision, strategy.last_analyses, decide_us)
+
+        # Validate decision
+        action = decision.get('action', 'HOLD')
+
+        if action not in VALID_ACTIONS:
+            logger.warning(f"Invalid action from strategy: {action}, defaulting to HOLD")
+            return {'action': 'HOLD'}, 200
+
+        # Build response based on action type
+        response = {'action': action}
+
+        if action in ['OPEN_LONG', 'OPEN_SHORT']:
+            # Validate required fields for opening positions
+            ticker = decision.get('ticker')
+            leverage = decision.get('leverage', config.DEFAULT_LEVERAGE)
+            size_pct = decision.get('size_pct', config.DEFAULT_SIZE_PCT)
+
+            # Validate ticker is in qualifying list
+            qualifying = data.get('qualifying_tickers', [])
+            if ticker not in qualifying:
+                logger.warning(f"Ticker {ticker} not in qualifying list, defaulting to HOLD")
+                return {'action': 'HOLD'}, 200
+
+            # Validate leverage
+            leverage = max(config.MIN_LEVERAGE, min(leverage, config.MAX_LEVERAGE))
+
+            # Validate size
+            size_pct = max(config.MIN_SIZE_PCT, min(size_pct, config.MAX_SIZE_PCT))
+
+            response['ticker'] = ticker
+            response['leverage'] = leverage
+            response['size_pct'] = size_pct
+
+            if 'reason' in decision:
+                response['reason'] = decision['reason']
+
+            logger.info(
+                f"ACTION: {action} {ticker} | "
+                f"Leverage: {leverage}x | Size: {size_pct}%"
+            )
+
+        elif action == 'CLOSE':
+            if 'reason' in decision:
+                response['reason'] = decision['reason']
+            logger.info(f"ACTION: CLOSE | Reason: {decision.get('reason', 'N/A')}")
+
+        return response, 200
+
+    except Exception as e:
+        logger.exception(f"Error in tick: {e}")
+        # Safety: return HOLD on any error
+        return {'action': 'HOLD'}, 200
+
+
+def handle_end(data: Optional[Dict]) -> Reply:
+    """
+    End of trading day endpoint.
+    Called at 24:00 UTC. Any open position is force-closed before this call.
+    """
+    request_count['end'] += 1
+
+    try:
+        if not data:
+            logger.warning("End called with no data")
+            return {'status': 'done'}, 200
+
+        day = data.get('day', 0)
+        date = data.get('date', '')
+        final_balance = data.get('final_balance', 0)
+        daily_pnl = data.get('daily_pnl', 0)
+        trades_today = data.get('trades_today', 0)
+
+        logger.info(
+            f"=== DAY {day} END ({date}) === "
+            f"Final: ${final_balance:.2f} | "
+            f"PnL: ${daily_pnl:+.2f} | "
+            f"Trades: {trades_today}"
+        )
+
+        # Notify strategy of day end
+        strategy.end_day(day, final_balance, daily_pnl)
+        if journal:
+            journal.record_end(day, final_balance, daily_pnl, trades_today)
+
+        return {
+            'status': 'done',
+            'day': day,
+            'final_balance': final_balance,
+            'daily_pnl': daily_pnl
+        }, 200
+
+    except Exception as e:
+        logger.exception(f"Error in end: {e}")
+        return {'status': 'done'}, 200
+
+
+def handle_index() -> Reply:
+    """Root endpoint - basic info"""
+    return {
+        'name': 'ThothMind Trading Bot',
+        'version': '1.0.0',
+        'status': 'running',
+        'endpoints': [
+            'GET /health',
+            'GET /ready',
+            'POST /reset',
+            'POST /start',
+            'POST /tick',
+            'POST /end'
+        ]
+    }, 200
+
+
+def handle_stats() -> Reply:
+    """Statistics endpoint for monitoring"""
+    return {
+        'request_counts': request_count,
+        'uptime': 'N/A',  # Could track actual uptime
+        'strategy_state': {
+            'has_state': bool(strategy.state),
+            'current_day': strategy.state.get('day', None)
+        }
+    }, 200
@@ -0,0 +1,214 @@
+"""
+ThothMind Trading Challenge - Dataset Ingestion
+================================================
+Stream large candle dumps into a memory-mapped candle store.
+
+Input formats:
+- CSV with a header containing: ticker, timestamp, open, high, low, close, volume
+- JSON lines, one object per candle with the same keys, or one
+  [timestamp, open, high, low, close, volume] array per line (requires --ticker)
+
+The ticker column may be omitted when --ticker is given. Timestamps may be
+ISO-8601 strings or epoch seconds/milliseconds (UTC).
+
+Rows are read in chunks, validated, staged per ticker, then sorted and
+de-duplicated by timestamp when the store is finalized. Running ingest again
+on an existing store merges the new data in.
+
+Usage:
+    python ingest.py dump1.csv dump2.jsonl --store candles/
+    python ingest.py btc.jsonl --ticker BTCUSDT --store candles/
+
+Then backtest with:
+    python backtester.py --data candles/
+"""
+import os
+import csv
+import sys
+import json
+import logging
+import argparse
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from candle_store import CANDLE_DTYPE, TICKER_PATTERN, CandleStoreWriter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Epoch values above this are treated as milliseconds
+_EPOCH_MS_THRESHOLD = 1e11
+
+Row = Tuple[str, object, float, float, float, float, float]
+
+
+class IngestStats:
+    """Counters reported at the end of an ingestion"""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_invalid = 0
+        self.rows_staged = 0
+
+    def __repr__(self):
+        return (f"IngestStats(read={self.rows_read}, invalid={self.rows_invalid}, "
+                f"staged={self.rows_staged})")
+
+
+def _parse_timestamp(value) -> np.datetime64:
+    """ISO string or epoch seconds/milliseconds -> datetime64[s]"""
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace('.', '', 1).isdigit()):
+        epoch = float(value)
+        if epoch > _EPOCH_MS_THRESHOLD:
+            epoch /= 1000
+        return np.datetime64(int(epoch), 's')
+
+    text = str(value).strip()
+    if text.endswith('Z'):
+        text = text[:-1]
+    elif text.endswith('+00:00'):
+        text = text[:-6]
+    return np.datetime64(text).astype('datetime64[s]')
+
+
+def _read_csv(path: str, ticker: Optional[str]) -> Iterator[Optional[Row]]:
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield _record_to_row(record, ticker)
+
+
+def _read_jsonl(path: str, ticker: Optional[str]) -> Iterator[Optional[Row]]:
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield None
+                continue
+
+            if isinstance(record, list):
+                # Same layout as the /tick history candles
+                if ticker is None or len(record) < 6:
+                    yield None
+                    continue
+                record = dict(zip(('timestamp',) + PRICE_FIELDS, record))
+            yield _record_to_row(record, ticker)
+
+
+def _record_to_row(record: Dict, ticker: Optional[str]) -> Optional[Row]:
+    """Parse one raw record; None if it is malformed"""
+    try:
+        name = ticker or record['ticker']
+        if not TICKER_PATTERN.match(name):
+            return None
+        return (
+            name,
+            _parse_timestamp(record['timestamp']),
+            *(float(record[field]) for field in PRICE_FIELDS)
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _validate(candles: np.ndarray) -> np.ndarray:
+    """Mask of candles with finite, positive, internally consistent values"""
+    prices = np.stack([candles[f] for f in PRICE_FIELDS])
+    valid = np.all(np.isfinite(prices), axis=0)
+    valid &= ~np.isnat(candles['timestamp'])
+    valid &= (candles['open'] > 0) & (candles['close'] > 0) & (candles['low'] > 0)
+    valid &= candles['volume'] >= 0
+    valid &= candles['high'] >= np.maximum(candles['open'], candles['close'])
+    valid &= candles['low'] <= np.minimum(candles['open'], candles['close'])
+    return valid
+
+
+def _flush(writer: CandleStoreWriter, rows: List[Row], stats: IngestStats):
+    """Validate one chunk and stage it per ticker"""
+    tickers = np.array([r[0] for r in rows])
+    candles = np.empty(len(rows), dtype=CANDLE_DTYPE)
+    candles['timestamp'] = [r[1] for r in rows]
+    for i, field in enumerate(PRICE_FIELDS, start=2):
+        candles[field] = [r[i] for r in rows]
+
+    valid = _validate(candles)
+    stats.rows_invalid += int(np.count_nonzero(~valid))
+    tickers, candles = tickers[valid], candles[valid]
+
+    # Group by ticker preserving input order within each group
+    order = np.argsort(tickers, kind='stable')
+    tickers, candles = tickers[order], candles[order]
+    names, starts = np.unique(tickers, return_index=True)
+    bounds = list(starts) + [len(tickers)]
+    for name, lo, hi in zip(names, bounds[:-1], bounds[1:]):
+        writer.append(str(name), candles[lo:hi])
+    stats.rows_staged += len(candles)
+
+
+def ingest(sources: List[str], store_path: str, ticker: Optional[str] = None,
+           chunk_rows: int = 200_000, fmt: Optional[str] = None) -> IngestStats:
+    """Stream `sources` into the store at `store_path`"""
+    writer = CandleStoreWriter(store_path)
+    stats = IngestStats()
+
+    for source in sources:
+        source_fmt = fmt or ('jsonl' if source.endswith(('.jsonl', '.json', '.ndjson')) else 'csv')
+        reader = _read_jsonl if source_fmt == 'jsonl' else _read_csv
+        logger.info(f"Ingesting {source} ({source_fmt})...")
+
+        chunk: List[Row] = []
+        for row in reader(source, ticker):
+            stats.rows_read += 1
+            if row is None:
+                stats.rows_invalid += 1
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                _flush(writer, chunk, stats)
+                chunk = []
+        if chunk:
+            _flush(writer, chunk, stats)
+
+    logger.info("Sorting, de-duplicating and merging staged rows...")
+    added = writer.finalize()
+    for name, count in added.items():
+        logger.debug(f"  {name}: {count:+d} rows")
+
+    logger.info(
+        f"Ingested {stats.rows_read} rows: {stats.rows_invalid} invalid, "
+        f"{stats.rows_staged - sum(added.values())} duplicate, "
+        f"{sum(added.values())} new across {len(added)} tickers"
+    )
+    return stats
+
+
+def main():
+    """Run ingestion"""
+    parser = argparse.ArgumentParser(description='Ingest candle dumps into a memory-mapped candle store')
+    parser.add_argument('sources', nargs='+', help='CSV or JSON-lines candle files')
+    parser.add_argument('--store', required=True, help='Candle store directory (created if missing)')
+    parser.add_argument('--ticker', help='Ticker for files without a ticker column')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (default: by extension)')
+    parser.add_argument('--chunk-rows', type=int, default=200_000, help='Rows validated per chunk')
+
+    args = parser.parse_args()
+
+    missing = [s for s in args.sources if not os.path.exists(s)]
+    if missing:
+        parser.error(f"No such file: {', '.join(missing)}")
+
+    ingest(args.sources, args.store, ticker=args.ticker, chunk_rows=args.chunk_rows, fmt=args.format)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,522 @@
+"""
+ThothMind Trading Challenge - Decision Journal
+===============================================
+Append-only binary record of everything the live bot saw and decided.
+
+File layout:
+    header:  b'TMJ1'
+    records: <type u8><payload length u32><crc32 u32><payload>
+
+Record types are TICK, START, END and RESET. A tick record holds the tick
+timestamp and clock, account and position state, every qualifying ticker
+with its 24h change and analysis scores, the strategy's decision and how
+long decide() took. A torn record at the end of the file (crash mid-write)
+is detected by its length or CRC and ignored.
+
+The request thread copies the journaled fields (a few hundred bytes per
+qualifying ticker, never the candle history) into an in-memory queue; a
+background thread encodes records, writes them through a buffered file and
+fsyncs at most every `fsync_interval` seconds.
+
+Usage:
+    python journal.py dump journal.bin [--limit 20]
+    python journal.py replay journal.bin --data december_2025_dataset.npz
+
+Replay rebuilds each tick's market data and history from the dataset, runs
+it through a fresh TradingStrategy (including start/end/reset calls) and
+reports any decision that differs from the journaled one.
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import logging
+import argparse
+import threading
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TMJ1'
+
+REC_TICK = 1
+REC_START = 2
+REC_END = 3
+REC_RESET = 4
+RECORD_NAMES = {REC_TICK: 'tick', REC_START: 'start', REC_END: 'end', REC_RESET: 'reset'}
+
+ACTIONS = ('HOLD', 'OPEN_LONG', 'OPEN_SHORT', 'CLOSE')
+SIDES = ('', 'LONG', 'SHORT')
+
+_RECORD = struct.Struct('<BII')
+_STR = struct.Struct('<I')
+_TICK_CLOCK = struct.Struct('<dfHHHddd')      # wall time, decide µs, day, minute, remaining, account
+_POSITION = struct.Struct('<BBdddddd')        # is_open, side, entry, size, leverage, price, pnl, pnl %
+_DECISION = struct.Struct('<BHH')             # action, leverage, size_pct
+_COUNT = struct.Struct('<I')
+_START = struct.Struct('<dHd')                # wall time, day, initial balance
+_END = struct.Struct('<dHddI')                # wall time, day, final balance, pnl, trades
+_WALL = struct.Struct('<d')
+
+# Per-ticker float columns stored after the names
+TICKER_FIELDS = ('change_24h_pct', 'long_score', 'short_score', 'confidence')
+
+# Records waiting for the writer thread before new ones are dropped. Tick
+# records hold only the journaled fields, so this bounds memory as well.
+MAX_PENDING = 10000
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+def _pack_str(value: Optional[str]) -> bytes:
+    raw = (value or '').encode()
+    return _STR.pack(len(raw)) + raw
+
+
+def _encode_tick(wall: float, data: Dict, decision: Dict, analyses: Dict, decide_us: float) -> bytes:
+    account = data.get('account', {})
+    position = data.get('position', {})
+    market_data = data.get('market_data', {})
+    tickers = data.get('qualifying_tickers', [])
+
+    parts = [
+        _TICK_CLOCK.pack(
+            wall, decide_us,
+            data.get('day', 0), data.get('minute_of_day', 0), data.get('minutes_remaining', 0),
+            account.get('balance', 0.0), account.get('equity', 0.0), account.get('unrealized_pnl', 0.0)
+        ),
+        _pack_str(data.get('timestamp', '')),
+    ]
+
+    is_open = bool(position.get('is_open', False))
+    side = position.get('side', '')
+    parts.append(_POSITION.pack(
+        is_open, SIDES.index(side) if side in SIDES else 0,
+        position.get('entry_price', 0.0), position.get('size', 0.0), position.get('leverage', 0),
+        position.get('current_price', 0.0), position.get('unrealized_pnl', 0.0),
+        position.get('unrealized_pnl_pct', 0.0)
+    ))
+    parts.append(_pack_str(position.get('ticker', '') if is_open else ''))
+    parts.append(_pack_str(str(position.get('entry_time', '')) if is_open else ''))
+
+    action = decision.get('action', 'HOLD')
+    parts.append(_DECISION.pack(
+        ACTIONS.index(action) if action in ACTIONS else 0,
+        int(decision.get('leverage', 0) or 0), int(decision.get('size_pct', 0) or 0)
+    ))
+    parts.append(_pack_str(decision.get('ticker', '')))
+    parts.append(_pack_str(decision.get('reason', '')))
+
+    nan = float('nan')
+    values = array('d')
+    signals = array('b')
+    for ticker in tickers:
+        analysis = analyses.get(ticker)
+        change = market_data.get(ticker, {}).get('change_24h_pct', nan)
+        if analysis is None:
+            values.extend((change, nan, nan, nan))
+            signals.append(0)
+        else:
+            values.extend((change, analysis.long_score, analysis.short_score, analysis.confidence))
+            signals.append(analysis.signal.value)
+
+    parts.append(_COUNT.pack(len(tickers)))
+    parts.append(_pack_str('\n'.join(tickers)))
+    parts.append(values.tobytes())
+    parts.append(signals.tobytes())
+    return b''.join(parts)
+
+
+def _journaled_tick(data: Dict, analyses: Dict) -> Tuple[Dict, Dict]:
+    """
+    The parts of a /tick payload and its analyses that _encode_tick reads.
+    Queued instead of the payload itself, which carries the full candle
+    history and can be several MB.
+    """
+    tickers = list(data.get('qualifying_tickers', []))
+    market_data = data.get('market_data', {})
+    slim = {
+        'day': data.get('day', 0),
+        'minute_of_day': data.get('minute_of_day', 0),
+        'minutes_remaining': data.get('minutes_remaining', 0),
+        'timestamp': data.get('timestamp', ''),
+        'account': dict(data.get('account', {})),
+        'position': dict(data.get('position', {})),
+        'qualifying_tickers': tickers,
+        'market_data': {
+            ticker: {'change_24h_pct': market_data[ticker]['change_24h_pct']}
+            for ticker in tickers
+            if 'change_24h_pct' in market_data.get(ticker, {})
+        },
+    }
+    return slim, {ticker: analyses[ticker] for ticker in tickers if ticker in analyses}
+
+
+class _Cursor:
+    """Sequential reader over one record payload"""
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.payload, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def string(self) -> str:
+        (length,) = self.unpack(_STR)
+        value = self.payload[self.offset:self.offset + length].decode()
+        self.offset += length
+        return value
+
+    def raw(self, length: int) -> bytes:
+        value = self.payload[self.offset:self.offset + length]
+        self.offset += length
+        return value
+
+
+def _decode_tick(payload: bytes) -> Dict[str, Any]:
+    cur = _Cursor(payload)
+    wall, decide_us, day, minute, remaining, balance, equity, unrealized = cur.unpack(_TICK_CLOCK)
+    timestamp = cur.string()
+
+    is_open, side, entry, size, leverage, price, pnl, pnl_pct = cur.unpack(_POSITION)
+    position_ticker = cur.string()
+    entry_time = cur.string()
+    position: Dict[str, Any] = {'is_open': bool(is_open)}
+    if is_open:
+        position.update({
+            'ticker': position_ticker,
+            'side': SIDES[side],
+            'entry_price': entry,
+            'entry_time': entry_time,
+            'size': size,
+            'leverage': leverage,
+            'current_price': price,
+            'unrealized_pnl': pnl,
+            'unrealized_pnl_pct': pnl_pct,
+        })
+
+    action, dec_leverage, dec_size = cur.unpack(_DECISION)
+    decision: Dict[str, Any] = {'action': ACTIONS[action]}
+    dec_ticker = cur.string()
+    reason = cur.string()
+    if ACTIONS[action] in ('OPEN_LONG', 'OPEN_SHORT'):
+        decision.update({'ticker': dec_ticker, 'leverage': dec_leverage, 'size_pct': dec_size})
+    if reason:
+        decision['reason'] = reason
+
+    (count,) = cur.unpack(_COUNT)
+    names = cur.string().split('\n') if count else []
+    values = array('d')
+    values.frombytes(cur.raw(count * len(TICKER_FIELDS) * values.itemsize))
+    signals = array('b')
+    signals.frombytes(cur.raw(count))
+
+    tickers = []
+    for i, name in enumerate(names):
+        row = dict(zip(TICKER_FIELDS, values[i * len(TICKER_FIELDS):(i + 1) * len(TICKER_FIELDS)]))
+        row['ticker'] = name
+        row['signal'] = signals[i]
+        tickers.append(row)
+
+    return {
+        'type': 'tick',
+        'wall_time': wall,
+        'decide_us': decide_us,
+        'timestamp': timestamp,
+        'day': day,
+        'minute_of_day': minute,
+        'minutes_remaining': remaining,
+        'account': {'balance': balance, 'equity': equity, 'unrealized_pnl': unrealized},
+        'position': position,
+        'decision': decision,
+        'tickers': tickers,
+    }
+
+
+def _decode(kind: int, payload: bytes) -> Dict[str, Any]:
+    if kind == REC_TICK:
+        return _decode_tick(payload)
+    cur = _Cursor(payload)
+    if kind == REC_START:
+        wall, day, initial_balance = cur.unpack(_START)
+        return {'type': 'start', 'wall_time': wall, 'day': day, 'date': cur.string(),
+                'initial_balance': initial_balance}
+    if kind == REC_END:
+        wall, day, final_balance, daily_pnl, trades = cur.unpack(_END)
+        return {'type': 'end', 'wall_time': wall, 'day': day, 'final_balance': final_balance,
+                'daily_pnl': daily_pnl, 'trades_today': trades}
+    (wall,) = cur.unpack(_WALL)
+    return {'type': 'reset', 'wall_time': wall, 'reason': cur.string()}
+
+
+# =============================================================================
+# WRITER
+# =============================================================================
+class DecisionJournal:
+    """
+    Buffered, background-flushed journal writer.
+
+    record_*() calls copy what they journal and return; encoding and I/O
+    happen on the writer thread. Analysis objects are kept by reference and
+    must not be mutated afterwards (the strategy creates new ones per tick).
+    """
+
+    def __init__(self, path: str, fsync_interval: float = config.JOURNAL_FSYNC_INTERVAL_S,
+                 buffer_size: int = 1 << 20):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.dropped = 0
+        self.written = 0
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'ab', buffering=buffer_size)
+        if new_file:
+            self._file.write(MAGIC)
+
+        self._pending: deque = deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='journal-writer', daemon=True)
+        self._thread.start()
+        logger.info(f"Decision journal: {path}")
+
+    # -------------------------------------------------------------------------
+    # Hot path
+    # -------------------------------------------------------------------------
+    def _enqueue(self, item: tuple):
+        if self._closed:
+            return
+        if len(self._pending) >= MAX_PENDING:
+            self.dropped += 1
+            return
+        self._pending.append(item)
+
+    def record_tick(self, data: Dict, decision: Dict, analyses: Dict, decide_us: float):
+        slim, slim_analyses = _journaled_tick(data, analyses)
+        self._enqueue((REC_TICK, time.time(), slim, dict(decision), slim_analyses, decide_us))
+
+    def record_start(self, day: int, date: str, initial_balance: float):
+        self._enqueue((REC_START, time.time(), day, date, initial_balance))
+
+    def record_end(self, day: int, final_balance: float, daily_pnl: float, trades_today: int):
+        self._enqueue((REC_END, time.time(), day, final_balance, daily_pnl, trades_today))
+
+    def record_reset(self, reason: str):
+        self._enqueue((REC_RESET, time.time(), reason))
+        # Resets are rare and mark a session boundary worth persisting promptly
+        self._wake.set()
+
+    # -------------------------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _encode(item: tuple) -> bytes:
+        kind, wall = item[0], item[1]
+        if kind == REC_TICK:
+            return _encode_tick(wall, *item[2:])
+        if kind == REC_START:
+            day, date, initial_balance = item[2:]
+            return _START.pack(wall, day, initial_balance) + _pack_str(date)
+        if kind == REC_END:
+            day, final_balance, daily_pnl, trades_today = item[2:]
+            return _END.pack(wall, day, final_balance, daily_pnl, trades_today)
+        return _WALL.pack(wall) + _pack_str(item[2])
+
+    def _drain(self):
+        while self._pending:
+            item = self._pending.popleft()
+            try:
+                payload = self._encode(item)
+            except Exception as e:
+                logger.warning(f"Could not encode journal record: {e}")
+                continue
+            self._file.write(_RECORD.pack(item[0], len(payload), zlib.crc32(payload)))
+            self._file.write(payload)
+            self.written += 1
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.fsync_interval)
+            self._wake.clear()
+            try:
+                self._drain()
+                self._sync()
+            except OSError as e:
+                logger.error(f"Journal write failed: {e}")
+
+    def close(self):
+        """Write everything pending and fsync"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._drain()
+        self._sync()
+        self._file.close()
+        if self.dropped:
+            logger.warning(f"Journal dropped {self.dropped} records under backpressure")
+
+
+# =============================================================================
+# READER
+# =============================================================================
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield decoded records in order, stopping at a torn or corrupt tail"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a decision journal")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            kind, length, crc = _RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc or kind not in RECORD_NAMES:
+                logger.warning(f"Stopping at damaged record near offset {f.tell() - len(payload)}")
+                return
+            yield _decode(kind, payload)
+
+
+def rebuild_tick(backtester, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Reconstruct the /tick payload for a journaled tick from the dataset"""
+    import numpy as np
+
+    timestamp = np.datetime64(record['timestamp'])
+    market_data = {}
+    history = {}
+    names = [t['ticker'] for t in record['tickers']]
+
+    for row in record['tickers']:
+        candle = backtester.get_candle_at_time(row['ticker'], timestamp)
+        if candle:
+            candle['change_24h_pct'] = row['change_24h_pct']
+            market_data[row['ticker']] = candle
+
+    position = record['position']
+    include = list(names)
+    if position.get('is_open'):
+        ticker = position['ticker']
+        if ticker not in include:
+            include.append(ticker)
+        if ticker not in market_data:
+            candle = backtester.get_candle_at_time(ticker, timestamp)
+            if candle:
+                candle['change_24h_pct'] = backtester.calculate_24h_change(ticker, timestamp) or 0
+                market_data[ticker] = candle
+
+    for ticker in include:
+        hist = backtester.get_history(ticker, timestamp, 1440)
+        if hist:
+            history[ticker] = hist
+
+    return {
+        'timestamp': record['timestamp'],
+        'day': record['day'],
+        'minute_of_day': record['minute_of_day'],
+        'minutes_remaining': record['minutes_remaining'],
+        'account': record['account'],
+        'position': position,
+        'qualifying_tickers': names,
+        'market_data': market_data,
+        'history': history,
+    }
+
+
+def _same_decision(journaled: Dict, replayed: Dict) -> bool:
+    keys = ('action', 'ticker', 'leverage', 'size_pct')
+    if journaled['action'] not in ('OPEN_LONG', 'OPEN_SHORT'):
+        keys = ('action',)
+    return all(journaled.get(k) == replayed.get(k) for k in keys)
+
+
+def replay(path: str, data_path: str) -> Tuple[int, List[Dict]]:
+    """
+    Replay a journal through a fresh TradingStrategy.
+    Returns (ticks replayed, mismatches).
+    """
+    from backtester import Backtester
+    from strategy import TradingStrategy
+
+    records = list(read_journal(path))
+    dates = sorted({r['timestamp'][:10] for r in records if r['type'] == 'tick'})
+    if not dates:
+        return 0, []
+
+    backtester = Backtester(data_path=data_path)
+    backtester.load_data(dates[0], dates[-1])
+    strategy = TradingStrategy()
+
+    ticks = 0
+    mismatches = []
+    for record in records:
+        kind = record['type']
+        if kind == 'reset':
+            strategy.reset()
+        elif kind == 'start':
+            strategy.start_day(record['day'], record['date'], record['initial_balance'])
+        elif kind == 'end':
+            strategy.end_day(record['day'], record['final_balance'], record['daily_pnl'])
+        else:
+            ticks += 1
+            decision = strategy.decide(rebuild_tick(backtester, record))
+            if not _same_decision(record['decision'], decision):
+                mismatches.append({
+                    'timestamp': record['timestamp'],
+                    'journaled': record['decision'],
+                    'replayed': {k: v for k, v in decision.items() if k != 'reason'},
+                })
+    return ticks, mismatches
+
+
+def main():
+    """Dump or replay a decision journal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Inspect or replay a decision journal')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    dump_parser = sub.add_parser('dump', help='Print records as JSON lines')
+    dump_parser.add_argument('journal')
+    dump_parser.add_argument('--limit', type=int, default=0, help='Stop after N records')
+
+    replay_parser = sub.add_parser('replay', help='Re-run decisions against the dataset')
+    replay_parser.add_argument('journal')
+    replay_parser.add_argument('--data', default='december_2025_dataset.npz',
+                               help='Dataset: .npz file or candle store directory')
+
+    args = parser.parse_args()
+
+    if args.command == 'dump':
+        for i, record in enumerate(read_journal(args.journal)):
+            if args.limit and i >= args.limit:
+                break
+            print(json.dumps(record))
+        return 0
+
+    ticks, mismatches = replay(args.journal, args.data)
+    for mismatch in mismatches:
+        print(json.dumps(mismatch))
+    print(f"Replayed {ticks} ticks: {len(mismatches)} decision mismatch(es)", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
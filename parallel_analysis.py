@@ -0,0 +1,156 @@
+"""
+ThothMind Trading Challenge - Parallel Analysis
+================================================
+Process-pool execution of per-ticker momentum analysis.
+
+Price arrays for all tickers in a tick are packed into one shared-memory
+block; workers receive only the block name and each ticker's offsets, so
+history is never pickled. Tickers are split into contiguous chunks and the
+results are concatenated in the original ticker order, which makes the
+output identical to a serial loop over MomentumAnalyzer.analyze_ticker.
+
+Ticks with fewer than `min_tickers` tickers are analyzed serially, as is
+everything after the pool fails.
+"""
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from strategy import MomentumAnalysis, MomentumAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Rows of the shared block
+CLOSES, HIGHS, LOWS, VOLUMES = range(4)
+
+# (analysis shell, offset, length) for one ticker
+Job = Tuple[MomentumAnalysis, int, int]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to the parent's block without letting this process unlink it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers attached blocks with the resource tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+def _analyze_chunk(shm_name: str, total: int, jobs: List[Job]) -> List[MomentumAnalysis]:
+    """Worker entry point: analyze a contiguous run of tickers"""
+    analyzer = MomentumAnalyzer()
+    shm = _attach(shm_name)
+    try:
+        block = np.ndarray((4, total), dtype=np.float64, buffer=shm.buf)
+        results = []
+        for analysis, offset, length in jobs:
+            columns = block[:, offset:offset + length]
+            results.append(analyzer.analyze_arrays(
+                analysis, columns[CLOSES], columns[HIGHS], columns[LOWS], columns[VOLUMES]
+            ))
+        # Views into the buffer must be gone before it is closed
+        del block, columns
+        return results
+    finally:
+        shm.close()
+
+
+class ParallelAnalyzer:
+    """
+    Runs MomentumAnalyzer over many tickers in worker processes.
+    """
+
+    def __init__(self, workers: int, min_tickers: int = 32):
+        self.workers = workers
+        self.min_tickers = min_tickers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # The start-up warm-up may share this analyzer with a live tick
+        self._pool_lock = threading.Lock()
+        self._disabled = False
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    @staticmethod
+    def _serial(analyzer: MomentumAnalyzer, tickers: List[str], history: Dict,
+                market_data: Dict) -> List[MomentumAnalysis]:
+        return [
+            analyzer.analyze_ticker(ticker, history[ticker], market_data[ticker],
+                                    market_data[ticker].get('change_24h_pct', 0))
+            for ticker in tickers
+        ]
+
+    def analyze(self, analyzer: MomentumAnalyzer, tickers: List[str], history: Dict,
+                market_data: Dict) -> List[MomentumAnalysis]:
+        """Analyze `tickers` in order; same result as the serial loop"""
+        if self._disabled or self.workers < 2 or len(tickers) < self.min_tickers:
+            return self._serial(analyzer, tickers, history, market_data)
+
+        # Extraction stays in this process: it validates the raw candles and
+        # produces the arrays that go into shared memory
+        analyses: List[MomentumAnalysis] = []
+        extracted: List[Tuple[int, Tuple[np.ndarray, ...]]] = []
+        for ticker in tickers:
+            current = market_data[ticker]
+            analysis = MomentumAnalysis(
+                ticker=ticker,
+                current_price=current.get('close', 0),
+                change_24h_pct=current.get('change_24h_pct', 0)
+            )
+            analyses.append(analysis)
+            arrays = analyzer.extract_arrays(ticker, history[ticker])
+            if arrays is not None:
+                extracted.append((len(analyses) - 1, arrays))
+
+        if not extracted:
+            return analyses
+
+        total = sum(len(arrays[0]) for _, arrays in extracted)
+        shm = shared_memory.SharedMemory(create=True, size=4 * total * 8)
+        try:
+            block = np.ndarray((4, total), dtype=np.float64, buffer=shm.buf)
+            jobs: List[Tuple[int, Job]] = []
+            offset = 0
+            for index, arrays in extracted:
+                length = len(arrays[0])
+                for row, values in enumerate(arrays):
+                    block[row, offset:offset + length] = values
+                jobs.append((index, (analyses[index], offset, length)))
+                offset += length
+            del block
+
+            chunks = [list(chunk) for chunk in np.array_split(np.arange(len(jobs)), self.workers) if len(chunk)]
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_analyze_chunk, shm.name, total, [jobs[i][1] for i in chunk])
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                for i, result in zip(chunk, future.result()):
+                    analyses[jobs[i][0]] = result
+            return analyses
+
+        except Exception as e:
+            logger.warning(f"Parallel analysis failed, falling back to serial: {e}")
+            self._disabled = True
+            self.close()
+            return self._serial(analyzer, tickers, history, market_data)
+
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,174 @@
+"""
+ThothMind Trading Challenge - Result Cache
+===========================================
+Memoized backtest results keyed by content hashes.
+
+Cache keys combine:
+- A hash of the dataset file contents
+- The effective config values
+- The source of strategy.py and backtester.py
+- The date range (whole runs) or the date and starting state (single days)
+
+Whole runs are returned instantly on a hit. Days are cached individually, so
+extending or partially changing a range only recomputes the days whose
+starting state differs from a cached one.
+"""
+import os
+import json
+import pickle
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, Optional
+
+import config
+from result_store import config_snapshot
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# Source files whose edits change backtest results
+SOURCE_FILES = ('strategy.py', 'backtester.py')
+
+# Config values that do not affect simulated results
+_NEUTRAL_CONFIG_KEYS = {
+    'SERVER_HOST', 'SERVER_PORT', 'DEBUG_MODE', 'WARMUP_ENABLED', 'MAX_REQUEST_BODY_BYTES',
+    'ASGI_MAX_PENDING_TICKS', 'LOG_LEVEL', 'LOG_FORMAT',
+    'PARALLEL_ANALYSIS_WORKERS', 'PARALLEL_ANALYSIS_MIN_TICKERS', 'JOURNAL_PATH', 'JOURNAL_FSYNC_INTERVAL_S',
+}
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def atomic_write(path: str, payload: bytes):
+    """Write a file via a temporary sibling and rename, so readers never see partial data"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ResultCache:
+    """
+    On-disk cache of backtest results.
+    """
+
+    def __init__(self, cache_dir: str = config.BACKTEST_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._dataset_hashes: Dict[str, str] = {}
+        self._base_key: Optional[str] = None
+
+    # -------------------------------------------------------------------------
+    # Key construction
+    # -------------------------------------------------------------------------
+    def dataset_hash(self, data_path: str) -> str:
+        """
+        SHA-256 of the dataset contents.
+
+        Hashing a large file is slow, so digests are remembered on disk keyed
+        by (path, size, mtime) and only recomputed when the file changes.
+        """
+        if os.path.isdir(data_path):
+            # Candle store: the manifest carries a checksum of every ticker's columns
+            data_path = os.path.join(data_path, 'manifest.json')
+
+        stat = os.stat(data_path)
+        stamp = f"{os.path.abspath(data_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        if stamp in self._dataset_hashes:
+            return self._dataset_hashes[stamp]
+
+        index_path = os.path.join(self.cache_dir, 'dataset_hashes.json')
+        index = {}
+        if os.path.exists(index_path):
+            try:
+                with open(index_path) as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+
+        digest = index.get(stamp)
+        if digest is None:
+            logger.info(f"Hashing dataset {data_path}...")
+            sha = hashlib.sha256()
+            with open(data_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            index[stamp] = digest
+            atomic_write(index_path, json.dumps(index, indent=2).encode())
+
+        self._dataset_hashes[stamp] = digest
+        return digest
+
+    def base_key(self, data_path: str) -> str:
+        """Hash of everything except the date range"""
+        if self._base_key is None:
+            sha = hashlib.sha256()
+            sha.update(f"v{CACHE_VERSION}".encode())
+            sha.update(self.dataset_hash(data_path).encode())
+
+            effective = {k: v for k, v in config_snapshot().items() if k not in _NEUTRAL_CONFIG_KEYS}
+            sha.update(json.dumps(effective, sort_keys=True).encode())
+
+            source_dir = os.path.dirname(os.path.abspath(__file__))
+            for name in SOURCE_FILES:
+                with open(os.path.join(source_dir, name), 'rb') as f:
+                    sha.update(f.read())
+
+            self._base_key = sha.hexdigest()
+        return self._base_key
+
+    def run_key(self, data_path: str, start_date: str, end_date: str) -> str:
+        """Key for a whole run over [start_date, end_date]"""
+        raw = f"{self.base_key(data_path)}|run|{start_date}|{end_date}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def day_key(self, data_path: str, date: str, day_num: int, balance: float, position: Any) -> str:
+        """Key for one simulated day given its starting balance and open position"""
+        raw = f"{self.base_key(data_path)}|day|{date}|{day_num}|{balance!r}|{position!r}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, key[:2], f"{key}.pkl")
+
+    def _get(self, kind: str, key: str) -> Optional[Any]:
+        path = self._path(kind, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def _put(self, kind: str, key: str, value: Any):
+        try:
+            atomic_write(self._path(kind, key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            logger.warning(f"Could not write cache entry: {e}")
+
+    def get_run(self, key: str) -> Optional[Any]:
+        return self._get('runs', key)
+
+    def put_run(self, key: str, result: Any):
+        self._put('runs', key, result)
+
+    def get_day(self, key: str) -> Optional[Any]:
+        return self._get('days', key)
+
+    def put_day(self, key: str, value: Any):
+        self._put('days', key, value)
@@ -0,0 +1,187 @@
+"""
+ThothMind Trading Challenge - Result Store
+===========================================
+Compact columnar storage for backtest runs.
+
+A run is saved as a single compressed .npz file holding:
+- equity:   per-minute equity curve (structured array)
+- trades:   realized trades (structured array)
+- daily:    per-day summary (structured array)
+- metadata: JSON document with run parameters, config snapshot and summary stats
+
+Use save_run() after a backtest and load_run() for later analysis.
+"""
+import os
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Config values that must never be written to disk
+_SECRET_CONFIG_KEYS = {'API_KEY'}
+
+
+@dataclass
+class StoredRun:
+    """A backtest run loaded from disk"""
+    metadata: Dict[str, Any]
+    equity: np.ndarray
+    trades: np.ndarray
+    daily: np.ndarray
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        return self.metadata.get('summary', {})
+
+
+def config_snapshot() -> Dict[str, Any]:
+    """Effective (non-secret) config values as a JSON-serializable dict"""
+    snapshot = {}
+    for key in sorted(dir(config)):
+        if not key.isupper() or key in _SECRET_CONFIG_KEYS:
+            continue
+        value = getattr(config, key)
+        if isinstance(value, (bool, int, float, str)):
+            snapshot[key] = value
+    return snapshot
+
+
+def _to_datetime64(values: Sequence[str]) -> np.ndarray:
+    """Parse timestamp strings of any precision into datetime64[s]"""
+    return np.array([np.datetime64(v) for v in values], dtype='datetime64[s]')
+
+
+def _str_dtype(values: Sequence[str], minimum: int = 1) -> str:
+    """Smallest fixed-width unicode dtype that fits every value"""
+    return f"U{max([minimum] + [len(v) for v in values])}"
+
+
+def trades_to_array(trades: Sequence) -> np.ndarray:
+    """Convert Trade records into a structured array"""
+    tickers = [t.ticker for t in trades]
+    reasons = [t.reason for t in trades]
+
+    dtype = np.dtype([
+        ('ticker', _str_dtype(tickers)),
+        ('side', 'U5'),
+        ('entry_time', 'datetime64[s]'),
+        ('entry_price', np.float64),
+        ('exit_time', 'datetime64[s]'),
+        ('exit_price', np.float64),
+        ('size', np.float64),
+        ('leverage', np.int16),
+        ('pnl', np.float64),
+        ('pnl_pct', np.float64),
+        ('reason', _str_dtype(reasons)),
+    ])
+
+    array = np.empty(len(trades), dtype=dtype)
+    if not trades:
+        return array
+
+    array['ticker'] = tickers
+    array['side'] = [t.side for t in trades]
+    array['entry_time'] = _to_datetime64([t.entry_time for t in trades])
+    array['entry_price'] = [t.entry_price for t in trades]
+    array['exit_time'] = _to_datetime64([t.exit_time for t in trades])
+    array['exit_price'] = [t.exit_price for t in trades]
+    array['size'] = [t.size for t in trades]
+    array['leverage'] = [t.leverage for t in trades]
+    array['pnl'] = [t.pnl for t in trades]
+    array['pnl_pct'] = [t.pnl_pct for t in trades]
+    array['reason'] = reasons
+    return array
+
+
+def daily_to_array(daily_results: Sequence) -> np.ndarray:
+    """Convert DailyResult records into a structured array"""
+    dtype = np.dtype([
+        ('day', np.int32),
+        ('date', 'datetime64[D]'),
+        ('starting_balance', np.float64),
+        ('ending_balance', np.float64),
+        ('daily_pnl', np.float64),
+        ('num_trades', np.int32),
+    ])
+
+    array = np.empty(len(daily_results), dtype=dtype)
+    for i, dr in enumerate(daily_results):
+        array[i] = (dr.day, np.datetime64(dr.date), dr.starting_balance,
+                    dr.ending_balance, dr.daily_pnl, len(dr.trades))
+    return array
+
+
+def _summary(result) -> Dict[str, Any]:
+    return {
+        'initial_balance': result.initial_balance,
+        'final_balance': result.final_balance,
+        'total_pnl': result.total_pnl,
+        'total_return_pct': result.total_return_pct,
+        'total_trades': result.total_trades,
+        'winning_trades': result.winning_trades,
+        'losing_trades': result.losing_trades,
+        'win_rate': result.win_rate,
+        'max_drawdown': result.max_drawdown,
+        'max_drawdown_pct': result.max_drawdown_pct,
+        'sharpe_ratio': float(result.sharpe_ratio),
+    }
+
+
+def save_run(path: str, result, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Save a BacktestResult to a compressed .npz file.
+
+    `metadata` is merged into the stored run metadata (e.g. data path and
+    date range). Returns the path written.
+    """
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'config': config_snapshot(),
+        'summary': _summary(result),
+    }
+    meta.update(metadata or {})
+
+    if not path.endswith('.npz'):
+        path += '.npz'
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    np.savez_compressed(
+        path,
+        equity=result.equity_curve,
+        trades=trades_to_array(result.all_trades),
+        daily=daily_to_array(result.daily_results),
+        metadata=np.array(json.dumps(meta)),
+    )
+
+    logger.info(f"Saved run to {path} ({os.path.getsize(path) / 1024:.1f} KiB)")
+    return path
+
+
+def load_run(path: str) -> StoredRun:
+    """Load a run written by save_run()"""
+    with np.load(path, allow_pickle=False) as npz:
+        metadata = json.loads(str(npz['metadata']))
+
+        version = metadata.get('format_version')
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported result format version {version} in {path}")
+
+        return StoredRun(
+            metadata=metadata,
+            equity=npz['equity'],
+            trades=npz['trades'],
+            daily=npz['daily'],
+        )
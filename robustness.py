@@ -0,0 +1,262 @@
+"""
+ThothMind Trading Challenge - Robustness Analysis
+==================================================
+Monte Carlo resampling of realized backtest trades.
+
+A single backtest is one path through the trade distribution. This module
+re-orders (shuffle) or re-draws (bootstrap) the per-trade returns tens of
+thousands of times to estimate how fragile the result is:
+- Confidence intervals for final return
+- Confidence intervals for max drawdown
+- Probability of ruin (equity falling below a threshold)
+
+Resamples are generated in vectorized numpy batches and spread across
+worker processes.
+"""
+import os
+import math
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('bootstrap', 'shuffle')
+
+
+@dataclass
+class RobustnessReport:
+    """Summary statistics over all resampled trade sequences"""
+    method: str
+    resamples: int
+    num_trades: int
+    confidence: float
+    ruin_threshold_pct: float
+
+    final_return_mean: float
+    final_return_median: float
+    final_return_ci: Tuple[float, float]
+
+    max_drawdown_mean: float
+    max_drawdown_median: float
+    max_drawdown_ci: Tuple[float, float]
+
+    ruin_probability: float
+    ruin_probability_ci: Tuple[float, float]
+
+    def to_dict(self) -> Dict:
+        return {
+            'method': self.method,
+            'resamples': self.resamples,
+            'num_trades': self.num_trades,
+            'confidence': self.confidence,
+            'ruin_threshold_pct': self.ruin_threshold_pct,
+            'final_return_pct': {
+                'mean': self.final_return_mean,
+                'median': self.final_return_median,
+                'ci': list(self.final_return_ci),
+            },
+            'max_drawdown_pct': {
+                'mean': self.max_drawdown_mean,
+                'median': self.max_drawdown_median,
+                'ci': list(self.max_drawdown_ci),
+            },
+            'ruin_probability': {
+                'estimate': self.ruin_probability,
+                'ci': list(self.ruin_probability_ci),
+            },
+        }
+
+
+def trade_returns(trades: Sequence, initial_balance: float = config.INITIAL_BALANCE) -> np.ndarray:
+    """
+    Convert realized trades into fractional returns on the balance at entry.
+
+    Trades are replayed in order from the initial balance, so each return is
+    pnl / balance-before-trade. This makes the returns compound correctly when
+    the sequence is reordered or redrawn.
+    """
+    pnls = np.array([t.pnl for t in trades], dtype=np.float64)
+    if pnls.size == 0:
+        return pnls
+
+    balances = initial_balance + np.concatenate(([0.0], np.cumsum(pnls)[:-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(balances > 0, pnls / balances, -1.0)
+    return returns
+
+
+def simulate_batch(
+    returns: np.ndarray,
+    size: int,
+    method: str,
+    ruin_level: float,
+    seed: np.random.SeedSequence
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate one batch of resampled equity paths.
+
+    Returns (final_return_pct, max_drawdown_pct, ruined) arrays of length `size`.
+    Equity is expressed as a multiple of the initial balance and floored at
+    zero, so a loss larger than the balance counts as a total wipe-out.
+    """
+    rng = np.random.default_rng(seed)
+    n = returns.size
+
+    if method == 'bootstrap':
+        idx = rng.integers(0, n, size=(size, n))
+        sampled = returns[idx]
+    elif method == 'shuffle':
+        sampled = np.tile(returns, (size, 1))
+        rng.permuted(sampled, axis=1, out=sampled)
+    else:
+        raise ValueError(f"Unknown resampling method: {method}")
+
+    growth = np.maximum(1.0 + sampled, 0.0)
+    equity = np.cumprod(growth, axis=1)
+
+    peaks = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peaks, 1.0, out=peaks)  # Initial balance is the first peak
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = (peaks - equity) / peaks
+    max_drawdown_pct = drawdowns.max(axis=1) * 100
+
+    final_return_pct = (equity[:, -1] - 1.0) * 100
+    ruined = equity.min(axis=1) <= ruin_level
+
+    return final_return_pct, max_drawdown_pct, ruined
+
+
+def _wilson_interval(successes: int, trials: int, confidence: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 0.0
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denom = 1 + z ** 2 / trials
+    centre = (p + z ** 2 / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z ** 2 / (4 * trials ** 2)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def run_monte_carlo(
+    trades: Sequence,
+    resamples: int = config.MONTE_CARLO_RESAMPLES,
+    method: str = 'bootstrap',
+    confidence: float = 0.95,
+    ruin_threshold_pct: float = config.RUIN_THRESHOLD_PCT,
+    initial_balance: float = config.INITIAL_BALANCE,
+    batch_size: int = config.MONTE_CARLO_BATCH_SIZE,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Optional[RobustnessReport]:
+    """
+    Resample the trade sequence and summarize the outcome distribution.
+
+    `ruin_threshold_pct` is the loss from the initial balance (in percent)
+    that counts as ruin. `workers` defaults to the CPU count; pass 1 to run
+    in-process.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    if resamples <= 0:
+        raise ValueError(f"resamples must be positive, got {resamples}")
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    returns = trade_returns(trades, initial_balance)
+    if returns.size == 0:
+        logger.warning("No trades to resample")
+        return None
+
+    ruin_level = 1.0 - ruin_threshold_pct / 100
+    batch_sizes = [batch_size] * (resamples // batch_size)
+    if resamples % batch_size:
+        batch_sizes.append(resamples % batch_size)
+
+    # Independent, reproducible streams per batch
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(batch_sizes))
+
+    logger.info(
+        f"Running {resamples} {method} resamples of {returns.size} trades "
+        f"({len(batch_sizes)} batches, {workers} workers)"
+    )
+
+    if workers <= 1:
+        results = [simulate_batch(returns, size, method, ruin_level, s)
+                   for size, s in zip(batch_sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                simulate_batch,
+                [returns] * len(batch_sizes),
+                batch_sizes,
+                [method] * len(batch_sizes),
+                [ruin_level] * len(batch_sizes),
+                seeds
+            ))
+
+    final_returns = np.concatenate([r[0] for r in results])
+    max_drawdowns = np.concatenate([r[1] for r in results])
+    ruined = np.concatenate([r[2] for r in results])
+
+    tail = (1 - confidence) / 2 * 100
+    bounds = (tail, 100 - tail)
+    ruin_count = int(np.count_nonzero(ruined))
+
+    return RobustnessReport(
+        method=method,
+        resamples=resamples,
+        num_trades=int(returns.size),
+        confidence=confidence,
+        ruin_threshold_pct=ruin_threshold_pct,
+        final_return_mean=float(np.mean(final_returns)),
+        final_return_median=float(np.median(final_returns)),
+        final_return_ci=tuple(float(v) for v in np.percentile(final_returns, bounds)),
+        max_drawdown_mean=float(np.mean(max_drawdowns)),
+        max_drawdown_median=float(np.median(max_drawdowns)),
+        max_drawdown_ci=tuple(float(v) for v in np.percentile(max_drawdowns, bounds)),
+        ruin_probability=ruin_count / resamples,
+        ruin_probability_ci=_wilson_interval(ruin_count, resamples, confidence),
+    )
+
+
+def print_report(report: RobustnessReport):
+    """Print formatted robustness results"""
+    level = f"{report.confidence * 100:.0f}%"
+
+    print("\n" + "=" * 60)
+    print("ROBUSTNESS ANALYSIS")
+    print("=" * 60)
+
+    print(f"\n[RESAMPLING]")
+    print(f"  Method:             {report.method}")
+    print(f"  Resamples:          {report.resamples:,}")
+    print(f"  Trades per path:    {report.num_trades}")
+
+    print(f"\n[FINAL RETURN]")
+    print(f"  Mean:               {report.final_return_mean:+.2f}%")
+    print(f"  Median:             {report.final_return_median:+.2f}%")
+    print(f"  {level} CI:            [{report.final_return_ci[0]:+.2f}%, {report.final_return_ci[1]:+.2f}%]")
+
+    print(f"\n[MAX DRAWDOWN]")
+    print(f"  Mean:               {report.max_drawdown_mean:.2f}%")
+    print(f"  Median:             {report.max_drawdown_median:.2f}%")
+    print(f"  {level} CI:            [{report.max_drawdown_ci[0]:.2f}%, {report.max_drawdown_ci[1]:.2f}%]")
+
+    print(f"\n[RISK OF RUIN] (loss >= {report.ruin_threshold_pct:.0f}% of initial balance)")
+    print(f"  Probability:        {report.ruin_probability * 100:.2f}%")
+    print(f"  {level} CI:            [{report.ruin_probability_ci[0] * 100:.2f}%, "
+          f"{report.ruin_probability_ci[1] * 100:.2f}%]")
+
+    print("\n" + "=" * 60)
@@ -226,11 +226,25 @@ class MomentumAnalyzer:
             change_24h_pct=change_24h_pct
         )
         
+        arrays = self.extract_arrays(ticker, history)
+        if arrays is None:
+            return analysis
+        
+        return self.analyze_arrays(analysis, *arrays)
+    
+    def extract_arrays(
+        self,
+        ticker: str,
+        history: List[List]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Convert history candles to (closes, highs, lows, volumes) arrays.
+        Returns None if there is not enough usable history.
+        """
         if not history or len(history) < 100:
             logger.warning(f"{ticker}: Insufficient history ({len(history) if history else 0} candles)")
-            return analysis
+            return None
         
-        # Extract price arrays
         try:
             closes = np.array([candle[4] for candle in history], dtype=float)
             highs = np.array([candle[2] for candle in history], dtype=float)
@@ -238,8 +252,22 @@ class MomentumAnalyzer:
             volumes = np.array([candle[5] for candle in history], dtype=float)
         except (IndexError, TypeError) as e:
             logger.error(f"{ticker}: Error extracting data: {e}")
-            return analysis
+            return None
         
+        return closes, highs, lows, volumes
+    
+    def analyze_arrays(
+        self,
+        analysis: MomentumAnalysis,
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        volumes: np.ndarray
+    ) -> MomentumAnalysis:
+        """
+        Fill in `analysis` from extracted price arrays.
+        Pure function of its inputs, so it can run in a worker process.
+        """
         # Calculate momentum at different timeframes
         analysis.short_momentum = self.calculate_momentum(closes, self.short_period)
         analysis.medium_momentum = self.calculate_momentum(closes, self.medium_period)
@@ -399,6 +427,17 @@ class TradingStrategy:
         self.last_trade_minute = -999
         self.trades_today = 0
         self.max_trades_per_day = config.MAX_TRADES_PER_DAY
+        
+        # Analyses computed during the latest decide() call, for journaling
+        self.last_analyses: Dict[str, MomentumAnalysis] = {}
+        
+        # Optional process-pool analysis for ticks with many tickers
+        self.parallel = None
+        if config.PARALLEL_ANALYSIS_WORKERS > 1:
+            from parallel_analysis import ParallelAnalyzer
+            self.parallel = ParallelAnalyzer(
+                config.PARALLEL_ANALYSIS_WORKERS, config.PARALLEL_ANALYSIS_MIN_TICKERS
+            )
     
     def reset(self):
         """Reset strategy state"""
@@ -409,6 +448,24 @@ class TradingStrategy:
         self.trades_today = 0
         logger.info("Strategy state reset")
     
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture all mutable strategy state (for checkpointing)"""
+        return {
+            'state': dict(self.state),
+            'position_entry_time': self.position_entry_time,
+            'position_peak_pnl': self.position_peak_pnl,
+            'last_trade_minute': self.last_trade_minute,
+            'trades_today': self.trades_today,
+        }
+    
+    def restore(self, snapshot: Dict[str, Any]):
+        """Restore state captured by snapshot()"""
+        self.state = dict(snapshot['state'])
+        self.position_entry_time = snapshot['position_entry_time']
+        self.position_peak_pnl = snapshot['position_peak_pnl']
+        self.last_trade_minute = snapshot['last_trade_minute']
+        self.trades_today = snapshot['trades_today']
+    
     def start_day(self, day: int, date: str, initial_balance: float):
         """Called at start of trading day"""
         self.state['day'] = day
@@ -437,6 +494,7 @@ class TradingStrategy:
         minute_of_day = tick_data.get('minute_of_day', 0)
         
         has_position = position.get('is_open', False)
+        self.last_analyses = {}
         
         if has_position:
             result = self._manage_position(position, account, market_data, history, minutes_remaining)
@@ -520,6 +578,7 @@ class TradingStrategy:
                 market_data[ticker],
                 market_data[ticker].get('change_24h_pct', 0)
             )
+            self.last_analyses[ticker] = analysis
             
             # Strong reversal signal against position
             if side == 'LONG' and analysis.signal in [Signal.STRONG_SELL, Signal.SELL]:
@@ -565,18 +624,20 @@ class TradingStrategy:
             return {'action': 'HOLD', 'reason': f"Daily limit reached ({self.max_trades_per_day})"}
         
         # Analyze all qualifying tickers
-        analyses = []
-        for ticker in qualifying_tickers:
-            if ticker not in history or ticker not in market_data:
-                continue
-            
-            analysis = self.analyzer.analyze_ticker(
-                ticker,
-                history[ticker],
-                market_data[ticker],
-                market_data[ticker].get('change_24h_pct', 0)
-            )
-            analyses.append(analysis)
+        tickers = [t for t in qualifying_tickers if t in history and t in market_data]
+        if self.parallel is not None:
+            analyses = self.parallel.analyze(self.analyzer, tickers, history, market_data)
+        else:
+            analyses = [
+                self.analyzer.analyze_ticker(
+                    ticker,
+                    history[ticker],
+                    market_data[ticker],
+                    market_data[ticker].get('change_24h_pct', 0)
+                )
+                for ticker in tickers
+            ]
+        self.last_analyses = {a.ticker: a for a in analyses}
         
         if not analyses:
             return {'action': 'HOLD', 'reason': 'No tickers with sufficient data'}
@@ -0,0 +1,324 @@
+"""
+ThothMind Trading Challenge - Synthetic Data
+=============================================
+Seeded generators for realistic-looking market data.
+
+- make_history(): minute OHLCV candles in the /tick history format
+- make_tick_payload(): a complete /tick request body
+- generate_ticker() / write_market(): full multi-ticker datasets in the
+  backtester's input format, for load tests beyond the one-month npz
+
+Market model (per ticker, fully vectorized over minutes):
+- Daily volatility regimes (calm / normal / volatile) from a Markov chain
+- U-shaped intraday volatility
+- Momentum bursts: a drift ramp adding up to a 20-80% move over a few
+  hours, which makes the ticker qualify (>=20% 24h change)
+- Volume that scales with absolute returns, plus random volume spikes
+
+Usage:
+    python synthetic.py --tickers 1000 --days 365 --out synthetic_2025.npz
+    python synthetic.py --tickers 200 --days 31 --store candles/ --workers 8
+"""
+import sys
+import time
+import logging
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from candle_store import CANDLE_DTYPE, CandleStoreWriter
+
+logger = logging.getLogger(__name__)
+
+
+def make_history(
+    rng: np.random.Generator,
+    length: int,
+    change_24h_pct: float,
+    end_timestamp: np.datetime64,
+    start_price: Optional[float] = None
+) -> List[List]:
+    """
+    Random-walk candles whose drift adds up to roughly `change_24h_pct` over
+    1440 minutes. Rows are [timestamp, open, high, low, close, volume].
+    """
+    if start_price is None:
+        start_price = float(rng.uniform(0.01, 50.0))
+
+    drift = np.log1p(change_24h_pct / 100) / 1440
+    log_returns = rng.normal(drift, 0.002, length)
+    closes = start_price * np.exp(np.cumsum(log_returns))
+    opens = np.concatenate(([start_price], closes[:-1]))
+    wicks = np.abs(rng.normal(0, 0.001, (2, length)))
+    highs = np.maximum(opens, closes) * (1 + wicks[0])
+    lows = np.minimum(opens, closes) * (1 - wicks[1])
+    volumes = rng.lognormal(10, 1, length)
+
+    timestamps = end_timestamp - np.arange(length - 1, -1, -1).astype('timedelta64[m]')
+
+    return [
+        [str(ts), float(o), float(h), float(l), float(c), float(v)]
+        for ts, o, h, l, c, v in zip(timestamps, opens, highs, lows, closes, volumes)
+    ]
+
+
+def make_tick_payload(
+    seed: int = 0,
+    num_tickers: int = 10,
+    history_len: int = 1440,
+    with_position: bool = False,
+    minute_of_day: int = 600,
+    date: str = '2025-12-01'
+) -> Dict:
+    """Build a /tick request body with `num_tickers` qualifying tickers"""
+    rng = np.random.default_rng(seed)
+    hour, minute = divmod(minute_of_day, 60)
+    timestamp = np.datetime64(f'{date}T{hour:02d}:{minute:02d}:00')
+
+    market_data = {}
+    history = {}
+    tickers = []
+    for i in range(num_tickers):
+        ticker = f'SYN{i:03d}USDT'
+        change = float(rng.choice([-1, 1]) * rng.uniform(20, 60))
+        candles = make_history(rng, history_len, change, timestamp)
+        last = candles[-1]
+
+        tickers.append(ticker)
+        history[ticker] = candles
+        market_data[ticker] = {
+            'timestamp': last[0],
+            'open': last[1],
+            'high': last[2],
+            'low': last[3],
+            'close': last[4],
+            'volume': last[5],
+            'change_24h_pct': change,
+        }
+
+    balance = config.INITIAL_BALANCE
+    position = {'is_open': False}
+    unrealized = 0.0
+    if with_position and tickers:
+        ticker = tickers[0]
+        current = market_data[ticker]['close']
+        entry = current * float(rng.uniform(0.97, 1.03))
+        leverage = config.DEFAULT_LEVERAGE
+        size = balance * config.DEFAULT_SIZE_PCT / 100
+        pnl_pct = (current - entry) / entry * leverage * 100
+        unrealized = size * pnl_pct / 100
+        position = {
+            'is_open': True,
+            'ticker': ticker,
+            'side': 'LONG',
+            'entry_price': entry,
+            'entry_time': str(timestamp - np.timedelta64(30, 'm')),
+            'size': size,
+            'leverage': leverage,
+            'current_price': current,
+            'unrealized_pnl': unrealized,
+            'unrealized_pnl_pct': pnl_pct,
+        }
+
+    return {
+        'timestamp': str(timestamp),
+        'day': 1,
+        'minute_of_day': minute_of_day,
+        'minutes_remaining': 1440 - minute_of_day,
+        'account': {
+            'balance': balance,
+            'equity': balance + unrealized,
+            'unrealized_pnl': unrealized,
+        },
+        'position': position,
+        'qualifying_tickers': tickers,
+        'market_data': market_data,
+        'history': history,
+    }
+
+
+# =============================================================================
+# MARKET GENERATOR
+# =============================================================================
+@dataclass
+class MarketParams:
+    """Knobs for generate_ticker()"""
+    base_vol: float = 0.0015                          # Per-minute log-return std in the normal regime
+    regime_vols: Tuple[float, ...] = (0.5, 1.0, 2.5)  # Calm, normal, volatile multipliers
+    regime_stay_prob: float = 0.8                     # Chance a day keeps the previous day's regime
+    bursts_per_day: float = 0.05                      # Momentum bursts per ticker per day
+    burst_move_pct: Tuple[float, float] = (20.0, 80.0)
+    burst_minutes: Tuple[int, int] = (60, 720)
+    spike_prob: float = 0.002                         # Chance of a volume spike in any minute
+    spike_size: Tuple[float, float] = (3.0, 15.0)
+    price_range: Tuple[float, float] = (0.001, 100.0)
+    intraday_shape: float = 0.4                       # Amplitude of the U-shaped intraday volatility
+    volume_scale: float = 10.0                        # log of the typical minute volume
+
+
+def generate_ticker(
+    rng: np.random.Generator,
+    start: np.datetime64,
+    minutes: int,
+    params: Optional[MarketParams] = None
+) -> np.ndarray:
+    """Minute candles (CANDLE_DTYPE) for one ticker"""
+    params = params or MarketParams()
+    days = -(-minutes // 1440)
+
+    # Daily regimes: stay with regime_stay_prob, otherwise jump to a random one
+    stay = rng.random(days) < params.regime_stay_prob
+    jumps = rng.integers(0, len(params.regime_vols), days)
+    # Index of the last jump at or before each day carries the regime forward
+    last_jump = np.maximum.accumulate(np.where(~stay | (np.arange(days) == 0), np.arange(days), 0))
+    regimes = jumps[last_jump]
+
+    minute_of_day = np.arange(minutes) % 1440
+    intraday = 1 + params.intraday_shape * np.cos(2 * np.pi * minute_of_day / 1440)
+    vol = params.base_vol * np.asarray(params.regime_vols)[regimes].repeat(1440)[:minutes] * intraday
+
+    returns = rng.standard_normal(minutes) * vol
+    volume_boost = np.ones(minutes)
+
+    # Momentum bursts: a linear drift ramp adding the whole move over the burst
+    n_bursts = rng.poisson(params.bursts_per_day * days)
+    if n_bursts:
+        starts = rng.integers(0, minutes, n_bursts)
+        lengths = rng.integers(params.burst_minutes[0], params.burst_minutes[1] + 1, n_bursts)
+        moves = rng.uniform(*params.burst_move_pct, n_bursts) * rng.choice([-1, 1], n_bursts)
+        drift = np.zeros(minutes + 1)
+        for s, n, move in zip(starts, lengths, moves):
+            e = min(s + n, minutes)
+            per_minute = np.log1p(move / 100) / n
+            drift[s] += per_minute
+            drift[e] -= per_minute
+            volume_boost[s:e] *= 2.0
+        returns += np.cumsum(drift)[:minutes]
+
+    log_price = rng.uniform(*np.log(params.price_range)) + np.cumsum(returns)
+    close = np.exp(log_price)
+    open_ = np.empty(minutes)
+    open_[0] = close[0] * np.exp(-returns[0])
+    open_[1:] = close[:-1]
+
+    wicks = np.abs(rng.standard_normal((2, minutes))) * vol * 0.5
+    high = np.maximum(open_, close) * np.exp(wicks[0])
+    low = np.minimum(open_, close) * np.exp(-wicks[1])
+
+    spikes = rng.random(minutes) < params.spike_prob
+    volume_boost[spikes] *= rng.uniform(*params.spike_size, np.count_nonzero(spikes))
+    activity = 1 + np.abs(returns) / vol
+    volume = rng.lognormal(params.volume_scale, 0.5, minutes) * activity * volume_boost
+
+    candles = np.empty(minutes, dtype=CANDLE_DTYPE)
+    candles['timestamp'] = start.astype('datetime64[s]') + np.arange(minutes).astype('timedelta64[m]')
+    candles['open'] = open_
+    candles['high'] = high
+    candles['low'] = low
+    candles['close'] = close
+    candles['volume'] = volume
+    return candles
+
+
+def ticker_name(index: int) -> str:
+    return f'SYN{index:04d}USDT'
+
+
+def _generate_one(job: Tuple[int, np.random.SeedSequence, str, int, MarketParams]) -> Tuple[str, np.ndarray]:
+    index, seed, start, minutes, params = job
+    return ticker_name(index), generate_ticker(np.random.default_rng(seed), np.datetime64(start), minutes, params)
+
+
+def generate_market(
+    tickers: int,
+    start: str,
+    days: int,
+    seed: int = 0,
+    params: Optional[MarketParams] = None,
+    workers: int = 1
+) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    Yield (ticker, candles) one ticker at a time, in ticker order.
+    Each ticker has its own spawned seed, so output does not depend on `workers`.
+    """
+    params = params or MarketParams()
+    seeds = np.random.SeedSequence(seed).spawn(tickers)
+    jobs = [(i, seeds[i], start, days * 1440, params) for i in range(tickers)]
+
+    if workers <= 1:
+        for job in jobs:
+            yield _generate_one(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_generate_one, jobs)
+
+
+def write_market(
+    series: Iterator[Tuple[str, np.ndarray]],
+    out_path: Optional[str] = None,
+    store_path: Optional[str] = None
+) -> int:
+    """
+    Write generated tickers as an uncompressed npz (memory-mappable by the
+    backtester's lazy loader) and/or into a candle store. Only one ticker is
+    held in memory at a time. Returns the number of tickers written.
+    """
+    archive = zipfile.ZipFile(out_path, 'w', zipfile.ZIP_STORED, allowZip64=True) if out_path else None
+    writer = CandleStoreWriter(store_path) if store_path else None
+    count = 0
+    try:
+        for name, candles in series:
+            if archive is not None:
+                with archive.open(f'{name}.npy', 'w', force_zip64=True) as member:
+                    np.lib.format.write_array(member, candles, allow_pickle=False)
+            if writer is not None:
+                writer.append(name, candles)
+            count += 1
+    finally:
+        if archive is not None:
+            archive.close()
+    if writer is not None:
+        writer.finalize()
+    return count
+
+
+def main():
+    """Generate a synthetic market dataset"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Generate synthetic minute OHLCV for load tests')
+    parser.add_argument('--tickers', type=int, default=100)
+    parser.add_argument('--start', default='2025-01-01', help='First day (YYYY-MM-DD)')
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='Write an npz dataset here')
+    parser.add_argument('--store', help='Write into this candle store directory')
+    parser.add_argument('--workers', type=int, default=1, help='Generator processes')
+    parser.add_argument('--bursts-per-day', type=float, default=MarketParams.bursts_per_day,
+                        help='Momentum bursts (>=20%% moves) per ticker per day')
+    parser.add_argument('--base-vol', type=float, default=MarketParams.base_vol,
+                        help='Per-minute volatility in the normal regime')
+    args = parser.parse_args()
+
+    if not args.out and not args.store:
+        parser.error('Give --out and/or --store')
+
+    params = MarketParams(bursts_per_day=args.bursts_per_day, base_vol=args.base_vol)
+    started = time.perf_counter()
+    series = generate_market(args.tickers, args.start, args.days, args.seed, params, args.workers)
+    count = write_market(series, out_path=args.out, store_path=args.store)
+
+    rows = count * args.days * 1440
+    logger.info(f"Wrote {count} tickers x {args.days} days ({rows:,} candles) "
+                f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())